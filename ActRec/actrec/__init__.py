@@ -1,6 +1,7 @@
 ﻿# region Imports
 # external modules
 import json
+import atexit
 
 # blender modules
 import bpy
@@ -93,11 +94,16 @@ def register():
 
     bpy.types.Scene.ar = PointerProperty(type=properties.AR_scene_data)
 
+    # the storage is written with a delay, Blender doesn't run timers while quitting
+    atexit.register(functions.flush_storage)
+
     shared_data.data_loaded = False
     log.logger.info("Registered Action Recorder")
 
 
 def unregister():
+    functions.flush_storage()
+    atexit.unregister(functions.flush_storage)
     properties.unregister()
     menus.unregister()
     operators.unregister()
@@ -0,0 +1,220 @@
+"""
+plays a global action on many .blend files with background instances of Blender
+
+usage:
+    blender -b --python batch.py -- --action "Action Label" [options] file.blend [file.blend ...]
+
+The call with the files is the coordinator, which starts a pool of background Blender processes.
+Every process opens one file, loads the global actions from the storage and plays the action.
+The timing and errors of each file are written as JSON to the report path and printed as summary.
+"""
+
+# region Imports
+# external modules
+import os
+import sys
+import json
+import time
+import argparse
+import importlib
+import traceback
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+# blender modules
+import bpy
+import addon_utils
+# endregion
+
+# prefix of the line a worker prints its result with
+RESULT_PREFIX = "ActRec-Batch-Result: "
+
+# region Functions
+
+
+def parse_arguments(argv: list[str]) -> argparse.Namespace:
+    """
+    parses the arguments that are passed to the script after "--"
+
+    Args:
+        argv (list[str]): all arguments of the Blender call
+
+    Returns:
+        argparse.Namespace: parsed arguments
+    """
+    argv = argv[argv.index("--") + 1:] if "--" in argv else []
+    parser = argparse.ArgumentParser(
+        prog="blender -b --python batch.py --",
+        description="plays a global action of ActRec on many .blend files"
+    )
+    parser.add_argument("files", nargs="*", help=".blend files to play the action on")
+    parser.add_argument("--action", required=True, help="label or id of the global action to play")
+    parser.add_argument("--addon", default=__file__.split(os.sep)[-3], help="module name of the ActRec addon")
+    parser.add_argument(
+        "--storage", default="", help="path to the storage file, the storage path of the addon if empty")
+    parser.add_argument("--processes", type=int, default=os.cpu_count(), help="amount of parallel Blender processes")
+    parser.add_argument("--timeout", type=float, default=None, help="seconds after a process is stopped")
+    parser.add_argument("--save", action="store_true", help="save the files after the action was played")
+    parser.add_argument("--report", default="", help="path of the JSON report, no report is written if empty")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def get_worker_command(arguments: argparse.Namespace, file: str) -> list[str]:
+    """
+    get the command line of the background Blender process that plays the action on the file
+
+    Args:
+        arguments (argparse.Namespace): arguments of the coordinator
+        file (str): .blend file to open
+
+    Returns:
+        list[str]: command line to start the process with
+    """
+    command = [
+        bpy.app.binary_path, "-b", file, "--python", os.path.abspath(__file__), "--",
+        "--worker", "--action", arguments.action, "--addon", arguments.addon
+    ]
+    if arguments.storage:
+        command.extend(("--storage", arguments.storage))
+    if arguments.save:
+        command.append("--save")
+    return command
+
+
+def run_worker(arguments: argparse.Namespace, file: str) -> dict:
+    """
+    plays the action on the file in a background Blender process
+
+    Args:
+        arguments (argparse.Namespace): arguments of the coordinator
+        file (str): .blend file to play the action on
+
+    Returns:
+        dict: report of the file, format {"file": str, "success": bool, "error": str, "time": float, "play_time": float}
+    """
+    report = {"file": file, "success": False, "error": "", "time": 0.0, "play_time": 0.0}
+    start = time.perf_counter()
+    try:
+        process = subprocess.run(
+            get_worker_command(arguments, file),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            timeout=arguments.timeout
+        )
+    except subprocess.TimeoutExpired:
+        report["time"] = time.perf_counter() - start
+        report["error"] = "Timeout after %ss" % arguments.timeout
+        return report
+    report["time"] = time.perf_counter() - start
+    for line in process.stdout.splitlines():
+        if line.startswith(RESULT_PREFIX):
+            report.update(json.loads(line[len(RESULT_PREFIX):]))
+            break
+    else:
+        report["error"] = "Blender exited with code %i without result\n%s" % (
+            process.returncode, process.stdout[-2000:])
+    return report
+
+
+def coordinate(arguments: argparse.Namespace) -> int:
+    """
+    plays the action on all files with a pool of background Blender processes and reports the results
+
+    Args:
+        arguments (argparse.Namespace): parsed arguments
+
+    Returns:
+        int: exit code, 1 if the storage doesn't exist or the action failed on any file
+    """
+    if arguments.storage:
+        # the storage setter of the workers would create an empty storage at a wrong path
+        if not os.path.isfile(arguments.storage):
+            print("ActRec batch: storage %s doesn't exist" % arguments.storage)
+            return 1
+        arguments.storage = os.path.abspath(arguments.storage)
+    files = [os.path.abspath(file) for file in arguments.files]
+    processes = max(1, min(arguments.processes or 1, len(files) or 1))
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=processes) as executor:
+        reports = list(executor.map(lambda file: run_worker(arguments, file), files))
+    total = time.perf_counter() - start
+
+    failed = [report for report in reports if not report["success"]]
+    for report in reports:
+        print("%s %8.2fs %s %s" % (
+            "OK    " if report["success"] else "FAILED", report["time"], report["file"], report["error"]))
+    print("ActRec batch: %i of %i files succeeded in %.2fs" % (len(reports) - len(failed), len(reports), total))
+    if arguments.report:
+        with open(arguments.report, 'w', encoding='utf-8') as report_file:
+            json.dump({"action": arguments.action, "time": total, "files": reports}, report_file, indent=4)
+    return 1 if failed else 0
+
+
+def play_action(arguments: argparse.Namespace) -> str:
+    """
+    plays the action on the open file
+
+    Args:
+        arguments (argparse.Namespace): parsed arguments
+
+    Returns:
+        str: error, empty if the action was played successfully
+    """
+    context = bpy.context
+    addon_utils.enable(arguments.addon, default_set=False)
+    functions = importlib.import_module("%s.actrec.functions" % arguments.addon)
+    ActRec_pref = functions.get_preferences(context)
+    if arguments.storage:
+        ActRec_pref.storage_path = arguments.storage
+    # the background process ends with the script, the action can't continue with a timer
+    ActRec_pref.playback_time_budget = 0
+    if not functions.load(ActRec_pref):
+        return "No global actions found in %s" % ActRec_pref.storage_path
+
+    action = ActRec_pref.global_actions.get(arguments.action)
+    if action is None:
+        action = next((action for action in ActRec_pref.global_actions if action.label == arguments.action), None)
+    if action is None:
+        return "Global action '%s' doesn't exist" % arguments.action
+    functions.load_macros(action)
+    err = functions.play(context, action.macros, action, 'global_actions')
+    if err:
+        return str(err)
+    if action.is_playing:
+        action.is_playing = False
+        return "Timer and Render Complete events aren't supported in background playback"
+    if arguments.save:
+        bpy.ops.wm.save_mainfile()
+    return ""
+
+
+def work(arguments: argparse.Namespace) -> None:
+    """
+    plays the action on the open file and prints the result for the coordinator
+
+    Args:
+        arguments (argparse.Namespace): parsed arguments
+    """
+    start = time.perf_counter()
+    try:
+        error = play_action(arguments)
+    except Exception:
+        error = traceback.format_exc()
+    result = {"success": not error, "error": error, "play_time": time.perf_counter() - start}
+    print(RESULT_PREFIX + json.dumps(result), flush=True)
+
+
+def main() -> None:
+    arguments = parse_arguments(sys.argv)
+    if arguments.worker:
+        work(arguments)
+        return
+    sys.exit(coordinate(arguments))
+
+# endregion
+
+
+if __name__ == "__main__":
+    main()
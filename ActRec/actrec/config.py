@@ -6,3 +6,7 @@ repo_source_url = 'https://raw.githubusercontent.com/InamuraJIN/ActionRecorder/m
 release_notes_url = 'https://github.com/InamuraJIN/ActionRecorder/wiki'
 version = (4, 1, 3)
 log_amount = 5
+# maximum amount of tracked actions kept while recording, the oldest are dropped first
+tracked_actions_capacity = 4096
+# seconds the storage file is written after the last save of the global actions
+storage_save_delay = 1.0
@@ -8,6 +8,12 @@ from .categories import (
 from .globals import (
     save,
     load,
+    mark_dirty,
+    flush_storage,
+    load_macros,
+    create_storage,
+    clear_global_actions,
+    read_storage,
     import_global_from_dict,
     get_global_action_id,
     get_global_action_ids,
@@ -30,19 +36,33 @@ from .macros import (
     get_local_macro_index,
     add_report_as_macro,
     get_report_text,
+    get_report_count,
     split_context_report,
     create_object_copy,
     improve_context_report,
+    Record_journal,
+    Live_record_journal,
+    improve_report,
+    start_record_journal,
+    stop_record_journal,
     split_operator_report,
     evaluate_operator,
     improve_operator_report,
     dict_to_kwarg_str,
+    Tracked_action,
     track_scene,
     merge_report_tracked,
     compare_op_dict,
     convert_value_to_python
 )
 
+from .playback import (
+    get_plan,
+    remove_plan,
+    clear_plans,
+    get_session
+)
+
 from .shared import (
     check_for_duplicates,
     add_data_to_collection,
@@ -50,9 +70,12 @@ from .shared import (
     swap_collection_items,
     property_to_python,
     apply_data_to_item,
+    load_collection,
+    is_uuid_hex,
     get_name_of_command,
     update_command,
     play,
+    cancel_playback,
     get_font_path,
     split_and_keep,
     text_to_lines,
@@ -0,0 +1,193 @@
+# region Imports
+# external modules
+import os
+import json
+import sqlite3
+from contextlib import closing
+from typing import Optional
+
+# relative imports
+from ..log import logger
+# endregion
+
+# extensions of the storage paths, which use a SQLite database instead of a json file
+DATABASE_EXTENSIONS = {'.db', '.sqlite', '.sqlite3'}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS categories (
+    id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS actions (
+    id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    header TEXT NOT NULL,
+    macros TEXT NOT NULL
+);
+"""
+
+# region Functions
+
+
+def is_database(path: str) -> bool:
+    """
+    checks if the storage path uses a SQLite database
+
+    Args:
+        path (str): path to the storage
+
+    Returns:
+        bool: storage is a SQLite database
+    """
+    return os.path.splitext(path)[1].lower() in DATABASE_EXTENSIONS
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """
+    opens the database and creates the tables if they don't exist
+
+    Args:
+        path (str): path to the database
+
+    Returns:
+        sqlite3.Connection: connection to the database
+    """
+    connection = sqlite3.connect(path)
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def encode(value) -> str:
+    """
+    converts the value to compact json text
+
+    Args:
+        value (any): value to convert
+
+    Returns:
+        str: json text
+    """
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+def update_positions(connection: sqlite3.Connection, table: str, ids: list, changed: Optional[set]) -> list:
+    """
+    removes the rows that aren't in ids anymore and updates the positions of the unchanged rows
+
+    Args:
+        connection (sqlite3.Connection): connection to the database
+        table (str): "categories" or "actions"
+        ids (list): ids of all entries in their order
+        changed (Optional[set]): ids of the changed entries, None if all entries changed
+
+    Returns:
+        list: positions of the entries that need to be written
+    """
+    stored = dict(connection.execute("SELECT id, position FROM %s" % table))
+    removed_ids = set(stored).difference(ids)
+    connection.executemany("DELETE FROM %s WHERE id = ?" % table, ((id, ) for id in removed_ids))
+    positions = []
+    for i, id in enumerate(ids):
+        if id not in stored or changed is None or id in changed:
+            positions.append(i)
+        elif stored[id] != i:
+            connection.execute("UPDATE %s SET position = ? WHERE id = ?" % table, (i, id))
+    return positions
+
+
+def write_database(
+        path: str,
+        categories: list,
+        actions: list,
+        changed_categories: Optional[set] = None,
+        changed_actions: Optional[set] = None) -> None:
+    """
+    writes the categories and global actions to the database in one transaction,
+    the database keeps its previous state if the write fails.
+    Only the changed and new entries are written, the unchanged entries only get their new position
+
+    Args:
+        path (str): path to the database
+        categories (list): categories in the format of the storage
+        actions (list): (id, header, macros) of each global action in the format of the storage,
+            macros is None to keep the macros stored in the database
+        changed_categories (Optional[set], optional): ids of the changed categories,
+            None if all categories changed. Defaults to None.
+        changed_actions (Optional[set], optional): ids of the changed actions,
+            None if all actions changed. Defaults to None.
+    """
+    with closing(connect(path)) as connection, connection:
+        positions = update_positions(
+            connection, "categories", [category.get('id') for category in categories], changed_categories
+        )
+        connection.executemany(
+            "INSERT OR REPLACE INTO categories VALUES (?, ?, ?)",
+            ((categories[i].get('id'), i, encode(categories[i])) for i in positions)
+        )
+        positions = update_positions(connection, "actions", [id for id, header, macros in actions], changed_actions)
+        for i in positions:
+            id, header, macros = actions[i]
+            if macros is not None:
+                connection.execute(
+                    "INSERT OR REPLACE INTO actions VALUES (?, ?, ?, ?)", (id, i, encode(header), encode(macros))
+                )
+                continue
+            cursor = connection.execute(
+                "UPDATE actions SET position = ?, header = ? WHERE id = ?", (i, encode(header), id)
+            )
+            if not cursor.rowcount:
+                logger.error("macros of %s aren't in the database %s" % (id, path))
+                connection.execute("INSERT INTO actions VALUES (?, ?, ?, ?)", (id, i, encode(header), "[]"))
+
+
+def read_database(path: str, macros: bool = True) -> dict:
+    """
+    reads the categories and global actions from the database
+
+    Args:
+        path (str): path to the database
+        macros (bool, optional): read the macros of the global actions. Defaults to True.
+
+    Returns:
+        dict: data in the format of the json storage, without empty values
+    """
+    with closing(connect(path)) as connection:
+        categories = [json.loads(data) for data, in connection.execute("SELECT data FROM categories ORDER BY position")]
+        actions = []
+        if macros:
+            for header, macros_data in connection.execute("SELECT header, macros FROM actions ORDER BY position"):
+                action = json.loads(header)
+                action['macros'] = json.loads(macros_data)
+                actions.append(action)
+        else:
+            actions = [
+                json.loads(header) for header, in connection.execute("SELECT header FROM actions ORDER BY position")
+            ]
+    data = {}
+    if categories:
+        data['categories'] = categories
+    if actions:
+        data['actions'] = actions
+    return data
+
+
+def read_action(path: str, id: str) -> Optional[dict]:
+    """
+    reads a single global action from the database
+
+    Args:
+        path (str): path to the database
+        id (str): id of the global action
+
+    Returns:
+        Optional[dict]: global action in the format of the storage, None if the action isn't in the database
+    """
+    with closing(connect(path)) as connection:
+        row = connection.execute("SELECT header, macros FROM actions WHERE id = ?", (id, )).fetchone()
+    if row is None:
+        return None
+    action = json.loads(row[0])
+    action['macros'] = json.loads(row[1])
+    return action
+# endregion
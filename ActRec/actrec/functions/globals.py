@@ -2,63 +2,502 @@
 # external modules
 import json
 import os
-from typing import Union, TYPE_CHECKING, Iterable
+import tempfile
+from contextlib import suppress
+from typing import Union, Optional, TYPE_CHECKING, Iterable
 
 # blender modules
 import bpy
-from bpy.types import AddonPreferences, Context, KeyMapItem, KeyMap
+from bpy.types import AddonPreferences, Context, KeyMapItem, KeyMap, CollectionProperty, PropertyGroup
 
 # relative imports
 from ..log import logger
-from .. import ui_functions, keymap
-from . import shared
+from .. import ui_functions, keymap, config
+from . import shared, playback, database
 if TYPE_CHECKING:
     from ..preferences import AR_preferences
+    from ..properties.globals import AR_global_actions
 else:
     AR_preferences = AddonPreferences
+    AR_global_actions = PropertyGroup
 # endregion
 
 
+# values of the categories and actions that aren't saved to the storage
+CATEGORY_EXCLUDE = [
+    "name",
+    "selected",
+    "actions.name",
+    "areas.name",
+    "areas.modes.name"
+]
+ACTION_EXCLUDE = [
+    "name",
+    "selected",
+    "alert",
+    "execution_mode",
+    "macros.name",
+    "macros.is_available",
+    "macros.is_playing",
+    "macros.alert",
+    "is_playing"
+]
+
+# serialized entries of the storage by id
+storage_cache = {'categories': {}, 'actions': {}}
+# ids of the entries that changed since the last save, None if all entries changed
+dirty_ids = {'categories': None, 'actions': None}
+# path of the storage file -> (data, write index, ids of the changed entries) that waits to be written
+pending_writes = {}
+# id of a global action -> Macro_source of the macros that aren't loaded to the action yet
+lazy_macros = {}
+# version of the index file written next to the storage file
+INDEX_VERSION = 1
+
 # region Functions
 
 
-def save(ActRec_pref: AR_preferences) -> None:
+def mark_dirty(actions: Optional[Iterable[str]] = (), categories: Optional[Iterable[str]] = ()) -> None:
     """
-    save the global actions and categories to the storage file
+    marks global actions and categories as changed, only changed entries are serialized again by save
 
     Args:
-        ActRec_pref (AR_preferences): preferences of this addon
+        actions (Optional[Iterable[str]], optional): ids of the changed actions, None marks all actions.
+            Defaults to ().
+        categories (Optional[Iterable[str]], optional): ids of the changed categories, None marks all categories.
+            Defaults to ().
     """
-    data = {}
-    data['categories'] = shared.property_to_python(
-        ActRec_pref.categories,
-        exclude=[
-            "name",
-            "selected",
-            "actions.name",
-            "areas.name",
-            "areas.modes.name"
-        ]
-    )
-    data['actions'] = shared.property_to_python(
-        ActRec_pref.global_actions,
-        exclude=[
-            "name",
-            "selected",
-            "alert",
-            "execution_mode",
-            "macros.name",
-            "macros.is_available",
-            "macros.is_playing",
-            "macros.alert",
-            "is_playing"
-        ]
+    for key, ids in (('actions', actions), ('categories', categories)):
+        if ids is None:
+            dirty_ids[key] = None
+        elif dirty_ids[key] is not None:
+            dirty_ids[key].update(ids)
+
+
+class Macro_source:
+    """
+    macros of a global action inside of the storage file, only read when the macros are needed
+    """
+
+    def __init__(
+            self, id: str, path: str, span: Optional[tuple] = None, stamp: Optional[tuple] = None,
+            data: Optional[list] = None) -> None:
+        """
+        Args:
+            id (str): id of the global action
+            path (str): path to the storage file
+            span (Optional[tuple], optional): (offset, length) of the macros in bytes,
+                not needed for a database, which reads the action by id. Defaults to None.
+            stamp (Optional[tuple], optional): stamp of the storage file the span belongs to. Defaults to None.
+            data (Optional[list], optional): macros, used if the storage file has no index. Defaults to None.
+        """
+        self.id = id
+        self.path = path
+        self.span = span
+        self.stamp = stamp
+        self.data = data
+
+    def move(self, path: str, span: tuple, stamp: tuple) -> None:
+        """
+        points the source to the macros written to a storage file
+
+        Args:
+            path (str): path to the storage file
+            span (tuple): (offset, length) of the macros in bytes
+            stamp (tuple): stamp of the written storage file
+        """
+        self.path = path
+        self.span = span
+        self.stamp = stamp
+        self.data = None
+
+    def read_text(self) -> str:
+        """
+        get the macros as json text, indented like encode_storage writes them
+
+        Returns:
+            str: json text of the macros
+        """
+        if self.data is not None or database.is_database(self.path):
+            return indent_json(self.read(), 6)
+        if get_stamp(self.path) != self.stamp:
+            logger.warning("storage changed since it was loaded, search the macros of %s" % self.id)
+            return indent_json(read_macros_from_storage(self.path, self.id), 6)
+        offset, length = self.span
+        with open(self.path, 'rb') as storage_file:
+            storage_file.seek(offset)
+            return storage_file.read(length).decode('utf-8')
+
+    def read(self) -> list:
+        """
+        get the macros
+
+        Returns:
+            list: macros in the format of the storage
+        """
+        if self.data is not None:
+            return self.data
+        if database.is_database(self.path):
+            action = database.read_action(self.path, self.id)
+            if action is None:
+                logger.error("macros of %s aren't in the storage" % self.id)
+                return []
+            return action.get('macros', [])
+        return json.loads(self.read_text())
+
+
+def get_stamp(path: str) -> Optional[tuple]:
+    """
+    get the stamp of the file, which changes when the file is written
+
+    Args:
+        path (str): path to the file
+
+    Returns:
+        Optional[tuple]: (size, modification time in nanoseconds), None if the file doesn't exist
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+def get_index_path(path: str) -> str:
+    """
+    get the path of the index file, which belongs to the storage file
+
+    Args:
+        path (str): path to the storage file
+
+    Returns:
+        str: path to the index file
+    """
+    return "%s.index.json" % os.path.splitext(path)[0]
+
+
+def read_macros_from_storage(path: str, id: str) -> list:
+    """
+    reads the macros of the global action from the whole storage file
+
+    Args:
+        path (str): path to the storage file
+        id (str): id of the global action
+
+    Returns:
+        list: macros of the global action, empty if the action isn't in the storage file
+    """
+    data = read_storage(path)
+    for action in data.get('actions', []):
+        if action.get('id') == id:
+            return action.get('macros', [])
+    logger.error("macros of %s aren't in the storage" % id)
+    return []
+
+
+def read_storage_index(path: str) -> Optional[dict]:
+    """
+    reads the index of the storage file
+
+    Args:
+        path (str): path to the storage file
+
+    Returns:
+        Optional[dict]: index, None if the index doesn't exist or doesn't belong to the current storage file
+    """
+    try:
+        with open(get_index_path(path), 'r', encoding='utf-8') as index_file:
+            index = json.load(index_file)
+    except (OSError, ValueError):
+        return None
+    if index.get('version') != INDEX_VERSION or (index.get('size'), index.get('mtime_ns')) != get_stamp(path):
+        return None
+    return index
+
+
+def load_macros(action: AR_global_actions) -> None:
+    """
+    loads the macros of the global action from the storage file,
+    if they weren't loaded yet because of the lazy loading
+
+    Args:
+        action (AR_global_actions): global action to load the macros to
+    """
+    if not action.get('lazy_macros', False):
+        return
+    del action['lazy_macros']
+    source = lazy_macros.pop(action.id, None)
+    if source is not None:
+        shared.load_collection(action.macros, source.read())
+
+
+def serialize_entries(collection: CollectionProperty, key: str, exclude: list) -> tuple[list, Optional[set]]:
+    """
+    serialize the entries of the collection, unchanged entries are taken from the storage cache
+
+    Args:
+        collection (CollectionProperty): categories or global actions
+        key (str): key of the collection in the storage
+        exclude (list): property values to exclude, see shared.property_to_python
+
+    Returns:
+        tuple[list, Optional[set]]: format (serialized entries, ids of the serialized entries),
+            the ids are None if all entries were serialized
+    """
+    cache = storage_cache[key]
+    changed = dirty_ids[key]
+    new_cache = {}
+    entries = []
+    serialized_ids = None if changed is None else set()
+    for item in collection:
+        entry = None
+        if changed is not None and item.id not in changed:
+            entry = cache.get(item.id)
+        if entry is None:
+            entry = shared.property_to_python(item, exclude=exclude)
+            if item.id in lazy_macros and item.get('lazy_macros', False):
+                entry['macros'] = lazy_macros[item.id]
+            if serialized_ids is not None:
+                serialized_ids.add(item.id)
+        new_cache[item.id] = entry
+        entries.append(entry)
+    storage_cache[key] = new_cache
+    dirty_ids[key] = set()
+    return entries, serialized_ids
+
+
+def indent_json(value, indent: int) -> str:
+    """
+    converts the value to json text, indented to be placed at the given indent of a json file
+
+    Args:
+        value (any): value to convert
+        indent (int): number of spaces the value is indented
+
+    Returns:
+        str: json text of the value
+    """
+    return json.dumps(value, ensure_ascii=False, indent=2).replace("\n", "\n" + " " * indent)
+
+
+def encode_storage(data: dict) -> tuple[bytes, dict]:
+    """
+    converts the data to the content of the storage file, formatted like json with an indent of 2.
+    The macros are written as the last value of each global action, so their position can be indexed
+
+    Args:
+        data (dict): data of the storage, macros can be a list or a Macro_source
+
+    Returns:
+        tuple[bytes, dict]: format (content of the storage file, id of the action -> (offset, length) of the macros)
+    """
+    chunks = []
+    spans = {}
+    position = 0
+
+    def append(text: str) -> None:
+        nonlocal position
+        chunk = text.encode('utf-8')
+        chunks.append(chunk)
+        position += len(chunk)
+
+    append("{")
+    for i, (key, value) in enumerate(data.items()):
+        append("%s\n  %s: " % ("," if i else "", json.dumps(key, ensure_ascii=False)))
+        if key != 'actions':
+            append(indent_json(value, 2))
+            continue
+        append("[")
+        for j, entry in enumerate(value):
+            append("%s\n    {" % ("," if j else ""))
+            fields = [(name, field) for name, field in entry.items() if name != 'macros']
+            for k, (name, field) in enumerate(fields):
+                append("%s\n      %s: %s" % (
+                    "," if k else "", json.dumps(name, ensure_ascii=False), indent_json(field, 6)
+                ))
+            if 'macros' in entry:
+                append('%s\n      "macros": ' % ("," if fields else ""))
+                macros = entry['macros']
+                start = position
+                append(macros.read_text() if isinstance(macros, Macro_source) else indent_json(macros, 6))
+                spans[entry.get('id')] = (start, position - start)
+            append("\n    }")
+        append("\n  ]" if value else "]")
+    append("\n}" if data else "}")
+    return b"".join(chunks), spans
+
+
+def write_file(path: str, content: bytes) -> None:
+    """
+    writes the content to the file, the file is replaced at once, so it is never partly written
+
+    Args:
+        path (str): path to the file
+        content (bytes): content to write
+    """
+    with tempfile.NamedTemporaryFile(
+            'wb', dir=os.path.dirname(path), prefix=".Storage_", suffix=".tmp", delete=False
+    ) as storage_file:
+        storage_file.write(content)
+    os.replace(storage_file.name, path)
+
+
+def write_database_storage(path: str, data: dict, changed: Optional[dict] = None) -> None:
+    """
+    writes the data to the database storage in one transaction,
+    only the changed entries are written and macros which are already stored in the database aren't written again
+
+    Args:
+        path (str): path to the database
+        data (dict): data to write
+        changed (Optional[dict], optional): ids of the changed categories and actions by the key of the collection,
+            None if all entries changed. Defaults to None.
+    """
+    actions = []
+    sources = []
+    for entry in data.get('actions', []):
+        header = {key: value for key, value in entry.items() if key != 'macros'}
+        macros = entry.get('macros', [])
+        if isinstance(macros, Macro_source):
+            sources.append(macros)
+            if macros.data is None and macros.path == path:
+                macros = None
+            else:
+                macros = macros.read()
+        actions.append((entry.get('id'), header, macros))
+    changed = changed or {}
+    database.write_database(
+        path, data.get('categories', []), actions, changed.get('categories'), changed.get('actions')
     )
-    with open(ActRec_pref.storage_path, 'w', encoding='utf-8') as storage_file:
-        json.dump(data, storage_file, ensure_ascii=False, indent=2)
+    for source in sources:
+        source.move(path, None, None)
     logger.info('saved global actions')
 
 
+def write_storage(path: str, data: dict, index: bool = True, changed: Optional[dict] = None) -> None:
+    """
+    writes the data to the storage file and the index of the macros positions next to it,
+    the files are replaced at once, so they are never partly written.
+    A database storage is written with write_database_storage
+
+    Args:
+        path (str): path to the storage file
+        data (dict): data to write
+        index (bool, optional): write the index for the lazy loading,
+            otherwise the storage is written as plain json. Defaults to True.
+        changed (Optional[dict], optional): ids of the changed entries, only used by a database,
+            see write_database_storage. Defaults to None.
+    """
+    if database.is_database(path):
+        write_database_storage(path, data, changed)
+        return
+    if not index:
+        for entry in data.get('actions', []):
+            if isinstance(entry.get('macros'), Macro_source):
+                entry['macros'] = entry['macros'].read()
+        write_file(path, json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8'))
+        with suppress(FileNotFoundError):
+            os.remove(get_index_path(path))
+        logger.info('saved global actions')
+        return
+    content, spans = encode_storage(data)
+    write_file(path, content)
+    stamp = get_stamp(path)
+    headers = []
+    for entry in data.get('actions', []):
+        macros = entry.get('macros')
+        if isinstance(macros, Macro_source):
+            macros.move(path, spans[entry.get('id')], stamp)
+        headers.append({key: value for key, value in entry.items() if key != 'macros'})
+    index = {
+        'version': INDEX_VERSION,
+        'size': stamp[0],
+        'mtime_ns': stamp[1],
+        'categories': data.get('categories', []),
+        'actions': headers,
+        'macros': spans
+    }
+    write_file(get_index_path(path), json.dumps(index, ensure_ascii=False).encode('utf-8'))
+    logger.info('saved global actions')
+
+
+def flush_storage() -> None:
+    """
+    writes all storage files that wait for the debounce timer
+    """
+    while pending_writes:
+        path, (data, index, changed) = pending_writes.popitem()
+        write_storage(path, data, index, changed)
+
+
+def write_pending_storage() -> None:
+    """
+    timer function to write the storage files after the last save
+    """
+    flush_storage()
+
+
+def save(ActRec_pref: AR_preferences, full: bool = False, immediate: bool = False) -> None:
+    """
+    save the global actions and categories to the storage file,
+    only the entries that are marked as changed with mark_dirty are serialized again.
+    The file is written after config.storage_save_delay seconds, to write multiple saves at once
+
+    Args:
+        ActRec_pref (AR_preferences): preferences of this addon
+        full (bool, optional): serialize all entries again. Defaults to False.
+        immediate (bool, optional): write the file without delay. Defaults to False.
+    """
+    if full:
+        mark_dirty(None, None)
+    path = ActRec_pref.storage_path
+    # the entries changed by a save that waits to be written are written as well
+    changed = pending_writes[path][2] if path in pending_writes else {'categories': set(), 'actions': set()}
+    data = {}
+    for key, collection, exclude in (
+            ('categories', ActRec_pref.categories, CATEGORY_EXCLUDE),
+            ('actions', ActRec_pref.global_actions, ACTION_EXCLUDE)):
+        data[key], ids = serialize_entries(collection, key, exclude)
+        changed[key] = None if ids is None or changed[key] is None else changed[key].union(ids)
+    pending_writes[path] = (data, ActRec_pref.global_lazy_load, changed)
+    if bpy.app.timers.is_registered(write_pending_storage):
+        bpy.app.timers.unregister(write_pending_storage)
+    if immediate or bpy.app.background:
+        flush_storage()
+        return
+    bpy.app.timers.register(write_pending_storage, first_interval=config.storage_save_delay, persistent=True)
+
+
+def create_storage(path: str) -> None:
+    """
+    creates an empty storage, a SQLite database if the path has a database extension otherwise a json file
+
+    Args:
+        path (str): path to the new storage
+    """
+    if database.is_database(path):
+        database.connect(path).close()
+        return
+    with open(path, 'w', encoding='utf-8') as storage_file:
+        storage_file.write('{}')
+
+
+def read_storage(path: str) -> dict:
+    """
+    reads the whole storage, independent of the storage format
+
+    Args:
+        path (str): path to the storage
+
+    Returns:
+        dict: data in the format of the json storage, used by import_global_from_dict
+    """
+    if database.is_database(path):
+        return database.read_database(path)
+    with open(path, 'r', encoding='utf-8') as storage_file:
+        return json.loads(storage_file.read() or "{}")
+
+
 def load(ActRec_pref: AR_preferences) -> bool:
     """
     load the global actions and categories from the storage file
@@ -69,26 +508,65 @@ def load(ActRec_pref: AR_preferences) -> bool:
     Returns:
         bool: success
     """
-    if not os.path.exists(ActRec_pref.storage_path):
+    flush_storage()
+    path = ActRec_pref.storage_path
+    if not os.path.exists(path):
         return False
-    with open(ActRec_pref.storage_path, 'r', encoding='utf-8') as storage_file:
-        text = storage_file.read()
-        if not text:
-            text = "{}"
-        data = json.loads(text)
+    lazy = ActRec_pref.global_lazy_load
+    index = None
+    if database.is_database(path):
+        data = database.read_database(path, macros=not lazy)
+    else:
+        index = read_storage_index(path) if lazy else None
+        if index is None:
+            data = read_storage(path)
+        else:
+            data = {key: index[key] for key in ('categories', 'actions') if index[key]}
     logger.info('load global actions')
-    # cleanup
-    for i in range(len(ActRec_pref.categories)):
-        ui_functions.unregister_category(ActRec_pref, i)
-    ActRec_pref.categories.clear()
-    ActRec_pref.global_actions.clear()
+    clear_global_actions(ActRec_pref)
+    if lazy:
+        stamp = get_stamp(path)
+        for action in data.get('actions', []):
+            id = action.get('id')
+            if database.is_database(path):
+                lazy_macros[id] = Macro_source(id, path)
+            elif index is not None:
+                if id in index['macros']:
+                    lazy_macros[id] = Macro_source(id, path, tuple(index['macros'][id]), stamp)
+            elif isinstance(id, str) and shared.is_uuid_hex(id) and 'macros' in action:
+                lazy_macros[id] = Macro_source(id, path, data=action.pop('macros'))
     # load data
     if data:
         import_global_from_dict(ActRec_pref, data)
+        for action in ActRec_pref.global_actions:
+            if action.id in lazy_macros:
+                action['lazy_macros'] = True
         return True
     return False
 
 
+def clear_global_actions(ActRec_pref: AR_preferences) -> None:
+    """
+    removes all global actions and categories together with their storage cache and lazy macros,
+    so the next save serializes all entries again, even if they are added again with the same ids
+
+    Args:
+        ActRec_pref (AR_preferences): preferences of this addon
+    """
+    for i in range(len(ActRec_pref.categories)):
+        ui_functions.unregister_category(ActRec_pref, i)
+    for action in ActRec_pref.global_actions:
+        if action.get('lazy_macros', False):
+            del action['lazy_macros']
+    ActRec_pref.categories.clear()
+    ActRec_pref.global_actions.clear()
+    playback.clear_plans('global_actions')
+    storage_cache['categories'].clear()
+    storage_cache['actions'].clear()
+    lazy_macros.clear()
+    mark_dirty(None, None)
+
+
 def import_global_from_dict(ActRec_pref: AR_preferences, data: dict) -> None:
     """
     import the global actions and categories from a dict
@@ -100,10 +578,10 @@ def import_global_from_dict(ActRec_pref: AR_preferences, data: dict) -> None:
     existing_category_len = len(ActRec_pref.categories)
     value = data.get('categories', None)
     if value:
-        shared.apply_data_to_item(ActRec_pref.categories, value)
+        shared.load_collection(ActRec_pref.categories, value)
     value = data.get('actions', None)
     if value:
-        shared.apply_data_to_item(ActRec_pref.global_actions, value)
+        shared.load_collection(ActRec_pref.global_actions, value)
 
     for i in range(existing_category_len, len(ActRec_pref.categories)):
         ui_functions.register_category(ActRec_pref, i)
@@ -10,7 +10,7 @@ from bpy.types import AddonPreferences, Scene, PropertyGroup
 
 # relative imports
 from .. import shared_data
-from . import shared
+from . import shared, playback
 from .shared import get_preferences
 if TYPE_CHECKING:
     from ..preferences import AR_preferences
@@ -45,8 +45,8 @@ def load_local_action(ActRec_pref: AR_preferences, data: list) -> None:
     """
     actions = ActRec_pref.local_actions
     actions.clear()
-    for value in data:
-        shared.add_data_to_collection(actions, value)
+    playback.clear_plans('local_actions')
+    shared.load_collection(actions, data)
 
 
 def local_action_to_text(action: AR_local_actions, text_name: str = None) -> None:
@@ -1,17 +1,23 @@
 # region Imports
 # external modules
+import ast
+import math
+import bisect
+import functools
 import numpy
-from typing import Tuple, Union
+from collections import defaultdict, deque
+from typing import Tuple, Union, Optional, NamedTuple
+from contextlib import contextmanager, suppress
 import mathutils
 from typing import TYPE_CHECKING
 
 # blender modules
 import bpy
 from bpy.app.handlers import persistent
-from bpy.types import Operator, Scene, Context, AddonPreferences, PropertyGroup, Struct
+from bpy.types import Operator, Scene, Context, AddonPreferences, PropertyGroup, Struct, Property
 
 # relative imports
-from . import shared
+from . import shared, profiling
 from .. import shared_data
 from ..log import logger
 from .shared import get_preferences
@@ -23,6 +29,25 @@ else:
     AR_local_actions = PropertyGroup
 # endregion
 
+# relative tolerance of reported floats, Blender reports floats with 6 significant digits
+REPORT_FLOAT_TOLERANCE = 1e-5
+
+# arrays with more elements are compared with numpy, smaller ones are faster compared element wise
+VECTORIZE_LENGTH = 32
+
+# (identifier, amount of properties) of an operator -> schema of get_operator_schema
+operator_schemas = {}
+
+# report values that are parsed without ast
+REPORT_CONSTANTS = {"True": True, "False": False, "None": None}
+
+# Buttons Context, which isn't used to improve context reports
+# https://docs.blender.org/api/current/bpy.context.html#buttons-context
+BUTTONS_CONTEXT = frozenset({
+    "button_pointer", "id", "texture_slot", "mesh", "armature", "lattice", "curve", "meta_ball",
+    "speaker", "lightprobe", "camera", "material_slot", "texture", "texture_user",
+    "texture_user_property", "bone", "edit_bone", "pose_bone",
+})
 
 # region Functions
 
@@ -73,15 +98,95 @@ def convert_value_to_python(value) -> tuple:
     return value
 
 
+class Operator_snapshot(dict):
+    """
+    properties of an executed operator that differ from their default,
+    the default values are looked up in the schema of the operator
+    """
+    __slots__ = ("defaults",)
+
+    def __init__(self, data: dict, defaults: dict) -> None:
+        """
+        Args:
+            data (dict): properties that differ from their default
+            defaults (dict): default values of the operator, shared by all snapshots of the operator
+        """
+        super().__init__(data)
+        self.defaults = defaults
+
+    def __missing__(self, key: str):
+        return self.defaults[key]
+
+    def get(self, key: str, default=None):
+        if key in self:
+            return dict.__getitem__(self, key)
+        return self.defaults.get(key, default)
+
+
+def get_property_default(prop: Property) -> tuple[bool, object]:
+    """
+    get the default of an operator property in the format of convert_value_to_python
+
+    Args:
+        prop (Property): property of the operator
+
+    Returns:
+        tuple[bool, object]: format (has default, default)
+    """
+    if prop.type in {'POINTER', 'COLLECTION'}:
+        return False, None
+    if not getattr(prop, 'is_array', False):
+        if prop.type == 'ENUM' and prop.is_enum_flag:
+            return True, set(prop.default_flag)
+        return True, prop.default
+    default = tuple(prop.default_array)
+    dimensions = [dimension for dimension in prop.array_dimensions if dimension]
+    if len(dimensions) <= 1:
+        return True, default
+    if len(dimensions) > 2:
+        return False, None
+    if prop.subtype == 'MATRIX':  # stored by column, converted by row
+        columns, rows = dimensions
+        return True, tuple(tuple(default[column * rows + row] for column in range(columns)) for row in range(rows))
+    length = dimensions[1]
+    return True, tuple(default[i: i + length] for i in range(0, len(default), length))
+
+
+def get_operator_schema(rna: Struct) -> tuple[tuple[str], dict]:
+    """
+    get the property identifiers and default values of an operator, the schema is cached by the operator
+
+    Args:
+        rna (Struct): bl_rna of the operator properties
+
+    Returns:
+        tuple[tuple[str], dict]: format (property identifiers, default values)
+    """
+    properties = rna.properties
+    # the length changes if an add-on operator is registered again with other properties
+    key = (rna.identifier, len(properties))
+    schema = operator_schemas.get(key)
+    if schema is not None:
+        return schema
+    defaults = {}
+    for prop in properties[1:]:
+        has_default, default = get_property_default(prop)
+        if has_default:
+            defaults[prop.identifier] = default
+    schema = operator_schemas[key] = (tuple(properties.keys()[1:]), defaults)
+    return schema
+
+
 def executed_operator_to_dict(ops: Operator) -> dict:
     """
-    converts an executed operator properties to a dictionary
+    converts an executed operator properties to a dictionary,
+    only the properties that differ from their default are stored
 
     Args:
         ops (Operator): executed operator to extract data from
 
     Returns:
-        dict: properties of operator
+        dict: properties of operator, Operator_snapshot if the operator has properties
     """
     data = {}
     if hasattr(ops, 'macros') and ops.macros:
@@ -91,180 +196,386 @@ def executed_operator_to_dict(ops: Operator) -> dict:
         props = ops.properties
         if not hasattr(props, 'bl_rna'):
             return props if isinstance(props, dict) else data
-        for key in props.bl_rna.properties.keys()[1:]:
-            data[key] = convert_value_to_python(getattr(props, key))
+        keys, defaults = get_operator_schema(props.bl_rna)
+        for key in keys:
+            value = getattr(props, key)
+            if key not in defaults:
+                data[key] = convert_value_to_python(value)
+                continue
+            default = defaults[key]
+            if value == default:
+                continue
+            value = convert_value_to_python(value)
+            if value != default:
+                data[key] = value
+        return Operator_snapshot(data, defaults)
     return data
 
 
+class Tracked_action(NamedTuple):
+    """executed operator or amount of context changes tracked while recording"""
+    register: bool
+    undo: bool
+    # bl_idname of the operator, "CONTEXT" for context changes
+    bl_idname: str
+    # properties of the operator, amount of context changes for "CONTEXT"
+    data: Union[dict, int]
+
+
 @persistent
 def track_scene(dummy: Scene = None) -> None:
     """
-    tracks the scene to have more information for macro creation
+    tracks the scene while recording to have more information for macro creation,
+    the journal of the recording is read by a timer right after the change,
+    because operators can't be run safely inside of the depsgraph handler
 
     Args:
         dummy (Scene, optional): unused. Defaults to None.
     """
     context = bpy.context
+    track_operators(context)
+    if shared_data.record_journal is not None and not bpy.app.timers.is_registered(read_record_journal):
+        bpy.app.timers.register(read_record_journal, first_interval=0)
+
+
+def read_record_journal() -> None:
+    """
+    timer function to journal the reports of a change while recording,
+    the reports are only read in an open Info editor, so no area is switched while recording
+    """
+    context = bpy.context
+    journal = shared_data.record_journal
+    if journal is None or not get_preferences(context).local_record_macros or get_info_area(context) is None:
+        return
+    journal.read_reports(context)
+
+
+def track_operators(context: Context) -> None:
+    """
+    tracks the executed operators and the context changes while recording
+
+    Args:
+        context (Context): active blender context
+    """
     ActRec_pref = get_preferences(context)
     operators = context.window_manager.operators
     length = len(operators)
+    if not ActRec_pref.local_record_macros:
+        if ActRec_pref.operators_list_length != length:
+            ActRec_pref.operators_list_length = length
+        return
     if not length:
         ActRec_pref.operators_list_length = 0
         return
 
+    tracked_actions = shared_data.tracked_actions
     if length > ActRec_pref.operators_list_length:
         ActRec_pref.operators_list_length = length
         op = operators[-1]
-        shared_data.tracked_actions.append(
-            ['REGISTER' in op.bl_options, 'UNDO' in op.bl_options, op.bl_idname, executed_operator_to_dict(op)]
-        )
+        append_tracked_action(Tracked_action(
+            'REGISTER' in op.bl_options, 'UNDO' in op.bl_options, op.bl_idname, executed_operator_to_dict(op)
+        ))
         return
 
-    len_tracked = len(shared_data.tracked_actions)
+    len_tracked = len(tracked_actions)
     if not len_tracked:
         return
     i = 1
     op = operators[-1]
-    operators_length = len(operators)
-    while 'REGISTER' not in op.bl_options and operators_length > i:
+    while 'REGISTER' not in op.bl_options and length > i:
         i += 1
         op = operators[-i]
-    last_register_op = last_tracked = shared_data.tracked_actions[-1]
+    # consecutive context changes are merged, so the operator can only be followed by
+    # one tracked entry per newer operator and one "CONTEXT" entry in between
+    search_length = min(len_tracked, 2 * length + 1)
+    last_register_op = last_tracked = tracked_actions[-1]
     i = 1
-    while last_register_op[2] != op.bl_idname and len_tracked > i:
+    while last_register_op.bl_idname != op.bl_idname and search_length > i:
         i += 1
-        last_register_op = shared_data.tracked_actions[-i]
+        last_register_op = tracked_actions[-i]
     props = executed_operator_to_dict(op)
-    if last_register_op[2] == op.bl_idname and props != last_register_op[3]:
-        last_register_op[3] = props
+    if last_register_op.bl_idname == op.bl_idname and props != last_register_op.data:
+        tracked_actions[-i] = last_register_op._replace(data=props)
+    elif last_tracked.bl_idname == "CONTEXT":
+        tracked_actions[-1] = last_tracked._replace(data=last_tracked.data + 1)
     else:
-        if last_tracked[2] == "CONTEXT":
-            last_tracked[3] += 1
-        else:
-            shared_data.tracked_actions.append([True, True, "CONTEXT", 1])
+        append_tracked_action(Tracked_action(True, True, "CONTEXT", 1))
+
+
+def append_tracked_action(tracked: Tracked_action) -> None:
+    """
+    appends the tracked action to the ring buffer,
+    a warning is logged when the full buffer drops its oldest tracked action for the first time in the recording
+
+    Args:
+        tracked (Tracked_action): tracked action to append
+    """
+    tracked_actions = shared_data.tracked_actions
+    if len(tracked_actions) == tracked_actions.maxlen:
+        if not shared_data.dropped_tracked_actions:
+            logger.warning(
+                "more than %i actions tracked while recording, the oldest are dropped" % tracked_actions.maxlen
+            )
+        shared_data.dropped_tracked_actions += 1
+    tracked_actions.append(tracked)
 
 
-def get_report_text(context: Context) -> str:
+def get_info_area(context: Context) -> Optional[tuple]:
     """
-    extract all reports from Blender
+    get an open Info editor
 
     Args:
         context (Context): active blender context
 
     Returns:
-        str: report text
+        Optional[tuple]: format (window, area, region), None if no Info editor is open
+    """
+    for window in context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type != 'INFO':
+                continue
+            region = next((region for region in area.regions if region.type == 'WINDOW'), None)
+            return window, area, region
+
+
+@contextmanager
+def info_area_override(context: Context):
     """
+    context to run operators of the Info editor in, uses an open Info editor,
+    otherwise the active area is switched to the Info editor temporarily
+
+    Args:
+        context (Context): active blender context
+    """
+    info_area = get_info_area(context)
+    if info_area is not None:
+        window, area, region = info_area
+        with context.temp_override(window=window, area=area, region=region):
+            yield
+        return
     with context.temp_override():
         area_type = context.area.type
-        clipboard_data = context.window_manager.clipboard
         context.area.type = 'INFO'
-        bpy.ops.info.select_all(action='SELECT')
-        bpy.ops.info.report_copy()
-        bpy.ops.info.select_all(action='DESELECT')
-        report_text = context.window_manager.clipboard
-        context.area.type = area_type
-        context.window_manager.clipboard = clipboard_data
-    return report_text
+        try:
+            yield
+        finally:
+            context.area.type = area_type
 
 
-def compare_fstr_float(fstr: str, fnum: float) -> bool:
+def report_exists(index: int) -> bool:
     """
-    compare if float str is equal to a float number
+    checks if the report at the given index exists by selecting it, needs to run inside info_area_override
 
     Args:
-        fstr (str): float as str
-        fnum (float): float to compare to
+        index (int): index of the report, starting with the oldest report
 
     Returns:
-        bool: equal compare result
+        bool: report exists
     """
-    precision = len(fstr.split(".")[-1])
-    return float(fstr) == round(fnum, precision)
+    return 'FINISHED' in bpy.ops.info.select_pick(report_index=index, extend=False)
 
 
-def compare_value(str_value: str, value) -> bool:
+def count_reports(start: int = 0) -> int:
     """
-    compare if str value and value area equal
+    counts the reports with an exponential and binary search, needs to run inside info_area_override
 
     Args:
-        str_value (str): value as str
-        value (any): value to compare to
+        start (int, optional): amount of reports that are known to exist. Defaults to 0.
 
     Returns:
-        bool: equal compare result
+        int: amount of reports
     """
-    return (isinstance(value, float) and compare_fstr_float(str_value, value)
-            or isinstance(value, set) and str_value == str(value)
-            or isinstance(value, bool) and str_value == str(value)
-            or isinstance(value, int) and str_value == str(value)
-            or isinstance(value, str) and str_value[1: -1] == value)
+    low = start  # amount of reports that are known to exist
+    step = 1
+    high = start + step
+    while report_exists(high - 1):
+        low = high
+        step *= 2
+        high = start + step
+    # the report at index high - 1 doesn't exist
+    while low < high - 1:
+        middle = (low + high) // 2
+        if report_exists(middle - 1):
+            low = middle
+        else:
+            high = middle
+    bpy.ops.info.select_all(action='DESELECT')
+    return low
 
 
-def str_dict_to_dict(obj: str) -> dict:
+def get_report_count(context: Context) -> int:
     """
-    converts str in dict format to an actual dict with values as str
+    get the amount of reports, used as cursor to only read the new reports with get_report_text
 
     Args:
-        obj (str): str to convert
+        context (Context): active blender context
 
     Returns:
-        dict: converted string with str as values
+        int: amount of reports
     """
-    items = obj.strip()[1:-1].split(", ")
-    data = {}
-    last_key = None
-    for item in items:
-        split = item.split(":")
-        if len(split) == 2:
-            key, value = split
-            last_key = key[1:-1]
-            data[last_key] = value
+    with info_area_override(context):
+        return count_reports()
+
+
+def get_report_text(context: Context, start: int = 0, stop: Optional[int] = None) -> str:
+    """
+    extract the reports from Blender, only the reports between start and stop are copied
+
+    Args:
+        context (Context): active blender context
+        start (int, optional): index of the first report to extract. Defaults to 0.
+        stop (Optional[int], optional): index after the last report to extract, all reports after start if None.
+            Defaults to None.
+
+    Returns:
+        str: report text
+    """
+    with info_area_override(context):
+        if start <= 0 and stop is None:
+            bpy.ops.info.select_all(action='SELECT')
         else:
-            data[last_key] += ", %s" % split[0]
-    return data
+            bpy.ops.info.select_all(action='DESELECT')
+            index = max(start, 0)
+            while (stop is None or index < stop) and 'FINISHED' in bpy.ops.info.select_pick(
+                    report_index=index, extend=True):
+                index += 1
+            if index == max(start, 0):
+                return ""
+        # the reports are copied through the clipboard, which is restored afterwards
+        clipboard_data = context.window_manager.clipboard
+        try:
+            bpy.ops.info.report_copy()
+            bpy.ops.info.select_all(action='DESELECT')
+            return context.window_manager.clipboard
+        finally:
+            context.window_manager.clipboard = clipboard_data
 
 
-def compare_op_dict(op1_props: dict, op2_props: dict) -> bool:
+@functools.lru_cache(maxsize=4096)
+def parse_report_value(str_value: str):
     """
-    compares two operator dict
-    (op_dict can be created with executed_operator_to_dict)
+    converts a value of a report to a python value, values that aren't python literals are kept as str.
+    The results are cached because most reports repeat the same values and must not be changed
 
     Args:
-        op1_props (dict): first operator dict
-        op2_props (dict): second operator dict
+        str_value (str): value of the report
+
+    Returns:
+        any: python value
+    """
+    if str_value in REPORT_CONSTANTS:
+        return REPORT_CONSTANTS[str_value]
+    with suppress(ValueError):
+        return int(str_value)
+    with suppress(ValueError):
+        return float(str_value)
+    try:
+        return ast.literal_eval(str_value)
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+        return str_value
+
+
+def parse_report_values(values: dict) -> dict:
+    """
+    converts all values of an operator report to python values
+
+    Args:
+        values (dict): values of the report as str (created with split_operator_report)
+
+    Returns:
+        dict: values as python values
+    """
+    return {key: parse_report_value(value) for key, value in values.items()}
+
+
+def compare_report_value(report_value, value) -> bool:
+    """
+    compare a parsed report value with the value of the property,
+    floats are compared with the precision Blender reports them with
+
+    Args:
+        report_value (any): value parsed with parse_report_value
+        value (any): value of the property (converted with convert_value_to_python)
 
     Returns:
         bool: equal compare result
     """
-    for key, str_value in op1_props.items():
-        value = op2_props.get(key, None)
-        if value is None:
-            return False
-        if "_OT_" in key:
-            if compare_op_dict(str_dict_to_dict(str_value), value):
-                continue
+    if isinstance(value, dict):  # properties of a macro operator
+        return isinstance(report_value, dict) and compare_report_values(report_value, value)
+    if isinstance(value, tuple):
+        if not isinstance(report_value, (tuple, list)):
             return False
-        elif isinstance(value, tuple):
-            str_value = str_value[1: -1]
-            if isinstance(value[0], tuple):
-                # switch column and row
-                value = [[value[i][j] for i in range(len(value[0]))] for j in range(len(value))]
-                str_vectors = str_value.replace("(", "").split(")")
-                for str_vec, vec in zip(str_vectors, value):
-                    str_vec = [x for x in str_vec.split(", ") if x]
-                    for str_v, v in zip(str_vec, vec):
-                        if not compare_value(str_v, v):
-                            return False
-            else:
-                str_vec = [x for x in str_value.split(", ") if x]
-                for str_v, v in zip(str_vec, value):
-                    if not compare_value(str_v, v):
-                        return False
-        elif not compare_value(str_value, value):
+        if len(value) > VECTORIZE_LENGTH:
+            return compare_report_array(report_value, value)
+        if value and isinstance(value[0], tuple):  # matrices are reported column major
+            value = tuple(zip(*value))
+        return len(report_value) == len(value) and all(map(compare_report_value, report_value, value))
+    if isinstance(value, bool) or isinstance(report_value, bool):
+        return report_value is value
+    if isinstance(value, float):
+        return isinstance(report_value, (int, float)) and math.isclose(
+            report_value, value, rel_tol=REPORT_FLOAT_TOLERANCE, abs_tol=REPORT_FLOAT_TOLERANCE)
+    if isinstance(value, set):
+        return isinstance(report_value, (set, tuple, list)) and set(report_value) == value
+    return report_value == value
+
+
+def compare_report_array(report_value: Union[tuple, list], value: tuple) -> bool:
+    """
+    compare a parsed report array with a large array property vectorized,
+    floats are compared with the precision Blender reports them with
+
+    Args:
+        report_value (Union[tuple, list]): array parsed with parse_report_value
+        value (tuple): value of the property (converted with convert_value_to_python)
+
+    Returns:
+        bool: equal compare result
+    """
+    try:
+        report_array = numpy.array(report_value, dtype=float)
+        array = numpy.array(value, dtype=float)
+    except (ValueError, TypeError):
+        return tuple(report_value) == value
+    if array.ndim == 2:  # matrices are reported column major
+        array = array.T
+    return report_array.shape == array.shape and numpy.allclose(
+        report_array, array, rtol=REPORT_FLOAT_TOLERANCE, atol=REPORT_FLOAT_TOLERANCE)
+
+
+def compare_report_values(report_values: dict, values: dict) -> bool:
+    """
+    compares the parsed values of an operator report with the properties of an executed operator
+
+    Args:
+        report_values (dict): values parsed with parse_report_values
+        values (dict): properties of the operator (created with executed_operator_to_dict)
+
+    Returns:
+        bool: equal compare result
+    """
+    for key, report_value in report_values.items():
+        value = values.get(key, None)
+        if value is None or not compare_report_value(report_value, value):
             return False
     return True
 
 
+def compare_op_dict(op1_props: dict, op2_props: dict) -> bool:
+    """
+    compares two operator dict
+    (op1_props can be created with split_operator_report, op2_props with executed_operator_to_dict)
+
+    Args:
+        op1_props (dict): first operator dict with values as str
+        op2_props (dict): second operator dict
+
+    Returns:
+        bool: equal compare result
+    """
+    return compare_report_values(parse_report_values(op1_props), op2_props)
+
+
 def stringify_values(values: dict) -> dict:
     """
     converts all values in the dict to stringed version
@@ -301,13 +612,12 @@ print(json.dumps(d, ensure_ascii=False, indent=2))
 # Programm to get all operators divided by bl_options
 
 
-def check_tracked_needed(tracked: list) -> bool:
+def check_tracked_needed(tracked: Tracked_action) -> bool:
     """
     checks if the tracked Operator is needed in the report but was not reported by Blender
 
     Args:
-        tracked (list): tracked action to check;
-            format: [isRegistered: bool, isUndo: bool, Operator(_OT_): str, parameters: dict]
+        tracked (Tracked_action): tracked action to check
 
     Returns:
         bool: is needed ?
@@ -339,104 +649,179 @@ def check_tracked_needed(tracked: list) -> bool:
         "NODE_OT_resize",
     }
 
-    return tracked[2] in needed_operators
+    return tracked.bl_idname in needed_operators
 
 
-def merge_report_tracked(reports: list, tracked_actions: list) -> list[tuple]:
+class Report_token(NamedTuple):
+    """report split apart once to merge it with the tracked actions"""
+    # 0 - Context, 1 - Operator, -1 - no macro report
+    type: int
+    # bl_idname of the operator, empty for context reports
+    bl_idname: str
+    # operator type or source path of the context report
+    path: Union[str, list]
+    # operator name or attribute of the context report
+    name: str
+    # operator values or value of the context report
+    values: Union[dict, str]
+    # operator values parsed with parse_report_values, empty for context reports
+    parsed_values: dict
+
+
+def tokenize_report(report: str) -> Report_token:
     """
-    merge reports together with the tracked actions to provide better data for macro creation
+    split apart the report for the merge with the tracked actions
 
     Args:
-        reports (list): reports from Blender
-        tracked_actions (list): tracked actions from scene
-            Element format: [isRegistered: bool, isUndo: bool, Operator(_OT_): str, parameters: dict]
+        report (str): report from Blender
 
     Returns:
-        list[tuple]:
-            list with elements format (Type: int, Registered: bool, Undo: bool, type: str, name: str, value[s]: dict)
-            Type: 0 - Context, 1 Operator
+        Report_token: split apart report
     """
-    # create numpy.array for efficient access
-    reports = numpy.array(reports)
-    tracked_actions = numpy.array(tracked_actions)
-    data = []
-    len_report = len(reports)
-    len_tracked = len(tracked_actions)
-    report_i = tracked_i = 0
-    last_i = -1
-    # calculate operator
-    continue_report = len_report > report_i
-    continue_tracked = len_tracked > tracked_i
-    tracked = [True, True, "CONTEXT", 1]
-    logger.info("reports: %s\ntracked:%s" % (reports, tracked_actions))
-    while continue_report or continue_tracked:
-        if continue_report:
-            report = reports[report_i]
-        if continue_tracked:
-            tracked = tracked_actions[tracked_i]
-        if report.startswith('bpy.ops.'):
-            if last_i != report_i:
-                # clean up reports first before merge with tracked actions!!!
-                op_type, op_name, op_values = split_operator_report(report)
-            last_i = report_i
-            if tracked[2] == "%s_OT_%s" % (op_type.upper(), op_name):
-                if compare_op_dict(op_values, tracked[3]):
-                    if continue_report:
-                        data.append((1, True, tracked[1], op_type, op_name, op_values))
-                    tracked_i += 1
-                elif not continue_report:  # no reports left use latest report
-                    data.append((
-                        1,
-                        True,
-                        'UNDO' in getattr(getattr(bpy.ops, op_type), op_name).bl_options,
-                        op_type,
-                        op_name,
-                        op_values
-                    ))
-                    break
-                report_i += 1
-            else:
-                if len_tracked <= tracked_i:  # no tracked left but report operator exists
+    if report.startswith('bpy.ops.'):
+        op_type, op_name, op_values = split_operator_report(report)
+        return Report_token(
+            1, "%s_OT_%s" % (op_type.upper(), op_name), op_type, op_name, op_values, parse_report_values(op_values)
+        )
+    if report.startswith('bpy.context.'):
+        source_path, attribute, value = split_context_report(report)
+        return Report_token(0, "", source_path, attribute, value, {})
+    return Report_token(-1, "", "", "", "", {})
+
+
+def get_tracked_entry(tracked: Tracked_action) -> tuple:
+    """
+    converts a tracked operator, which wasn't reported by Blender, to a merged entry
+
+    Args:
+        tracked (Tracked_action): tracked operator
+
+    Returns:
+        tuple: format (Type: int, Registered: bool, Undo: bool, type: str, name: str, value[s]: dict)
+    """
+    tracked_type, tracked_name = tracked.bl_idname.split("_OT_")
+    return (1, True, tracked.undo, tracked_type.lower(), tracked_name, stringify_values(tracked.data))
+
+
+class Report_merger:
+    """
+    merges reports together with the tracked actions,
+    the position in the tracked actions is kept, so the reports of a recording can be merged in parts
+    """
+
+    def __init__(self) -> None:
+        # index of the next tracked action to match
+        self.tracked_i = 0
+        # context changes of the tracked action at tracked_i that aren't reported yet
+        self.context_left = None
+        # indices of the merged operators of the last merge, which weren't tracked
+        self.untracked = set()
+
+    @profiling.profiled("merge")
+    def merge(self, reports: list, tracked_actions: list, final: bool = True) -> list[tuple]:
+        """
+        merge reports together with the tracked actions to provide better data for macro creation.
+        Every report operator is matched with the next tracked operator of the same bl_idname,
+        the tracked actions in between are skipped and only added if Blender doesn't report them
+
+        Args:
+            reports (list): reports from Blender
+            tracked_actions (list): tracked actions from scene, Element format:
+                Tracked_action(isRegistered: bool, isUndo: bool, Operator(_OT_): str, parameters: dict)
+            final (bool, optional): no reports follow, the remaining tracked operators are added. Defaults to True.
+
+        Returns:
+            list[tuple]: list with elements format
+                (Type: int, Registered: bool, Undo: bool, type: str, name: str, value[s]: dict)
+                Type: 0 - Context, 1 Operator
+        """
+        tracked_actions = list(tracked_actions)
+        logger.info("reports: %s\ntracked:%s", reports, tracked_actions)
+        # positions of the tracked actions accessed by bl_idname
+        tracked_positions = defaultdict(list)
+        for i, tracked in enumerate(tracked_actions):
+            tracked_positions[tracked.bl_idname].append(i)
+        len_tracked = len(tracked_actions)
+        tracked_i = self.tracked_i
+        context_left = self.context_left
+        self.untracked = set()
+        data = []
+        tokens = [tokenize_report(report) for report in reports]
+        # index of the last report of each operator
+        last_reports = {token.bl_idname: i for i, token in enumerate(tokens) if token.type == 1}
+        for report_i, token in enumerate(tokens):
+            if token.type == 1:
+                positions = tracked_positions.get(token.bl_idname)
+                position_i = bisect.bisect_left(positions, tracked_i) if positions else 0
+                if not positions or position_i == len(positions):  # the operator wasn't tracked
+                    self.untracked.add(len(data))
                     data.append((
                         1,
                         True,
-                        'UNDO' in getattr(getattr(bpy.ops, op_type), op_name).bl_options,
-                        op_type,
-                        op_name,
-                        op_values
+                        'UNDO' in getattr(getattr(bpy.ops, token.path), token.name).bl_options,
+                        token.path,
+                        token.name,
+                        token.values
                     ))
-                    report_i += 1
-                elif check_tracked_needed(tracked):  # unreported tracked operators to add to reports
-                    tracked_type, tracked_name = tracked[2].split("_OT_")
-                    tracked_type = tracked_type.lower()
-                    data.append((
-                        1,
-                        True,
-                        tracked[1],
-                        tracked_type,
-                        tracked_name,
-                        stringify_values(tracked[3])
-                    ))  # Fake Registered
+                    continue
+                position = positions[position_i]
+                # unreported tracked operators to add to reports
+                data.extend(
+                    get_tracked_entry(tracked)
+                    for tracked in tracked_actions[tracked_i: position] if check_tracked_needed(tracked)
+                )  # Fake Registered
+                if position != tracked_i:
+                    tracked_i = position
+                    context_left = None
+                tracked = tracked_actions[position]
+                # otherwise the operator was changed afterwards and a later report contains the final values,
+                # without a later report the values of the last report are used
+                if (compare_report_values(token.parsed_values, tracked.data)
+                        or final and last_reports[token.bl_idname] == report_i):
+                    data.append((1, True, tracked.undo, token.path, token.name, token.values))
+                    tracked_i += 1
+                    context_left = None
+            elif token.type == 0:
+                undo = not (any(x in token.path for x in ("screen", "area", "space_data"))
+                            or all(x in token.name for x in ("active", "index")))  # exclude index set of UIList
+                data.append((0, True, undo, token.path, token.name, token.values))
+                if tracked_i >= len_tracked:
+                    continue
+                tracked = tracked_actions[tracked_i]
+                if tracked.bl_idname == 'CONTEXT':
+                    context_left = (tracked.data if context_left is None else context_left) - 1
+                    if context_left > 0:
+                        continue
+                elif tracked.register:
+                    continue
                 tracked_i += 1
-        elif report.startswith('bpy.context.'):
-            if continue_report:
-                source_path, attribute, value = split_context_report(
-                    report)
-                undo = not (any(x in source_path for x in ("screen", "area", "space_data"))
-                            or all(x in attribute for x in ("active", "index")))  # exclude index set of UIList
-                data.append((0, True, undo, source_path, attribute, value))
-                report_i += 1
-            if tracked[2] == 'CONTEXT':
-                tracked[3] -= 1
-            tracked_i += (tracked[2] == 'CONTEXT' and tracked[3] == 0) or (not continue_report or not tracked[0])
-        else:
-            report_i += 1
-            if not continue_report:
-                break
+                context_left = None
+        if final:
+            data.extend(
+                get_tracked_entry(tracked) for tracked in tracked_actions[tracked_i:] if check_tracked_needed(tracked)
+            )
+            tracked_i = len_tracked
+            context_left = None
+        self.tracked_i = tracked_i
+        self.context_left = context_left
+        return data
 
-        continue_report = len_report > report_i
-        continue_tracked = len_tracked > tracked_i
-    return data
+
+def merge_report_tracked(reports: list, tracked_actions: list) -> list[tuple]:
+    """
+    merge all reports of a recording together with the tracked actions, see Report_merger.merge
+
+    Args:
+        reports (list): reports from Blender
+        tracked_actions (list): tracked actions from scene
+            Element format: Tracked_action(isRegistered: bool, isUndo: bool, Operator(_OT_): str, parameters: dict)
+
+    Returns:
+        list[tuple]:
+            list with elements format (Type: int, Registered: bool, Undo: bool, type: str, name: str, value[s]: dict)
+            Type: 0 - Context, 1 Operator
+    """
+    return Report_merger().merge(reports, tracked_actions)
 
 
 def add_report_as_macro(
@@ -561,9 +946,118 @@ def trace_collection(base: Struct, path: str) -> Struct:
     return base
 
 
+@functools.lru_cache(maxsize=None)
+def get_struct_subtypes() -> dict[str, list]:
+    """
+    get the derived structs of every Blender struct, e.g. the pointer Object.data can lead to a Mesh
+
+    Returns:
+        dict[str, list]: identifier of the struct -> Blender structs that are derived from it
+    """
+    subtypes = defaultdict(list)
+    for name in dir(bpy.types):
+        rna = getattr(getattr(bpy.types, name, None), 'bl_rna', None)
+        if rna is None or rna.identifier != name:
+            continue
+        base = rna.base
+        while base is not None:
+            subtypes[base.identifier].append(rna)
+            base = base.base
+    return subtypes
+
+
+@functools.lru_cache(maxsize=None)
+def get_pointer_properties(identifier: str) -> tuple[tuple[str, str]]:
+    """
+    get the properties of a struct, that get_copy_of_object can follow
+
+    Args:
+        identifier (str): identifier of the Blender struct
+
+    Returns:
+        tuple[tuple[str, str]]: format (identifier of the property, identifier of the struct it leads to)
+    """
+    rna = getattr(getattr(bpy.types, identifier, None), 'bl_rna', None)
+    if rna is None:
+        return ()
+    properties = []
+    for prop in rna.properties[1:]:
+        if prop.type == 'POINTER':
+            target = prop.fixed_type
+        elif prop.type == 'COLLECTION':  # the items aren't followed, only the struct of the collection itself
+            target = prop.srna
+        else:
+            continue
+        if target is not None:
+            properties.append((prop.identifier, target.identifier))
+    return tuple(properties)
+
+
+def struct_has_attribute(rna: Struct, attribute: str) -> bool:
+    """
+    checks if instances of the Blender struct have the attribute
+
+    Args:
+        rna (Struct): Blender struct to check
+        attribute (str): attribute to look for
+
+    Returns:
+        bool: struct has the attribute
+    """
+    return (attribute in rna.properties
+            or attribute in rna.functions
+            or hasattr(getattr(bpy.types, rna.identifier, None), attribute))
+
+
+@functools.lru_cache(maxsize=None)
+def can_reach_attribute(identifier: str, attribute: str, depth: int) -> bool:
+    """
+    checks if the attribute can be reached from the struct or one of its derived structs within the depth
+
+    Args:
+        identifier (str): identifier of the Blender struct
+        attribute (str): attribute to look for
+        depth (int): amount of structs that can be visited, the struct itself included
+
+    Returns:
+        bool: attribute can be reached
+    """
+    if depth <= 0:
+        return False
+    rna = getattr(getattr(bpy.types, identifier, None), 'bl_rna', None)
+    if rna is None:
+        return False
+    return any(
+        struct_has_attribute(struct, attribute) or get_attribute_properties(struct.identifier, attribute, depth)
+        for struct in (rna, *get_struct_subtypes().get(identifier, ()))
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_attribute_properties(identifier: str, attribute: str, depth: int) -> tuple[str]:
+    """
+    index of the properties that can lead to the attribute, built from bl_rna and cached for the session
+
+    Args:
+        identifier (str): identifier of the Blender struct
+        attribute (str): attribute to look for
+        depth (int): amount of structs that can be visited, the struct itself included
+
+    Returns:
+        tuple[str]: identifiers of the properties of the struct to follow
+    """
+    if depth <= 1:
+        return ()
+    return tuple(
+        prop for prop, target in get_pointer_properties(identifier)
+        if can_reach_attribute(target, attribute, depth - 1)
+    )
+
+
 def get_copy_of_object(data: dict, obj: Struct, attribute: str, depth=5) -> dict:
     """
-    makes a copy of a given blender object
+    makes a copy of a given blender object,
+    only the properties that can lead to the attribute are followed
 
     Args:
         data (dict): data to write part of the copy to
@@ -577,22 +1071,21 @@ def get_copy_of_object(data: dict, obj: Struct, attribute: str, depth=5) -> dict
     if not (depth and obj):
         return data
     if hasattr(obj, attribute):
-        return {attribute: getattr(obj, attribute)}
+        return {attribute: convert_value_to_python(getattr(obj, attribute))}
     if not hasattr(obj, 'bl_rna'):
         return data
-    for prop in obj.bl_rna.properties[1:]:
-        if not (prop.type == 'COLLECTION' or prop.type == 'POINTER'):
-            continue
-        sub_obj = getattr(obj, prop.identifier)
+    for identifier in get_attribute_properties(obj.bl_rna.identifier, attribute, depth):
+        sub_obj = getattr(obj, identifier)
         if obj == sub_obj:
             continue
         res = get_copy_of_object({}, sub_obj, attribute, depth - 1)
         if res == {}:
             continue
-        data[prop.identifier] = res
+        data[identifier] = res
     return data
 
 
+@profiling.profiled("create_object_copy")
 def create_object_copy(context: Context, source_path: list, attribute: str) -> dict:
     """
     creates a copy of a given object based on it's source path and attribute from the context
@@ -633,7 +1126,7 @@ def compare_object_report(
             tuple: format (object class, source_path as str, attribute, value)
             None: object couldn't be compared
     """
-    if hasattr(obj, attribute) and getattr(obj, attribute) != copy_dict[attribute]:
+    if hasattr(obj, attribute) and convert_value_to_python(getattr(obj, attribute)) != copy_dict[attribute]:
         return (obj.__class__, ".".join(source_path), attribute, value)
     for key in copy_dict:
         if not hasattr(obj, key):
@@ -646,17 +1139,128 @@ def compare_object_report(
     return
 
 
-def improve_context_report(context: Context, copy_dict: dict, source_path: list, attribute: str, value: str
-                           ) -> str:
+def get_member_types(context: Context) -> tuple:
+    """
+    get the classes of the context members, which are mapped by map_member_classes
+
+    Args:
+        context (Context): active blender context
+
+    Returns:
+        tuple: format ((context attribute, class), ...)
+    """
+    return tuple(
+        (attr, type(getattr(context, attr, None))) for attr in context.__dir__() if attr not in BUTTONS_CONTEXT
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def map_member_classes(member_types: tuple) -> dict[type, str]:
+    """
+    maps the classes of the context members to the first context attribute with an instance of the class,
+    only mapped again if the class of a context member changed
+
+    Args:
+        member_types (tuple): classes of the context members, created with get_member_types
+
+    Returns:
+        dict[type, str]: class -> context attribute
+    """
+    class_map = {}
+    for attr, member_type in member_types:
+        for cls in member_type.__mro__:
+            class_map.setdefault(cls, attr)
+    return class_map
+
+
+def map_context_classes(context: Context) -> dict[type, str]:
+    """
+    maps the classes of the context members to the first context attribute with an instance of the class
+
+    Args:
+        context (Context): active blender context
+
+    Returns:
+        dict[type, str]: class -> context attribute
+    """
+    return map_member_classes(get_member_types(context))
+
+
+def get_context_attribute(context: Context, object_class: type) -> Optional[str]:
+    """
+    get the first context attribute with an instance of the given class
+
+    Args:
+        context (Context): active blender context
+        object_class (type): class to look for
+
+    Returns:
+        Optional[str]: context attribute, None if no context member is an instance of the class
+    """
+    return map_context_classes(context).get(object_class)
+
+
+def compare_copy_report(
+        obj: Struct,
+        before: Optional[dict],
+        after: dict,
+        source_path: list,
+        attribute: str,
+        value: str) -> Union[tuple, None]:
+    """
+    compare the copies of a blender object from before and after the change of the context report,
+    without a copy from before the change the copy from after the change is compared against the reported value
+
+    Args:
+        obj (Struct): object the copies were made of, used to get the class of the changed object
+        before (Optional[dict]): copy of the object before the change
+        after (dict): copy of the object after the change
+        source_path (list): path to trace for deeper compare,
+            path from the context (excluded) to the attribute (excluded)
+        attribute (str): attribute to compare
+        value (str): reported value of the attribute
+
+    Returns:
+        Union[tuple, None]:
+            tuple: format (object class, source_path as str, attribute, value)
+            None: object couldn't be compared
+    """
+    if attribute in after and hasattr(obj, attribute):
+        if before is None:
+            changed = compare_report_value(parse_report_value(value), after[attribute])
+        else:
+            changed = before.get(attribute) != after[attribute]
+        if changed:
+            return (obj.__class__, ".".join(source_path), attribute, value)
+    for key, sub_after in after.items():
+        if not (isinstance(sub_after, dict) and hasattr(obj, key)):
+            continue
+        sub_before = None if before is None else before.get(key, {})
+        res = compare_copy_report(getattr(obj, key), sub_before, sub_after, [*source_path, key], attribute, value)
+        if res:
+            return res
+    return
+
+
+def improve_context_report(
+        context: Context,
+        copy_dict: Optional[dict],
+        source_path: list,
+        attribute: str,
+        value: str,
+        changed_copy: Optional[dict] = None) -> str:
     """
     improve the context report(<source_path>.<attribute>) with the active context to get accurate results
 
     Args:
         context (Context): active blender context
-        copy_dict (dict): copy of an blender object
+        copy_dict (Optional[dict]): copy of an blender object before the change,
+            the object itself is compared against the copy if changed_copy is None
         source_path (list): path from the context (excluded) to the attribute (excluded)
         attribute (str): attribute for the source path
         value (str): value to assign to the attribute
+        changed_copy (Optional[dict], optional): copy of the blender object after the change,
+            journaled while recording. Defaults to None.
 
     Returns:
         str: format bpy.context.<source_path>.<attribute> = <value>
@@ -666,24 +1270,268 @@ def improve_context_report(context: Context, copy_dict: dict, source_path: list,
         object_class = id_object.__class__
         res = [".".join(source_path), attribute, value]
     else:
-        res = compare_object_report(id_object, copy_dict, source_path, attribute, value)
+        if changed_copy is None:
+            res = compare_object_report(id_object, copy_dict, source_path, attribute, value)
+        else:
+            res = compare_copy_report(id_object, copy_dict, changed_copy, source_path, attribute, value)
         if res:
             object_class, *res = res
         else:
             object_class, *res = id_object.__class__, ".".join(source_path), attribute, value
-    for attr in context.__dir__():
-        # exclude Buttons Context https://docs.blender.org/api/current/bpy.context.html#buttons-context
-        if (attr not in
-                set([
-                    "button_pointer", "id", "texture_slot", "mesh", "armature", "lattice", "curve", "meta_ball",
-                    "speaker", "lightprobe", "camera", "material_slot", "texture", "texture_user",
-                    "texture_user_property", "bone", "edit_bone", "pose_bone",
-                ]) and isinstance(getattr(bpy.context, attr), object_class)):
-            res[0] = attr
-            break
+    context_attribute = get_context_attribute(context, object_class)
+    if context_attribute is not None:
+        res[0] = context_attribute
     return "bpy.context.%s.%s = %s" % tuple(res)
 
 
+class Journal_entry(NamedTuple):
+    """copies of the object of a context report, made while recording"""
+    before: Optional[dict]
+    after: dict
+
+
+class Record_journal:
+    """
+    journal of the object copies that are needed to improve the context reports,
+    written by the timer read_record_journal right after the change,
+    so the recording doesn't need to be undone and redone when it is stopped
+    """
+
+    def __init__(self, cursor: int) -> None:
+        """
+        Args:
+            cursor (int): amount of reports at the start of the recording
+        """
+        self.cursor = cursor
+        # (source_path, attribute) -> Journal_entry or None in order of the reports
+        self.entries = defaultdict(deque)
+        # (source_path, attribute) -> latest copy, used as copy before the next change
+        self.copies = {}
+
+    def read_reports(self, context: Context) -> list[str]:
+        """
+        journals the context reports that were added since the last read
+
+        Args:
+            context (Context): active blender context, needs an area
+
+        Returns:
+            list[str]: reports added since the last read
+        """
+        with info_area_override(context):
+            if not report_exists(self.cursor):
+                return []
+            count = count_reports(self.cursor)
+        reports = get_report_text(context, self.cursor, count).splitlines()
+        self.cursor = count
+        context_reports = []
+        for report in reports:
+            if not report.startswith('bpy.context.'):
+                continue
+            try:
+                context_reports.append(split_context_report(report))
+            except ValueError as err:
+                logger.info("Journal couldn't split %s: %s", report, err)
+        # only the state after the last change of an attribute is known, if it changed multiple times
+        last_changes = {(".".join(source_path), attribute): i
+                        for i, (source_path, attribute, value) in enumerate(context_reports)}
+        for i, (source_path, attribute, value) in enumerate(context_reports):
+            try:
+                self.add(context, source_path, attribute, value,
+                         last_changes[(".".join(source_path), attribute)] == i)
+            except (AttributeError, ValueError, TypeError) as err:
+                logger.info("Journal couldn't copy the object of %s.%s: %s", source_path, attribute, err)
+        return reports
+
+    @profiling.profiled("journal_copy")
+    def add(self, context: Context, source_path: list, attribute: str, value: str, copy: bool = True) -> None:
+        """
+        copies the object of the context report,
+        objects that contain the attribute don't need a copy to be improved
+
+        Args:
+            context (Context): active blender context
+            source_path (list): path from the context (excluded) to the attribute (excluded)
+            attribute (str): attribute for the source path
+            value (str): value assigned to the attribute, unused
+            copy (bool, optional): the object is in the state after the change,
+                otherwise the report is journaled without copies. Defaults to True.
+        """
+        id_object = get_id_object(context, source_path, attribute)
+        if id_object is None or hasattr(id_object, attribute):
+            return
+        key = (".".join(source_path), attribute)
+        if not copy:
+            self.entries[key].append(None)
+            return
+        after = get_copy_of_object({}, id_object, attribute)
+        self.entries[key].append(Journal_entry(self.copies.get(key), after))
+        self.copies[key] = after
+
+    def pop(self, source_path: list, attribute: str) -> Optional[Journal_entry]:
+        """
+        get the oldest journaled copies of the given context report
+
+        Args:
+            source_path (list): path from the context (excluded) to the attribute (excluded)
+            attribute (str): attribute for the source path
+
+        Returns:
+            Optional[Journal_entry]: copies of the object, None if no copy was needed or made
+        """
+        entries = self.entries.get((".".join(source_path), attribute))
+        if entries:
+            return entries.popleft()
+
+
+class Live_record_journal(Record_journal):
+    """
+    journal that adds the reports as macros to the recorded action right after the change,
+    the timer read_record_journal reads the reports from the cursor and merges them with the tracked actions in parts.
+    The macros are never added inside of the depsgraph handler, which would be triggered again by the change
+    """
+
+    def __init__(self, cursor: int, action_id: str) -> None:
+        """
+        Args:
+            cursor (int): amount of reports at the start of the recording
+            action_id (str): id of the local action to add the macros to
+        """
+        super().__init__(cursor)
+        self.action_id = action_id
+        self.merger = Report_merger()
+        # reports that couldn't be added as macro
+        self.error_reports = []
+        # (type, name, id of the macro) of the last added operator
+        self.last_operator = None
+
+    def read_reports(self, context: Context) -> list[str]:
+        """
+        journals the reports that were added since the last read and adds them as macros
+
+        Args:
+            context (Context): active blender context, needs an area
+
+        Returns:
+            list[str]: reports added since the last read
+        """
+        reports = super().read_reports(context)
+        self.add_macros(context, [report for report in reports if report.startswith('bpy.')])
+        return reports
+
+    def add_macros(self, context: Context, reports: list[str], final: bool = False) -> None:
+        """
+        merges the reports with the tracked actions and adds them as macros,
+        the used tracked actions are removed
+
+        Args:
+            context (Context): active blender context
+            reports (list[str]): new reports
+            final (bool, optional): the recording stopped, the remaining tracked operators are added.
+                Defaults to False.
+        """
+        tracked_actions = shared_data.tracked_actions
+        if not (reports or final and tracked_actions):
+            return
+        merged = self.merger.merge(reports, tracked_actions, final)
+        for _ in range(min(self.merger.tracked_i, len(tracked_actions))):
+            tracked_actions.popleft()
+        self.merger.tracked_i = 0
+        ActRec_pref = get_preferences(context)
+        action = ActRec_pref.local_actions.get(self.action_id)
+        if action is None:
+            return
+        for i, item in enumerate(merged):
+            report = improve_report(context, item, self)
+            if report is None:
+                continue
+            is_operator = item[0] == 1
+            if (is_operator and i in self.merger.untracked
+                    and self.last_operator and self.last_operator[:2] == tuple(item[3:5])):
+                # the operator was changed in the redo panel after it was added, its tracked action is already used
+                macro = action.macros.get(self.last_operator[2])
+                if macro is not None:
+                    macro.command = ActRec_pref.last_macro_command = report
+                    continue
+            add_report_as_macro(context, ActRec_pref, action, report, self.error_reports)
+            if is_operator:
+                self.last_operator = (item[3], item[4], action.macros[-1].id)
+        if not merged:
+            return
+        # the timer that reads the reports runs without a screen
+        for window in context.window_manager.windows:
+            for area in window.screen.areas:
+                area.tag_redraw()
+
+
+def improve_report(context: Context, report: tuple, journal: Record_journal) -> Optional[str]:
+    """
+    improve a merged report with the copies journaled while recording
+
+    Args:
+        context (Context): active blender context
+        report (tuple): merged report, format (Type: int, Registered: bool, Undo: bool, type, name, value[s])
+        journal (Record_journal): journal of the recording
+
+    Returns:
+        Optional[str]: improved report, None if the report isn't added as macro
+    """
+    bpy_type, register, undo, parent, name, value = report
+    if bpy_type == 0:
+        entry = journal.pop(parent, name)
+        if entry is None:
+            return improve_context_report(context, {}, parent, name, value)
+        return improve_context_report(context, entry.before, parent, name, value, entry.after)
+    if bpy_type == 1 and register:
+        return improve_operator_report(context, parent, name, value, evaluate_operator(parent, name, value))
+
+
+def start_record_journal(context: Context, live_action_id: Optional[str] = None) -> bool:
+    """
+    starts journaling the reports while recording, the journal is written by read_record_journal
+    and read with stop_record_journal.
+    The reports can only be read without switching an area in an open Info editor,
+    without it the recording isn't journaled and the live recording isn't started
+
+    Args:
+        context (Context): active blender context
+        live_action_id (Optional[str], optional): id of the local action the reports are added to while recording,
+            they are only journaled if None. Defaults to None.
+
+    Returns:
+        bool: the recording is journaled
+    """
+    if get_info_area(context) is None:
+        return False
+    cursor = get_report_count(context)
+    if live_action_id is None:
+        shared_data.record_journal = Record_journal(cursor)
+    else:
+        shared_data.record_journal = Live_record_journal(cursor, live_action_id)
+    return True
+
+
+def stop_record_journal(context: Context) -> Optional[Record_journal]:
+    """
+    stops journaling and journals the reports that were added since the last read
+
+    Args:
+        context (Context): active blender context
+
+    Returns:
+        Optional[Record_journal]: journal of the recording, None if the recording wasn't journaled
+    """
+    journal = shared_data.record_journal
+    shared_data.record_journal = None
+    if bpy.app.timers.is_registered(read_record_journal):
+        bpy.app.timers.unregister(read_record_journal)
+    if journal is not None and get_info_area(context) is not None:
+        journal.read_reports(context)
+    if isinstance(journal, Live_record_journal):
+        journal.add_macros(context, [], final=True)
+    return journal
+
+
 def split_operator_report(operator_str: str) -> Tuple[str, str, dict]:
     """
     split apart the given operator string to op_type, op_name, op_values
@@ -0,0 +1,833 @@
+# region Imports
+# external modules
+import re
+import ast
+import json
+import hashlib
+import linecache
+import builtins
+import traceback
+import functools
+import uuid
+from collections import OrderedDict
+from contextlib import suppress
+from typing import Optional, Union, TYPE_CHECKING
+
+# blender modules
+import bpy
+from bpy.types import CollectionProperty, PropertyGroup, Context
+
+# relative imports
+from . import shared
+from .. import shared_data
+from ..log import logger
+if TYPE_CHECKING:
+    from ..properties.shared import AR_action
+else:
+    AR_action = PropertyGroup
+# endregion
+
+# step type of all macros that aren't an "ar.event"
+COMMAND = 'COMMAND'
+
+# context paths that point to the object a macro is executed on in the execution mode "INDIVIDUAL"
+OBJECT_CONTEXT_PATHS = ("bpy.context.object.", "bpy.context.active_object.")
+# matches commands that access the active object, these commands depend on the object they are executed on
+OBJECT_CONTEXT = re.compile(r"\bcontext\.(object|active_object)\b")
+
+# compiled plans of all played actions accessed by (action_type, action id)
+plans = {}
+
+# compiled scripts of the "Run Script" events accessed by the hash of the script, least recently used first
+scripts = OrderedDict()
+# amount of compiled scripts that are kept, the least recently used script is removed first
+SCRIPT_CACHE_SIZE = 64
+SCRIPT_FILENAME_FORMAT = "<ActRec Script %s>"
+SCRIPT_FILENAME = re.compile(r"<ActRec Script [0-9a-f]+>")
+
+# scene property that marks the undo step pushed before an atomic playback
+UNDO_MARKER = "_ar_undo_marker"
+# undo steps that are searched for the marked undo step when an atomic playback is rolled back
+ROLLBACK_MAX_STEPS = 4
+
+# running and waiting playback sessions accessed by (action_type, action id)
+sessions = {}
+
+# sessions that wait for the running sessions to end, used by the playback scheduling "QUEUE"
+waiting_sessions = []
+
+# region Classes
+
+
+class Plan_step:
+    """single precompiled macro of a playback plan"""
+    __slots__ = (
+        "macro_id", "type", "data", "command", "code", "object_code", "per_object", "error", "jump", "ui_type"
+    )
+
+    def __init__(self, macro_id: str, command: str, execution_context: str, ui_type: str) -> None:
+        """
+        parse the given command once, events get their data decoded and commands get compiled
+
+        Args:
+            macro_id (str): id of the macro the step is created from
+            command (str): command of the macro
+            execution_context (str): operator execution context of the macro
+            ui_type (str): ui_type the macro need to be executed in
+        """
+        self.macro_id = macro_id
+        self.ui_type = ui_type
+        self.type = COMMAND
+        self.data = {}
+        self.command = command
+        self.code = None
+        # command compiled as statement on the object "ar_object", None if it isn't a statement on the active object
+        self.object_code = None
+        # the command depends on the selected and active object and is executed once per object in "BATCH"
+        self.per_object = False
+        self.error = None
+        # index of the matching Loop/EndLoop step, None if the loop isn't complete
+        self.jump = None
+
+        split = command.split(":")
+        if split[0] == 'ar.event':
+            try:
+                self.data = json.loads(":".join(split[1:]))
+                self.type = self.data['Type']
+            except (json.JSONDecodeError, KeyError, TypeError) as err:
+                self.error = err
+                return
+            if self.type == 'Loop' and self.data.get('StatementType') == 'python':
+                try:
+                    self.code = compile(self.data.get('PyStatement', ""), "<ActRec Loop>", "eval")
+                except SyntaxError as err:
+                    self.error = err
+            return
+
+        if (command.startswith("bpy.ops.ar.local_play")
+                and set(shared.extract_properties(command.split("(")[1][: -1])) == {"id=\"\"", "index=-1"}):
+            self.error = "Don't run Local Play with default properties, this may cause recursion"
+            return
+        self.object_code = compile_object_command(command)
+        self.per_object = command.startswith("bpy.ops.") or OBJECT_CONTEXT.search(command) is not None
+        command, self.code = compile_command(command, execution_context)
+        if self.code is None:
+            self.error = command
+        else:
+            self.command = command
+
+
+class Playback_plan:
+    """precompiled steps of all active macros of an action"""
+
+    def __init__(self, signature: tuple) -> None:
+        """
+        compiles the given macro signature into playback steps and resolves the loop jump targets
+
+        Args:
+            signature (tuple): signature of the macros created with get_macros_signature
+        """
+        self.signature = signature
+        self.steps = []
+        # indices of all "Render Complete" steps
+        self.render_complete = []
+        # the playback pauses for a Timer or Render Complete event
+        self.pauses = False
+        open_loops = []
+        steps = self.steps
+        for macro_id, command, active, execution_context, ui_type in signature:
+            if not active:
+                continue
+            step = Plan_step(macro_id, command, execution_context, ui_type)
+            index = len(steps)
+            steps.append(step)
+            if step.type == 'Loop':
+                open_loops.append(index)
+            elif step.type == 'EndLoop' and open_loops:
+                # end the latest called loop
+                start = open_loops.pop()
+                steps[start].jump = index
+                step.jump = start
+            elif step.type == 'Render Complete':
+                self.render_complete.append(index)
+            self.pauses = self.pauses or step.type in {'Timer', 'Render Complete'}
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+
+class Loop_frame:
+    """state of a running loop inside a playback session"""
+    __slots__ = ("start", "counter")
+
+    def __init__(self, start: int, counter: int = 0) -> None:
+        """
+        Args:
+            start (int): index of the Loop step
+            counter (int, optional): start value of the loop counter. Defaults to 0.
+        """
+        self.start = start
+        self.counter = counter
+
+
+class Playback_session:
+    """state of one playback of an action, kept alive while the playback waits for Timer or Render Complete"""
+
+    def __init__(self, plan: Playback_plan, action_type: str, action_id: str) -> None:
+        """
+        Args:
+            plan (Playback_plan): plan to play
+            action_type (str): "global_actions" or "local_actions"
+            action_id (str): id of the played action
+        """
+        self.plan = plan
+        self.action_type = action_type
+        self.action_id = action_id
+        # stack of the running loops, the innermost loop is the last element
+        self.loops = []
+        # namespace the commands are executed in
+        self.namespace = {}
+        # format (selected objects, active object) of the selection before the execution mode "BATCH" changed it
+        self.selection = None
+        # window, screen, area and region the playback was started in, set with begin
+        self.base = (None, None, None, None)
+        # original ui_type of the base area, None if the ui_type isn't changed
+        self.base_ui_type = None
+        # resolved overrides accessed by ui_type, format (window, screen, area, region)
+        self.overrides = {}
+        # format (ui_type, entered temp_override), None if no override is active
+        self.active_override = None
+        # redraw the areas only once when the playback pauses or ends
+        self.deferred_redraw = False
+        self.redraw_pending = False
+        # execute the action as one undo step and undo all changes if a macro fails
+        self.atomic = False
+        self.undo_message = ""
+        # value of UNDO_MARKER in the undo step pushed before the playback, None if no step was pushed
+        self.undo_marker = None
+        # the steps of the session are executed, set between begin and pause
+        self.executing = False
+        # seconds the playback runs before it continues with a timer, 0 plays until the action ends
+        self.time_budget = 0
+        # index of the step the playback continues with
+        self.index = 0
+        # module namespaces of the "Run Script" events accessed by the step index
+        self.script_namespaces = {}
+        # globals the conditions of python statement loops are evaluated with
+        self.loop_globals = {}
+        # copy of the context the playback was started in, used to start a waiting session
+        self.context_copy = None
+
+    @property
+    def progress(self) -> float:
+        """
+        share of the steps that are already played, loops are not taken into account
+
+        Returns:
+            float: progress between 0 and 1
+        """
+        if not self.plan.steps:
+            return 1.0
+        return min(self.index / len(self.plan.steps), 1.0)
+
+    def begin(self, context: Context) -> None:
+        """
+        sets the window, screen, area and region where the playback is started or continued
+
+        Args:
+            context (Context): active blender context
+        """
+        self.base = (context.window, context.screen, context.area, context.region)
+        self.overrides.clear()
+        self.executing = True
+
+    def enter_loop(self, index: int) -> Loop_frame:
+        """
+        get the frame of the loop starting at the given index,
+        a new frame is pushed if the loop isn't the innermost running loop
+
+        Args:
+            index (int): index of the Loop step
+
+        Returns:
+            Loop_frame: frame of the loop
+        """
+        loops = self.loops
+        if loops and loops[-1].start == index:
+            return loops[-1]
+        data = self.plan.steps[index].data
+        # DEPRECATED used to support old count loop macros
+        frame = Loop_frame(index, data["Startnumber"] if data.get('StatementType') == 'count' else 0)
+        loops.append(frame)
+        return frame
+
+    def get_loop_globals(self, context: Context, frame: Loop_frame) -> dict:
+        """
+        get the globals to evaluate the condition of a python statement loop with,
+        exposes bpy, context and the amount of finished iterations of the loop as "iteration"
+
+        Args:
+            context (Context): active blender context
+            frame (Loop_frame): frame of the evaluated loop
+
+        Returns:
+            dict: globals of the condition
+        """
+        loop_globals = self.loop_globals
+        if not loop_globals:
+            loop_globals.update(self.namespace)
+            loop_globals['bpy'] = bpy
+        loop_globals['context'] = context
+        loop_globals['iteration'] = frame.counter
+        return loop_globals
+
+    def exit_loop(self) -> None:
+        """
+        removes the innermost running loop
+        """
+        self.loops.pop()
+
+    def snapshot_selection(self, context: Context) -> list:
+        """
+        saves the current selection and deselect all objects, the selection is only saved once until it is restored
+
+        Args:
+            context (Context): active blender context
+
+        Returns:
+            list: objects that were selected
+        """
+        if self.selection is None:
+            selected_objects = context.selected_objects[:]
+            self.selection = (selected_objects, context.view_layer.objects.active)
+            for object in selected_objects:
+                object.select_set(False)
+        return self.selection[0]
+
+    def restore_selection(self, context: Context) -> None:
+        """
+        restores the selection saved with snapshot_selection
+
+        Args:
+            context (Context): active blender context
+        """
+        if self.selection is None:
+            return
+        selected_objects, active_object = self.selection
+        self.selection = None
+        for object in selected_objects:
+            with suppress(ReferenceError):
+                object.select_set(True)
+        with suppress(ReferenceError, AttributeError):
+            context.view_layer.objects.active = active_object
+
+    def get_override(self, context: Context, ui_type: str) -> tuple:
+        """
+        get window, screen, area and region to execute a macro with the given ui_type in.
+        Uses the area of a window that shows the ui_type, otherwise the base area is switched to the ui_type
+
+        Args:
+            context (Context): active blender context
+            ui_type (str): ui_type the macro need to be executed in
+
+        Returns:
+            tuple: format (window, screen, area, region)
+        """
+        window, screen, area, region = self.base
+        if area is None:
+            return self.base
+        base_ui_type = area.ui_type if self.base_ui_type is None else self.base_ui_type
+        if not ui_type or ui_type == base_ui_type:
+            ui_type = base_ui_type
+            self.restore_area()
+        elif ui_type != area.ui_type:
+            # the base area shows another ui_type, check for windows with the ui_type first
+            override = self.overrides.get(ui_type)
+            if override is not None:
+                return override
+            for window in reversed(list(context.window_manager.windows)):
+                if window.screen.areas[0].ui_type != ui_type:
+                    continue
+                screen = window.screen
+                area = screen.areas[0]
+                break
+            else:
+                window = self.base[0]
+                self.switch_area(ui_type)
+        override = self.overrides.get(ui_type)
+        if override is not None:
+            return override
+        for temp_region in area.regions:
+            if temp_region.type == "WINDOW":
+                region = temp_region
+                break
+        override = self.overrides[ui_type] = (window, screen, area, region)
+        return override
+
+    def switch_area(self, ui_type: str) -> None:
+        """
+        switches the base area to the given ui_type, the original ui_type is restored with restore_area
+
+        Args:
+            ui_type (str): ui_type to switch to
+        """
+        area = self.base[2]
+        if self.base_ui_type is None:
+            self.base_ui_type = area.ui_type
+        self.drop_area_overrides()
+        area.ui_type = ui_type
+
+    def restore_area(self) -> None:
+        """
+        switches the base area back to its original ui_type
+        """
+        if self.base_ui_type is None:
+            return
+        self.drop_area_overrides()
+        with suppress(ReferenceError):
+            self.base[2].ui_type = self.base_ui_type
+        self.base_ui_type = None
+
+    def drop_area_overrides(self) -> None:
+        """
+        removes all overrides with the base area, because the regions of the area change with its ui_type
+        """
+        area = self.base[2]
+        self.exit_override()
+        for ui_type in [ui_type for ui_type, override in self.overrides.items() if override[2] == area]:
+            del self.overrides[ui_type]
+
+    def enter_override(self, context: Context, ui_type: str) -> None:
+        """
+        enters the temp_override for the given ui_type,
+        the active temp_override is kept if it was entered with the same ui_type
+
+        Args:
+            context (Context): active blender context
+            ui_type (str): ui_type the macro need to be executed in
+        """
+        if self.active_override is not None:
+            if self.active_override[0] == ui_type:
+                return
+            self.exit_override()
+        window, screen, area, region = self.get_override(context, ui_type)
+        # Note: region need to be set when override area for temp_override
+        # for more detail see https://projects.blender.org/blender/blender/issues/106373
+        temp_override = context.temp_override(window=window, screen=screen, area=area, region=region)
+        temp_override.__enter__()
+        self.active_override = (ui_type, temp_override)
+
+    def exit_override(self) -> None:
+        """
+        exits the active temp_override
+        """
+        if self.active_override is None:
+            return
+        temp_override = self.active_override[1]
+        self.active_override = None
+        temp_override.__exit__(None, None, None)
+
+    def pause(self, context: Context) -> None:
+        """
+        restores the context, area and selection of the user,
+        used when the playback ends, waits for a Timer or Render Complete event or continues in the next time slice
+
+        Args:
+            context (Context): active blender context
+        """
+        self.executing = False
+        self.exit_override()
+        self.restore_area()
+        self.restore_selection(context)
+        if self.redraw_pending:
+            self.redraw()
+
+    def redraw(self) -> None:
+        """
+        redraws the base area and all areas used to execute macros in
+        """
+        self.redraw_pending = False
+        areas = {self.base[2], *(override[2] for override in self.overrides.values())}
+        for area in areas:
+            if area is None:
+                continue
+            with suppress(ReferenceError):
+                area.tag_redraw()
+
+    def get_script_namespace(self, index: int, name: str) -> dict:
+        """
+        get the reset module namespace to execute the script of the "Run Script" event at the given index in
+
+        Args:
+            index (int): index of the step
+            name (str): name of the module
+
+        Returns:
+            dict: namespace of the module
+        """
+        namespace = self.script_namespaces.get(index)
+        if namespace is None:
+            namespace = self.script_namespaces[index] = {}
+        namespace.clear()
+        namespace.update({'__name__': name, '__builtins__': builtins})
+        return namespace
+
+    def push_start_step(self, context: Context) -> None:
+        """
+        pushes the state before the playback as undo step, which is marked with UNDO_MARKER in the scene,
+        so rollback only undoes to the step of this session
+
+        Args:
+            context (Context): active blender context
+        """
+        scene = context.scene
+        self.undo_marker = uuid.uuid1().hex
+        scene[UNDO_MARKER] = self.undo_marker
+        with context.temp_override(**get_window_override(context)):
+            bpy.ops.ed.undo_push(message="Before %s" % self.undo_message)
+        del scene[UNDO_MARKER]
+
+    def rollback(self) -> None:
+        """
+        undoes the changes of the session up to the undo step pushed with push_start_step,
+        deferred with a timer because the operator that started the playback pushes its undo step afterwards.
+        The undo steps are redone if the step of the session isn't found
+        """
+        marker = self.undo_marker
+        self.undo_marker = None
+        if marker is None:
+            return
+
+        def undo() -> None:
+            context = bpy.context
+            with context.temp_override(**get_window_override(context)):
+                steps = 0
+                while steps < ROLLBACK_MAX_STEPS and bpy.ops.ed.undo.poll():
+                    bpy.ops.ed.undo()
+                    steps += 1
+                    scene = next((scene for scene in bpy.data.scenes if scene.get(UNDO_MARKER) == marker), None)
+                    if scene is not None:
+                        del scene[UNDO_MARKER]
+                        return
+                logger.error("undo step before %s not found, its changes are kept" % self.undo_message)
+                for _ in range(steps):
+                    bpy.ops.ed.redo()
+        bpy.app.timers.register(undo, first_interval=0)
+
+    def close(self, context: Context) -> None:
+        """
+        ends the session and releases all its data
+
+        Args:
+            context (Context): active blender context
+        """
+        self.pause(context)
+        self.overrides.clear()
+        self.base = (None, None, None, None)
+        self.loops.clear()
+        self.namespace.clear()
+        self.script_namespaces.clear()
+        self.loop_globals.clear()
+        render_complete_macros = shared_data.render_complete_macros
+        render_complete_macros[:] = [entry for entry in render_complete_macros if entry[-1] is not self]
+        key = (self.action_type, self.action_id)
+        if sessions.get(key) is self:
+            del sessions[key]
+        self.context_copy = None
+        if self in waiting_sessions:
+            waiting_sessions.remove(self)
+        elif waiting_sessions and not has_running_session():
+            start_session(waiting_sessions.pop(0))
+
+# endregion
+
+# region Functions
+
+
+def compile_command(command: str, execution_context: str) -> tuple[Union[str, Exception], Optional[object]]:
+    """
+    converts the command into the executed form and compiles it to a code object
+
+    Args:
+        command (str): command of the macro
+        execution_context (str): operator execution context, only applies to operator commands
+
+    Returns:
+        tuple[Union[str, Exception], Optional[object]]:
+            (executed command, code object) on success; (error, None) if the command couldn't be compiled
+    """
+    if command.startswith("bpy.ops."):
+        split = command.split("(")
+        command = "%s(\"%s\", %s" % (split[0], execution_context, "(".join(split[1:]))
+    elif command.startswith("bpy.context."):
+        command = command.replace("bpy.context.", "context.")
+    try:
+        return command, compile(command, "<ActRec Macro>", "exec")
+    except (SyntaxError, ValueError) as err:
+        return err, None
+
+
+def compile_object_command(command: str) -> Optional[object]:
+    """
+    compiles an assignment or expression on the active object as statement on the object "ar_object"
+    E.g.: bpy.context.object.data.use_auto_smooth = True -> ar_object.data.use_auto_smooth = True
+    bpy.context.object.modifiers.new("Subdivision", 'SUBSURF') -> ar_object.modifiers.new("Subdivision", 'SUBSURF')
+
+    Args:
+        command (str): command of the macro
+
+    Returns:
+        Optional[object]: code object, None if the command isn't a single statement on the active object
+    """
+    for path in OBJECT_CONTEXT_PATHS:
+        if command.startswith(path):
+            break
+    else:
+        return None
+    command = command[len(path):]
+    if "bpy.context" in command:
+        return None
+    try:
+        tree = ast.parse("ar_object.%s" % command)
+    except SyntaxError:
+        return None
+    if len(tree.body) != 1 or not isinstance(tree.body[0], (ast.Assign, ast.AugAssign, ast.Expr)):
+        return None
+    return compile(tree, "<ActRec Macro>", "exec")
+
+
+def compile_script(script: str) -> object:
+    """
+    compiles the script of a "Run Script" event, the code is cached by the hash of the script
+    and the source is added to the linecache to show the lines in the traceback,
+    the least recently used script is removed if the cache exceeds SCRIPT_CACHE_SIZE
+
+    Args:
+        script (str): python script to compile
+
+    Raises:
+        SyntaxError: the script can't be compiled
+
+    Returns:
+        object: compiled code of the script
+    """
+    digest = hashlib.sha1(script.encode('utf-8')).hexdigest()
+    code = scripts.get(digest)
+    if code is not None:
+        scripts.move_to_end(digest)
+        return code
+    filename = SCRIPT_FILENAME_FORMAT % digest
+    linecache.cache[filename] = (len(script), None, script.splitlines(True), filename)
+    try:
+        code = compile(script, filename, "exec")
+    except SyntaxError:
+        # the error contains the line of the script itself
+        del linecache.cache[filename]
+        raise
+    scripts[digest] = code
+    if len(scripts) > SCRIPT_CACHE_SIZE:
+        remove_script(scripts.popitem(last=False)[0])
+    return code
+
+
+def remove_script(digest: str) -> None:
+    """
+    removes the source of the compiled script from the linecache
+
+    Args:
+        digest (str): hash of the script
+    """
+    linecache.cache.pop(SCRIPT_FILENAME_FORMAT % digest, None)
+
+
+def format_script_error(error: Exception, name: str) -> str:
+    """
+    formats the traceback of an error raised by the script of a "Run Script" event,
+    the frames before the script are removed and the script is named like the macro
+
+    Args:
+        error (Exception): error raised while the script was compiled or executed
+        name (str): name of the script in the traceback
+
+    Returns:
+        str: formatted traceback
+    """
+    exception = traceback.TracebackException.from_exception(error)
+    # removes the frames of the playback that executed the script,
+    # the frames of the functions called by the script are kept
+    stack = exception.stack
+    first = next((i for i, frame in enumerate(stack) if SCRIPT_FILENAME.fullmatch(frame.filename)), len(stack))
+    exception.stack = traceback.StackSummary.from_list(stack[first:])
+    return SCRIPT_FILENAME.sub(name, "".join(exception.format()))
+
+
+def get_session(action_type: str, action_id: str) -> Optional[Playback_session]:
+    """
+    get the session of the running or waiting playback of the action
+
+    Args:
+        action_type (str): "global_actions" or "local_actions"
+        action_id (str): id of the action
+
+    Returns:
+        Optional[Playback_session]: session of the playback, None if the action isn't played
+    """
+    return sessions.get((action_type, action_id))
+
+
+def has_running_session() -> bool:
+    """
+    checks if any session is running, waiting sessions are not taken into account
+
+    Returns:
+        bool: a session is running
+    """
+    return any(session not in waiting_sessions for session in sessions.values())
+
+
+def has_executing_session() -> bool:
+    """
+    checks if the steps of any session are executed, which is the case if a macro starts another playback
+
+    Returns:
+        bool: a session is executed
+    """
+    return any(session.executing for session in sessions.values())
+
+
+def add_session(context: Context, session: Playback_session, queue: bool) -> bool:
+    """
+    adds the session to the running sessions
+
+    Args:
+        context (Context): active blender context, copied to start a waiting session in it
+        session (Playback_session): session of a new playback
+        queue (bool): let the session wait until all running sessions ended
+
+    Returns:
+        bool: True if the session needs to wait
+    """
+    wait = queue and bool(sessions)
+    sessions[(session.action_type, session.action_id)] = session
+    if wait:
+        session.context_copy = context.copy()
+        waiting_sessions.append(session)
+    return wait
+
+
+def start_session(session: Playback_session) -> None:
+    """
+    starts the playback of a waiting session with a timer
+
+    Args:
+        session (Playback_session): session to start
+    """
+    bpy.app.timers.register(
+        functools.partial(
+            shared.run_queued_macros,
+            session.context_copy,
+            session.action_type,
+            session.action_id,
+            session.index,
+            session
+        ),
+        first_interval=0
+    )
+
+
+def get_window_override(context: Context) -> dict:
+    """
+    get a window to run window operators like undo in, timers are executed without a window
+
+    Args:
+        context (Context): active blender context
+
+    Returns:
+        dict: keyword arguments for context.temp_override
+    """
+    if context.window is not None:
+        return {}
+    windows = context.window_manager.windows
+    if not len(windows):
+        return {}
+    return {'window': windows[0]}
+
+
+def set_alert(action: AR_action, macro: PropertyGroup) -> None:
+    """
+    alerts the action and the macro, the alert of the macro is reset together with the alert of the action,
+    so only one reset timer is registered
+
+    Args:
+        action (AR_action): action to alert
+        macro (PropertyGroup): macro of the action to alert
+    """
+    macro['alert'] = True
+    action.alert = True
+
+
+def get_macros_signature(macros: CollectionProperty) -> tuple:
+    """
+    get all values of the macros that have an influence on the playback
+
+    Args:
+        macros (CollectionProperty): macros of an action
+
+    Returns:
+        tuple: format ((id, command, active, operator_execution_context, ui_type), ...)
+    """
+    return tuple(
+        (macro.id, macro.command, macro.active, macro.operator_execution_context, macro.ui_type)
+        for macro in macros
+    )
+
+
+def get_plan(macros: CollectionProperty, action: AR_action, action_type: str) -> Playback_plan:
+    """
+    get the compiled plan of the action, the plan is recompiled when any macro changed
+
+    Args:
+        macros (CollectionProperty): macros of the action
+        action (AR_action): action to get the plan for
+        action_type (str): "global_actions" or "local_actions"
+
+    Returns:
+        Playback_plan: compiled plan of the macros
+    """
+    key = (action_type, action.id)
+    signature = get_macros_signature(macros)
+    plan = plans.get(key)
+    if plan is None or plan.signature != signature:
+        plan = plans[key] = Playback_plan(signature)
+    return plan
+
+
+def remove_plan(action_type: str, action_id: str) -> None:
+    """
+    removes the compiled plan of a removed action
+
+    Args:
+        action_type (str): "global_actions" or "local_actions"
+        action_id (str): id of the removed action
+    """
+    plans.pop((action_type, action_id), None)
+
+
+def clear_plans(action_type: Optional[str] = None) -> None:
+    """
+    removes the compiled plans to free the memory
+
+    Args:
+        action_type (Optional[str], optional):
+            only removes plans of this action type, all plans are removed if None. Defaults to None.
+    """
+    if action_type is None:
+        plans.clear()
+        for digest in scripts:
+            remove_script(digest)
+        scripts.clear()
+        return
+    for key in [key for key in plans if key[0] == action_type]:
+        del plans[key]
+
+# endregion
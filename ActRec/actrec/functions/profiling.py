@@ -0,0 +1,148 @@
+# region Imports
+# external modules
+import json
+import time
+import functools
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Callable
+
+# relative imports
+from ..log import logger
+# endregion
+
+# timings are only taken if enabled, set by the preference "Profiling"
+enabled = False
+
+# name of the stage -> Stage_statistics
+stages = {}
+
+# region Classes
+
+
+class Stage_statistics:
+    """timings and counters of a profiled stage"""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.counters = defaultdict(int)
+
+    def add(self, seconds: float, counters: dict) -> None:
+        """
+        adds the timing and the counters of a call
+
+        Args:
+            seconds (float): duration of the call
+            counters (dict): amounts counted in the call
+        """
+        self.calls += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        for key, value in counters.items():
+            self.counters[key] += value
+
+    def to_dict(self) -> dict:
+        """
+        converts the statistics to a dictionary
+
+        Returns:
+            dict: statistics with times in milliseconds
+        """
+        return {
+            "calls": self.calls,
+            "total_ms": self.total * 1000,
+            "mean_ms": self.total * 1000 / self.calls if self.calls else 0,
+            "max_ms": self.max * 1000,
+            "counters": dict(self.counters)
+        }
+
+# endregion
+
+# region Functions
+
+
+def add_timing(name: str, seconds: float, counters: dict) -> None:
+    """
+    adds a timing to the statistics of the stage
+
+    Args:
+        name (str): name of the stage
+        seconds (float): duration of the stage
+        counters (dict): amounts counted in the stage
+    """
+    statistics = stages.get(name)
+    if statistics is None:
+        statistics = stages[name] = Stage_statistics()
+    statistics.add(seconds, counters)
+
+
+@contextmanager
+def stage(name: str, **counters: int):
+    """
+    times the enclosed stage and writes the timing with the counters as json to the log,
+    the counters can be changed inside of the stage
+
+    Args:
+        name (str): name of the stage
+        counters (int): amounts counted in the stage
+
+    Yields:
+        dict: counters of the stage
+    """
+    if not enabled:
+        yield counters
+        return
+    start = time.perf_counter()
+    try:
+        yield counters
+    finally:
+        seconds = time.perf_counter() - start
+        add_timing(name, seconds, counters)
+        logger.info("profile %s", json.dumps({"stage": name, "ms": seconds * 1000, **counters}))
+
+
+def profiled(name: str) -> Callable:
+    """
+    decorator to time every call of the function,
+    the timings are summarized and every call is written to the log on debug level
+
+    Args:
+        name (str): name of the stage
+
+    Returns:
+        Callable: decorator
+    """
+    def decorator(function: Callable) -> Callable:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return function(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                seconds = time.perf_counter() - start
+                add_timing(name, seconds, {})
+                logger.debug("profile %s", json.dumps({"stage": name, "ms": seconds * 1000}))
+        return wrapper
+    return decorator
+
+
+def get_summary() -> dict:
+    """
+    get the statistics of all profiled stages
+
+    Returns:
+        dict: name of the stage -> statistics
+    """
+    return {name: statistics.to_dict() for name, statistics in sorted(stages.items())}
+
+
+def clear() -> None:
+    """
+    removes the statistics of all stages
+    """
+    stages.clear()
+# endregion
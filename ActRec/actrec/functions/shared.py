@@ -1,15 +1,17 @@
 # region Imports
 # external modules
-from typing import Optional, Union
+from typing import Optional, Union, Callable, Iterable
 from contextlib import suppress
 from collections import defaultdict
 import json
 import os
+import re
+import bisect
 import sys
 import numpy
 import functools
+import time
 import subprocess
-import traceback
 from typing import TYPE_CHECKING
 from mathutils import Vector, Matrix, Color, Euler, Quaternion
 
@@ -17,11 +19,14 @@ from mathutils import Vector, Matrix, Color, Euler, Quaternion
 import bpy
 import bl_math
 from bpy.app.handlers import persistent
-from bpy.types import PointerProperty, Property, CollectionProperty, Context, AddonPreferences, PropertyGroup
+from bpy.types import (
+    PointerProperty, Property, CollectionProperty, Context, AddonPreferences, PropertyGroup, Struct
+)
 
 # relative imports
 from ..log import logger
 from .. import shared_data
+from . import playback, profiling
 if TYPE_CHECKING:
     from ..preferences import AR_preferences
     from ..properties.shared import AR_action
@@ -34,6 +39,15 @@ else:
 
 __module__ = __package__.split(".")[0]
 
+# (identifier of the struct, exclude paths, depth) -> serializer of get_serializer
+serializers = {}
+
+# identifier of the struct -> load plan of get_load_plan
+load_plans = {}
+
+# ids in the form set_id of the Id_based properties stores them
+UUID_HEX = re.compile("[0-9a-f]{32}")
+
 # region functions
 
 
@@ -59,6 +73,110 @@ def check_for_duplicates(check_list: list, name: str, num: int = 1) -> str:
     return name
 
 
+def split_exclude(exclude: Iterable[str]) -> tuple[set, dict]:
+    """
+    splits the exclude paths in the values to exclude and the exclude paths of the sub-values
+
+    Args:
+        exclude (Iterable[str]): property values to exclude in form <value>.<sub-value>
+
+    Returns:
+        tuple[set, dict]: format (excluded values, value -> exclude paths of the sub-values)
+    """
+    main_exclude = set()
+    sub_exclude = defaultdict(list)
+    for x in exclude:
+        prop = x.split(".")
+        if len(prop) > 1:
+            sub_exclude[prop[0]].append(".".join(prop[1:]))
+        else:
+            main_exclude.add(prop[0])
+    return main_exclude, sub_exclude
+
+
+def is_property_group(rna: Struct) -> bool:
+    """
+    checks if the Blender struct is a PropertyGroup
+
+    Args:
+        rna (Struct): Blender struct to check
+
+    Returns:
+        bool: struct is derived from PropertyGroup
+    """
+    while rna is not None:
+        if rna.identifier == "PropertyGroup":
+            return True
+        rna = rna.base
+    return False
+
+
+def compile_value_converter(prop: Property, sub_exclude: tuple, depth: int) -> Optional[Callable]:
+    """
+    get the conversion of a property value to python, that property_to_python would do
+
+    Args:
+        prop (Property): property of the struct
+        sub_exclude (tuple): exclude paths of the value
+        depth (int): depth the value is converted with
+
+    Returns:
+        Optional[Callable]: conversion of the value, None if the value is used as it is
+    """
+    target = getattr(prop, 'fixed_type', None)
+    if target is not None and target.identifier == "AR_preferences":
+        return lambda value: property_to_python(value)
+    if depth <= 0:
+        return lambda value: "max depth"
+    if prop.type in {'BOOLEAN', 'INT', 'FLOAT', 'STRING', 'ENUM'} and not getattr(prop, 'is_array', False):
+        if prop.type == 'ENUM' and prop.is_enum_flag:
+            return list
+        return None
+    if target is not None and is_property_group(target):
+        if prop.type == 'POINTER':
+            return get_serializer(target, sub_exclude, depth)
+        if prop.type == 'COLLECTION':
+            item_serializer = get_serializer(target, sub_exclude, depth)
+            return lambda value: [item_serializer(item) for item in value]
+    sub_exclude = list(sub_exclude)
+    return lambda value: property_to_python(value, sub_exclude, depth)
+
+
+def get_serializer(rna: Struct, exclude: tuple, depth: int) -> Callable[[PropertyGroup], dict]:
+    """
+    get the serializer of the Blender struct, which converts an instance like get_pointer_property_as_dict.
+    The serializer is compiled once per struct, exclude paths and depth
+
+    Args:
+        rna (Struct): bl_rna of the struct
+        exclude (tuple): property values to exclude, see property_to_python
+        depth (int): depth to extract the values
+
+    Returns:
+        Callable[[PropertyGroup], dict]: serializer
+    """
+    key = (rna.identifier, exclude, depth)
+    serializer = serializers.get(key)
+    if serializer is not None:
+        return serializer
+    main_exclude, sub_exclude = split_exclude(exclude)
+    fields = tuple(
+        (prop.identifier, compile_value_converter(prop, tuple(sub_exclude.get(prop.identifier, ())), depth - 1))
+        for prop in rna.properties[1:]  # exclude rna_type
+        if prop.identifier not in main_exclude
+    )
+
+    def serializer(property: PropertyGroup) -> dict:
+        data = {}
+        for identifier, convert in fields:
+            value = getattr(property, identifier)
+            data[identifier] = value if convert is None else convert(value)
+        return data
+
+    serializers[key] = serializer
+    return serializer
+
+
 def get_pointer_property_as_dict(property: PointerProperty, exclude: list, depth: int) -> dict:
     """
     converts a Blender PointerProperty to a python dict
@@ -75,26 +193,7 @@ def get_pointer_property_as_dict(property: PointerProperty, exclude: list, depth
     Returns:
         dict: python dict based on property
     """
-    data = {}  # PointerProperty
-    main_exclude = []
-    sub_exclude = defaultdict(list)
-    for x in exclude:
-        prop = x.split(".")
-        if len(prop) > 1:
-            sub_exclude[prop[0]].append(".".join(prop[1:]))
-        else:
-            main_exclude.append(prop[0])
-    main_exclude = set(main_exclude)
-    for attr in property.bl_rna.properties[1:]:  # exclude rna_type
-        identifier = attr.identifier
-        if identifier in main_exclude:
-            continue
-        data[identifier] = property_to_python(
-            getattr(property, identifier),
-            sub_exclude.get(identifier, []),
-            depth - 1
-        )
-    return data
+    return get_serializer(property.bl_rna, tuple(exclude), depth)(property)
 
 
 def property_to_python(property: Property, exclude: list = [], depth: int = 5) -> Union[list, dict, str]:
@@ -194,6 +293,165 @@ def apply_data_to_item(property: Property, data, key="") -> None:
             setattr(property, key, data)
 
 
+def is_uuid_hex(value: str) -> bool:
+    """
+    checks if the string is a UUID in hex format
+
+    Args:
+        value (str): string to check
+
+    Returns:
+        bool: string is a UUID in hex format
+    """
+    return UUID_HEX.fullmatch(value) is not None
+
+
+def get_deferred_properties(cls: type) -> set:
+    """
+    get the properties of the class, which have a python setter or update callback
+
+    Args:
+        cls (type): registered PropertyGroup class
+
+    Returns:
+        set: identifiers of the properties
+    """
+    deferred = set()
+    for base in cls.__mro__:
+        for identifier, annotation in vars(base).get('__annotations__', {}).items():
+            keywords = getattr(annotation, 'keywords', {})
+            if 'set' in keywords or 'update' in keywords:
+                deferred.add(identifier)
+    return deferred
+
+
+def get_raw_load(cls: type) -> dict:
+    """
+    get the properties of the class, which are written directly to the ID properties while loading.
+    Declared as raw_load by the PropertyGroup classes
+
+    Args:
+        cls (type): registered PropertyGroup class
+
+    Returns:
+        dict: identifier -> (key of the ID property, check of the loaded value or None)
+    """
+    raw_load = {}
+    for base in reversed(cls.__mro__):
+        raw_load.update(vars(base).get('raw_load', {}))
+    return raw_load
+
+
+def get_load_plan(item: PropertyGroup) -> dict:
+    """
+    get how the loaded values are applied to an item of the PropertyGroup.
+    The plan is created once per PropertyGroup type
+
+    Args:
+        item (PropertyGroup): item to load the data to
+
+    Returns:
+        dict: identifier -> (kind, argument), kind is one of
+            'raw' (key of the ID property, check), 'deferred', 'group', 'collection', 'flag', 'set', 'skip'
+    """
+    rna = item.bl_rna
+    plan = load_plans.get(rna.identifier)
+    if plan is not None:
+        return plan
+    cls = type(item)
+    raw_load = get_raw_load(cls)
+    deferred = get_deferred_properties(cls)
+    plan = {}
+    for prop in rna.properties[1:]:  # exclude rna_type
+        identifier = prop.identifier
+        target = getattr(prop, 'fixed_type', None)
+        if identifier in raw_load:
+            plan[identifier] = ('raw', raw_load[identifier])
+        elif prop.type == 'COLLECTION' and target is not None and is_property_group(target):
+            plan[identifier] = ('collection', None)
+        elif prop.type == 'POINTER' and target is not None and is_property_group(target):
+            plan[identifier] = ('group', None)
+        elif prop.is_readonly:
+            plan[identifier] = ('skip', None)
+        elif identifier in deferred:
+            plan[identifier] = ('deferred', None)
+        elif prop.type == 'ENUM' and prop.is_enum_flag:
+            plan[identifier] = ('flag', None)
+        else:
+            plan[identifier] = ('set', None)
+    load_plans[rna.identifier] = plan
+    return plan
+
+
+def load_item(item: PropertyGroup, data: dict, deferred: list) -> None:
+    """
+    applies the loaded data to the item like apply_data_to_item, without calling the python setter
+
+    Args:
+        item (PropertyGroup): item to load the data to
+        data (dict): loaded data of the item
+        deferred (list): (item, identifier, value) of the setters to call after the load
+    """
+    plan = get_load_plan(item)
+    for identifier, value in data.items():
+        kind, argument = plan.get(identifier, ('skip', None))
+        if kind == 'raw':
+            key, check = argument
+            if check is None or check(value, data):
+                item[key] = value
+            else:
+                setattr(item, identifier, value)
+        elif kind == 'deferred':
+            deferred.append((item, identifier, value))
+        elif kind == 'collection':
+            if isinstance(value, list):
+                load_collection_items(getattr(item, identifier), value, deferred)
+        elif kind == 'group':
+            if isinstance(value, dict):
+                load_item(getattr(item, identifier), value, deferred)
+        elif kind == 'flag':
+            setattr(item, identifier, set(value))
+        elif kind == 'set':
+            with suppress(AttributeError):  # catch Exception from read-only property
+                setattr(item, identifier, value)
+
+
+def load_collection_items(collection: CollectionProperty, data: list, deferred: list) -> None:
+    """
+    adds an item for each element of the data to the collection and loads the element to it.
+    All items are added before loading, because adding can move the existing items in memory
+
+    Args:
+        collection (CollectionProperty): collection to add the items to
+        data (list): loaded data of the items
+        deferred (list): (item, identifier, value) of the setters to call after the load
+    """
+    start = len(collection)
+    for _ in range(len(data)):
+        collection.add()
+    for i, element in enumerate(data, start):
+        if isinstance(element, dict):
+            load_item(collection[i], element, deferred)
+
+
+@profiling.profiled("load")
+def load_collection(collection: CollectionProperty, data: list) -> None:
+    """
+    bulk version of apply_data_to_item for the collection, used to load the storage.
+    Values with a setter declared as raw_load are written directly to the ID properties,
+    all other setters and update callbacks are called after the data is loaded
+
+    Args:
+        collection (CollectionProperty): collection to add the loaded items to
+        data (list): loaded data of the items
+    """
+    deferred = []
+    load_collection_items(collection, data, deferred)
+    for item, identifier, value in deferred:
+        with suppress(AttributeError):  # catch Exception from read-only property
+            setattr(item, identifier, value)
+
+
 def add_data_to_collection(collection: CollectionProperty, data: dict) -> None:
     """
     creates new collection element and applies the data to it
@@ -401,7 +659,12 @@ def update_command(command: str) -> Union[str, bool]:
     return "%s(%s)" % (command, ", ".join(inputs))
 
 
-def run_queued_macros(context_copy: dict, action_type: str, action_id: str, start: int) -> None:
+def run_queued_macros(
+        context_copy: dict,
+        action_type: str,
+        action_id: str,
+        start: int,
+        session: Optional[playback.Playback_session] = None) -> None:
     """
     runs macros from a given index of a specific action
 
@@ -410,6 +673,8 @@ def run_queued_macros(context_copy: dict, action_type: str, action_id: str, star
         action_type (str): "global_actions" or "local_actions"
         action_id (str): id of the action with the macros to execute
         start (int): macro to start with in the macro collection
+        session (Optional[playback.Playback_session], optional):
+            session of the interrupted playback to continue. Defaults to None.
     """
     context = bpy.context
     if context_copy is None:
@@ -418,17 +683,24 @@ def run_queued_macros(context_copy: dict, action_type: str, action_id: str, star
         temp_override = context.temp_override(**context_copy)
     with temp_override:
         ActRec_pref = context.preferences.addons[__module__].preferences
-        action = getattr(ActRec_pref, action_type)[action_id]
-        play(context, action.macros, action, action_type, start)
+        action = getattr(ActRec_pref, action_type).get(action_id)
+        if session is not None and (action is None or not action.is_playing):
+            # the action was removed or the playback was canceled by resetting is_playing
+            session.close(context)
+            return
+        if action is None:
+            return
+        play(context, action.macros, action, action_type, start, session)
 
 
-def execute_individually(context: Context, command: str) -> None:
+def execute_individually(context: Context, code: object, namespace: dict) -> None:
     """
     execute the given command on each selected object individually
 
     Args:
         context (Context): active blender context
-        command (str): command to execute
+        code (object): compiled command to execute
+        namespace (dict): namespace the command is executed in
     """
     old_selected_objects = context.selected_objects[:]
     for object in old_selected_objects:
@@ -437,7 +709,7 @@ def execute_individually(context: Context, command: str) -> None:
     for object in old_selected_objects:
         object.select_set(True)
         context.view_layer.objects.active = object
-        exec(command)
+        exec(code, namespace)
         with suppress(ReferenceError):
             object.select_set(False)
 
@@ -446,23 +718,89 @@ def execute_individually(context: Context, command: str) -> None:
             object.select_set(True)
 
 
-# table to point from the end-loop macro (=key) to the start-loop macro (=value)
-loop_table = {}
+def execute_batch(context: Context, step: playback.Plan_step, session: playback.Playback_session) -> None:
+    """
+    execute the given step on each selected object individually,
+    statements on the active object are applied directly to the objects
+    and only operators and other commands that depend on the active object
+    are called for each object with the object selected and active
+
+    Args:
+        context (Context): active blender context
+        step (playback.Plan_step): step to execute
+        session (playback.Playback_session): session to save the selection in
+    """
+    namespace = session.namespace
+    selected_objects = session.snapshot_selection(context)
+    if step.object_code is not None:
+        for object in selected_objects:
+            namespace['ar_object'] = object
+            exec(step.object_code, namespace)
+        return
+    if not step.per_object:
+        exec(step.code, namespace)
+        return
+
+    objects = context.view_layer.objects
+    for object in selected_objects:
+        object.select_set(True)
+        objects.active = object
+        exec(step.code, namespace)
+        with suppress(ReferenceError):
+            object.select_set(False)
+
 
-# table the holds the iterator (=value) of a loop accessed by the start-loop macro (=key)
-loop_iterator = {}
+def stop_playback(
+        context: Context,
+        action: AR_action,
+        session: playback.Playback_session,
+        failed_macro: Optional[PropertyGroup] = None) -> None:
+    """
+    ends the playback of the action, alerts the failed macro and undoes the changes of an atomic playback
 
-# table the holds the loop size excluding start-loop macro but including end-loop macro (=value)
-# accessed by the start-loop macro (=key)
-loop_size = {}
+    Args:
+        context (Context): active blender context
+        action (AR_action): played action
+        session (playback.Playback_session): session of the playback
+        failed_macro (Optional[PropertyGroup], optional): macro that caused the playback to stop. Defaults to None.
+    """
+    if failed_macro is not None:
+        playback.set_alert(action, failed_macro)
+    action.is_playing = False
+    session.close(context)
+    if session.atomic and failed_macro is not None:
+        session.rollback()
+
+
+def cancel_playback(context: Context, action: AR_action, action_type: str) -> None:
+    """
+    cancels the running or waiting playback of the action,
+    a playback that pauses for a Timer event or the time budget ends when it continues
+
+    Args:
+        context (Context): active blender context
+        action (AR_action): played action
+        action_type (str): "global_actions" or "local_actions"
+    """
+    action.is_playing = False
+    session = playback.get_session(action_type, action.id)
+    if session is None:
+        return
+    # waiting sessions and sessions that wait for Render Complete don't continue by themselves
+    if (session in playback.waiting_sessions
+            or any(entry[-1] is session for entry in shared_data.render_complete_macros)):
+        session.close(context)
 
 
+@profiling.profiled("play")
 def play(
         context: Context,
         macros: CollectionProperty,
         action: AR_action,
         action_type: str,
-        start_index: int = 0) -> Union[Exception, str, None]:
+        start_index: int = 0,
+        session: Optional[playback.Playback_session] = None,
+        atomic: bool = False) -> Union[Exception, str, None]:
     """
     execute all given macros in the given context.
     action, action_type are used to run the macros of the given action with delay to the execution
@@ -473,102 +811,142 @@ def play(
         action (AR_action): action to track
         action_type (str): action type of the given action
         start_index (int): the index of the macro where to start
+        session (Optional[playback.Playback_session], optional):
+            session of the interrupted playback to continue, a new session is started if None. Defaults to None.
+        atomic (bool, optional): execute the action as one undo step and undo all changes if a macro fails,
+            expects to be called by an operator with the 'UNDO' option.
+            Actions that pause for Timer, Render Complete or a time budget can't be played atomic,
+            inside of another playback the calling playback owns the undo step. Defaults to False.
 
     Returns:
         Exception, str: error
     """
     action.is_playing = True
-    macros = [macro for macro in macros if macro.active]
-
-    # non-realtime events, execute before macros get executed
-    for i, macro in enumerate(macros[start_index:]):
-        split = macro.command.split(":")
-        if split[0] != 'ar.event':
-            continue
-        data = json.loads(":".join(split[1:]))
-        if data['Type'] == 'Render Complete':
-            # SKip only render complete macro
-            if len(macros) <= i + 1:
+    if session is None:
+        session = playback.Playback_session(playback.get_plan(macros, action, action_type), action_type, action.id)
+        ActRec_pref = get_preferences(context)
+        session.deferred_redraw = ActRec_pref.playback_deferred_redraw
+        # a playback started by a macro of another playback finishes before the calling macro returns
+        nested = playback.has_executing_session()
+        session.time_budget = 0 if nested else ActRec_pref.playback_time_budget / 1000
+        if atomic and nested:
+            logger.warning("%s is played inside of another playback, which owns the undo step" % action.label)
+        elif atomic:
+            if session.plan.pauses or session.time_budget:
                 action.is_playing = False
-                return "The 'Render Complete' macro was skipped because no additional macros follow!"
-            shared_data.render_complete_macros.append(
-                (action_type, action.id, macros[i + 1].id))
-            break
-        elif data['Type'] == 'Loop':
-            loop_count = 1
-            for j, process_macro in enumerate(macros[i + 1:], 1):
-                if not process_macro.active:
-                    continue
-                split = process_macro.command.split(":")
-                if split[0] != 'ar.event':
-                    continue
-                process_data = json.loads(":".join(split[1:]))
-                loop_count += 2 * \
-                    (process_data['Type'] == 'Loop') - \
-                    (process_data['Type'] == 'EndLoop')  # 1 or -1
-                if loop_count == 0:
-                    loop_table[process_macro.id] = macro.id
-                    loop_size[macro.id] = j
-                    loop_iterator[macro.id] = 0
-                    if data['StatementType'] == 'count':
-                        # DEPRECATED used to support old count loop macros
-                        loop_iterator[macro.id] = data["Startnumber"]
-                    break
-
-    base_area = context.area
+                return "Atomic playback can't pause for Timer, Render Complete or a time budget"
+            session.atomic = True
+        session.undo_message = action.label
+        session.index = start_index
+        queue = ActRec_pref.playback_scheduling == 'QUEUE' and session.time_budget > 0
+        if playback.add_session(context, session, queue):
+            # starts with a timer when the running playbacks ended, outside of the calling operator
+            return
+        if session.atomic:
+            session.push_start_step(context)
+    steps = session.plan.steps
+    namespace = session.namespace
+    if not namespace:
+        namespace.update(globals())
+    namespace['context'] = context
 
+    # non-realtime events, execute before macros get executed
+    render_index = bisect.bisect_left(session.plan.render_complete, start_index)
+    if render_index < len(session.plan.render_complete):
+        i = session.plan.render_complete[render_index]
+        # SKip only render complete macro
+        if len(steps) <= i + 1:
+            stop_playback(context, action, session)
+            return "The 'Render Complete' macro was skipped because no additional macros follow!"
+        entry = (action_type, action.id, i + 1, session)
+        if entry not in shared_data.render_complete_macros:  # already queued before a Timer event
+            shared_data.render_complete_macros.append(entry)
+
+    session.begin(context)
+
+    slice_end = time.perf_counter() + session.time_budget if session.time_budget else None
     i = start_index
-    while i < len(macros):
-        macro = macros[i]
-        split = macro.command.split(":")
-        if split[0] == 'ar.event':  # Handle Ar Events
-            data: dict = json.loads(":".join(split[1:]))
-            if data['Type'] in {'Render Complete'}:
+    while i < len(steps):
+        if slice_end is not None and i != start_index and time.perf_counter() > slice_end:
+            # continue in the next slice to let Blender update the interface
+            session.index = i
+            session.pause(context)
+            bpy.app.timers.register(
+                functools.partial(
+                    run_queued_macros,
+                    context.copy(),
+                    action_type,
+                    action.id,
+                    i,
+                    session
+                ),
+                first_interval=0
+            )
+            return
+        step = steps[i]
+        if step.error is not None:
+            logger.error("%s; command: %s" % (step.error, step.command))
+            stop_playback(context, action, session, macros[step.macro_id])
+            return step.error
+        if step.type != playback.COMMAND:  # Handle Ar Events
+            data = step.data
+            if step.type in {'Render Complete', 'Timer'}:
+                session.pause(context)
+            elif step.type in {'Select Object', 'Run Script'}:
+                # the events use the selection of the user instead of the selection of the execution mode "BATCH"
+                session.restore_selection(context)
+            if step.type in {'Render Complete'}:
                 return
-            if data['Type'] == 'Timer':
+            if step.type == 'Timer':
+                session.index = i + 1
                 bpy.app.timers.register(
                     functools.partial(
                         run_queued_macros,
                         context.copy(),
                         action_type,
                         action.id,
-                        i + 1
+                        i + 1,
+                        session
                     ),
                     first_interval=data['Time']
                 )
                 return
-            if data['Type'] == 'Loop':
+            if step.type == 'Loop':
                 # Skip because it is not a complete loop
-                if macro.id not in loop_iterator:
+                if step.jump is None:
                     i += 1
                     continue
 
+                loop = session.enter_loop(i)
                 if data['StatementType'] == 'python':
                     try:
-                        if eval(data["PyStatement"]):
+                        if eval(step.code, session.get_loop_globals(context, loop)):
+                            loop.counter += 1
                             i += 1
                         else:
-                            i += loop_size[macro.id] + 1
+                            session.exit_loop()
+                            i = step.jump + 1
                     except Exception as err:
                         logger.error(err)
-                        action.alert = macro.alert = True
-                        action.is_playing = False
+                        stop_playback(context, action, session, macros[step.macro_id])
                         return err
                 elif data['StatementType'] == 'count':
                     # DEPRECATED used to support old count loop macros
-                    if loop_iterator[macro.id] < data["Endnumber"]:
-                        loop_iterator[macro.id] += data["Stepnumber"]
+                    if loop.counter < data["Endnumber"]:
+                        loop.counter += data["Stepnumber"]
                         i += 1
                     else:
-                        i += loop_size[macro.id] + 1
+                        session.exit_loop()
+                        i = step.jump + 1
                 else:
-                    if loop_iterator[macro.id] < data["RepeatCount"]:
-                        loop_iterator[macro.id] += 1
+                    if loop.counter < data["RepeatCount"]:
+                        loop.counter += 1
                         i += 1
                     else:
-                        i += loop_size[macro.id] + 1
+                        session.exit_loop()
+                        i = step.jump + 1
                 continue
-            elif data['Type'] == 'Select Object':
+            elif step.type == 'Select Object':
                 selected_objects = context.selected_objects
 
                 if not data.get('KeepSelection', False):
@@ -588,8 +966,7 @@ def play(
                 objects = context.view_layer.objects
                 main_object = bpy.data.objects.get(data['Object'])
                 if main_object is None or main_object not in objects.values():
-                    action.alert = macro.alert = True
-                    action.is_playing = False
+                    stop_playback(context, action, session, macros[step.macro_id])
                     return "%s Object doesn't exist in the active view layer" % data['Object']
 
                 objects.active = main_object
@@ -597,105 +974,50 @@ def play(
                 selected_objects.append(main_object)
                 i += 1
                 continue
-            elif data['Type'] == 'Run Script':
-                text = bpy.data.texts.new(macro.id)
-                text.clear()
-                text.write(data['ScriptText'])
+            elif step.type == 'Run Script':
                 try:
-                    text.as_module()
-                except Exception:
-                    error = traceback.format_exception(*sys.exc_info())
-                    # corrects the filename of the exception to the text name, otherwise "<string>"
-                    error_split = error[3].replace('"<string>"', '').split(',')
-                    error[3] = '%s "%s",%s' % (
-                        error_split[0], text.name, error_split[1])
-                    # removes exec(self.as_string(), mod.__dict__) in bpy_types.py
-                    error.pop(2)
-                    error.pop(1)  # removes text.as_module()
-                    error = "".join(error)
+                    # looked up each time to keep the script and its source in the cache
+                    code = playback.compile_script(data['ScriptText'])
+                    exec(code, session.get_script_namespace(i, step.macro_id))
+                except Exception as err:
+                    error = playback.format_script_error(err, step.macro_id)
                     logger.error("%s; command: %s" % (error, data))
-                    action.alert = macro.alert = True
-                    action.is_playing = False
+                    stop_playback(context, action, session, macros[step.macro_id])
                     return error
-                bpy.data.texts.remove(text)
                 i += 1
                 continue
-            elif data['Type'] == 'EndLoop':
-                start_id = loop_table[macro.id]
-                i -= loop_size[start_id]
+            elif step.type == 'EndLoop':
+                if step.jump is None:
+                    # Skip because no Loop was called
+                    i += 1
+                else:
+                    i = step.jump
+                continue
+            else:
+                i += 1
                 continue
 
         try:
-            command = macro.command
-            if (command.startswith("bpy.ops.ar.local_play")
-                    and set(extract_properties(command.split("(")[1][: -1])) == {"id=\"\"", "index=-1"}):
-                err = "Don't run Local Play with default properties, this may cause recursion"
-                logger.error(err)
-                action.alert = macro.alert = True
-                action.is_playing = False
-                return err
-
-            if command.startswith("bpy.ops."):
-                split = command.split("(")
-                command = "%s(\"%s\", %s" % (
-                    split[0],
-                    macro.operator_execution_context,
-                    "(".join(split[1:]))
-            elif command.startswith("bpy.context."):
-                command = command.replace("bpy.context.", "context.")
-
-            temp_window = context.window
-            temp_screen = context.screen
-            temp_area = context.area
-            temp_region = context.region
-            area_type = None
-            if temp_area and macro.ui_type and temp_area.ui_type != macro.ui_type:
-                windows = list(context.window_manager.windows)
-                windows.reverse()
-                for window in windows:
-                    if window.screen.areas[0].ui_type == macro.ui_type:
-                        temp_window = window
-                        temp_screen = temp_window.screen
-                        temp_area = temp_screen.areas[0]
-                        break
-                else:
-                    area_type = temp_area.ui_type
-                    temp_area.ui_type = macro.ui_type
-            if temp_area:
-                # mostly "WINDOW" is at the end of the list
-                for region in reversed(temp_area.regions):
-                    if region.type != "WINDOW":
-                        continue
-                    temp_region = region
-
-            # Note: region need to be set when override area for temp_override
-            # for more detail see https://projects.blender.org/blender/blender/issues/106373
-            with context.temp_override(
-                    window=temp_window,
-                    screen=temp_screen,
-                    area=temp_area,
-                    region=temp_region):
-                if action.execution_mode == "GROUP":
-                    exec(command)
-                else:
-                    execute_individually(context, command)
-
-            if temp_area and area_type:
-                temp_area.ui_type = area_type
-
-            if bpy.context and bpy.context.area:
+            session.enter_override(context, step.ui_type)
+            if action.execution_mode == "GROUP":
+                exec(step.code, namespace)
+            elif action.execution_mode == "BATCH":
+                execute_batch(context, step, session)
+            else:
+                execute_individually(context, step.code, namespace)
+
+            if session.deferred_redraw:
+                session.redraw_pending = True
+            elif bpy.context and bpy.context.area:
                 bpy.context.area.tag_redraw()
             i += 1
 
         except Exception as err:
-            logger.error("%s; command: %s" % (err, command))
-            action.alert = macro.alert = True
-            if base_area and area_type:
-                base_area.ui_type = area_type
-            action.is_playing = False
+            logger.error("%s; command: %s" % (err, step.command))
+            stop_playback(context, action, session, macros[step.macro_id])
             return err
     else:
-        action.is_playing = False
+        stop_playback(context, action, session)
 
 
 @ persistent
@@ -711,9 +1033,9 @@ def execute_render_complete(dummy=None) -> None:
     context = bpy.context
     ActRec_pref = get_preferences(context)
     while len(shared_data.render_complete_macros):
-        action_type, action_id, start_id = shared_data.render_complete_macros.pop(0)
-        action = getattr(ActRec_pref, action_type)[action_id]
-        if (start_index := action.macros.find(start_id)) < 0:
+        action_type, action_id, start_index, session = shared_data.render_complete_macros.pop(0)
+        if getattr(ActRec_pref, action_type).find(action_id) < 0:
+            session.close(context)
             continue
 
         bpy.app.timers.register(
@@ -722,7 +1044,8 @@ def execute_render_complete(dummy=None) -> None:
                 None,
                 action_type,
                 action_id,
-                start_index
+                start_index,
+                session
             ),
             first_interval=0.1
         )
@@ -276,6 +276,7 @@ class AR_OT_category_edit(shared.Id_based, AR_OT_category_interface, Operator):
         self.apply_visibility(
             ActRec_pref, AR_OT_category_interface.category_visibility, self.id
         )
+        functions.mark_dirty(categories=[self.id])
         if ActRec_pref.autosave:
             functions.save(ActRec_pref)
         context.area.tag_redraw()
@@ -352,6 +353,7 @@ class AR_OT_category_delete(shared.Id_based, Operator):
             return {"FINISHED"}
         category = categories[id]
         for id_action in category.actions:
+            functions.remove_plan('global_actions', id_action.id)
             ActRec_pref.global_actions.remove(ActRec_pref.global_actions.find(id_action.id))
         ui_functions.unregister_category(ActRec_pref, len(categories) - 1)
         categories.remove(categories.find(id))
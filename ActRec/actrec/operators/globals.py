@@ -15,7 +15,7 @@ from bpy.props import StringProperty, BoolProperty, EnumProperty, CollectionProp
 from bpy_extras.io_utils import ImportHelper, ExportHelper
 
 # relative imports
-from .. import functions, properties, icon_manager, ui_functions, keymap
+from .. import functions, properties, icon_manager, keymap
 from . import shared
 from ..functions.shared import get_preferences
 from ..log import logger
@@ -60,6 +60,7 @@ class AR_OT_global_recategorize_action(shared.Id_based, Operator):
             else:
                 for id in ids:
                     category.actions.remove(category.actions.find(id))
+        functions.mark_dirty(categories=None)
         if ActRec_pref.autosave:
             functions.save(ActRec_pref)
         context.area.tag_redraw()
@@ -134,10 +135,7 @@ class AR_OT_global_import(Operator, ImportHelper):
             return {'CANCELLED'}
 
         if self.mode == "overwrite":
-            for i in range(len(ActRec_pref.categories)):
-                ui_functions.unregister_category(ActRec_pref, i)
-            ActRec_pref.global_actions.clear()
-            ActRec_pref.categories.clear()
+            functions.clear_global_actions(ActRec_pref)
 
         if ActRec_pref.import_extension == ".zip":
             # Only used because old Version used .zip to export and directory and file structure
@@ -191,6 +189,7 @@ class AR_OT_global_import(Operator, ImportHelper):
 
         ActRec_pref = get_preferences(context)
         ActRec_pref.import_settings.clear()
+        functions.mark_dirty(categories=None)
         if ActRec_pref.autosave:
             functions.save(ActRec_pref)
         context.area.tag_redraw()
@@ -492,6 +491,7 @@ class AR_OT_global_export(Operator, ExportHelper):
                 data['categories'].append(item)
         for action in ActRec_pref.global_actions:
             if action.id in export_action_ids:
+                functions.load_macros(action)
                 data['actions'].append(functions.property_to_python(
                     action,
                     exclude=["name", "selected", "alert", "macros.name",
@@ -545,7 +545,7 @@ class AR_OT_global_save(Operator):
     bl_description = "Save all Global Actions to the Storage"
 
     def execute(self, context: Context) -> set[str]:
-        functions.save(get_preferences(context))
+        functions.save(get_preferences(context), full=True, immediate=True)
         return {"FINISHED"}
 
 
@@ -581,6 +581,7 @@ class AR_OT_global_to_local(shared.Id_based, Operator):
             action (AR_global_actions): action to copy
         """
         id = uuid.uuid1().hex if action.id in set(x.id for x in ActRec_pref.local_actions) else action.id
+        functions.load_macros(action)
         data = functions.property_to_python(
             action,
             exclude=["name", "alert", "macros.name", "macros.alert",
@@ -596,10 +597,12 @@ class AR_OT_global_to_local(shared.Id_based, Operator):
             self.global_to_local(ActRec_pref, ActRec_pref.global_actions[id])
             if ActRec_pref.global_to_local_mode != 'move':
                 continue
+            functions.remove_plan('global_actions', id)
             ActRec_pref.global_actions.remove(ActRec_pref.global_actions.find(id))
             for category in ActRec_pref.categories:
                 category.actions.remove(category.actions.find(id))
         functions.save_local_to_scene(ActRec_pref, context.scene)
+        functions.mark_dirty(categories=None)
         if ActRec_pref.autosave:
             functions.save(ActRec_pref)
         context.area.tag_redraw()
@@ -637,9 +640,11 @@ class AR_OT_global_remove(shared.Id_based, Operator):
         for id in functions.get_global_action_ids(ActRec_pref, self.id, self.index):
             if functions.get_action_keymap(id, km) is not None:
                 functions.remove_action_keymap(id, km)
+            functions.remove_plan('global_actions', id)
             ActRec_pref.global_actions.remove(ActRec_pref.global_actions.find(id))
             for category in ActRec_pref.categories:
                 category.actions.remove(category.actions.find(id))
+        functions.mark_dirty(categories=None)
         if ActRec_pref.autosave:
             functions.save(ActRec_pref)
         context.area.tag_redraw()
@@ -666,6 +671,7 @@ class AR_OT_global_move_up(shared.Id_based, Operator):
                     continue
                 index = category.actions.find(id_action.id)
                 category.actions.move(index, index - 1)
+        functions.mark_dirty(categories=None)
         if ActRec_pref.autosave:
             functions.save(ActRec_pref)
         context.area.tag_redraw()
@@ -692,6 +698,7 @@ class AR_OT_global_move_down(shared.Id_based, Operator):
                     continue
                 index = category.actions.find(id_action.id)
                 category.actions.move(index, index + 1)
+        functions.mark_dirty(categories=None)
         if ActRec_pref.autosave:
             functions.save(ActRec_pref)
         context.area.tag_redraw()
@@ -705,6 +712,13 @@ class AR_OT_global_execute_action(shared.Id_based, Operator):
     bl_description = 'Play this Action Button'
     bl_options = {'UNDO', 'INTERNAL'}
 
+    atomic: BoolProperty(
+        name="Atomic",
+        description="Execute the whole action as one undo step and undo all its changes if a macro fails."
+        " Not available for actions that pause for Timer, Render Complete or a time budget",
+        default=False
+    )
+
     @classmethod
     def description(cls, context, properties):
         ActRec_pref = get_preferences(context)
@@ -727,12 +741,28 @@ class AR_OT_global_execute_action(shared.Id_based, Operator):
         if action.is_playing:
             self.report({'INFO'}, "The action is already playing!")
             return {'CANCELLED'}
-        err = functions.play(context, action.macros, action, 'global_actions')
+        functions.load_macros(action)
+        err = functions.play(context, action.macros, action, 'global_actions', atomic=self.atomic)
         if err:
             self.report({'ERROR'}, str(err))
         return {'FINISHED'}
 
 
+class AR_OT_global_stop(shared.Id_based, Operator):
+    bl_idname = "ar.global_stop"
+    bl_label = "Stop Playback"
+    bl_description = "Stops the running or waiting playback of the action"
+
+    def execute(self, context: Context) -> set[str]:
+        ActRec_pref = get_preferences(context)
+        id = functions.get_global_action_id(ActRec_pref, self.id, self.index)
+        self.clear()
+        if id is None or not ActRec_pref.global_actions[id].is_playing:
+            return {'CANCELLED'}
+        functions.cancel_playback(context, ActRec_pref.global_actions[id], 'global_actions')
+        return {'FINISHED'}
+
+
 class AR_OT_global_icon(icon_manager.Icontable, shared.Id_based, Operator):
     bl_idname = "ar.global_icon"
 
@@ -753,6 +783,7 @@ class AR_OT_global_icon(icon_manager.Icontable, shared.Id_based, Operator):
         ActRec_pref.global_actions[self.id].icon = ActRec_pref.selected_icon
         ActRec_pref.selected_icon = 0  # Icon: NONE
         self.reuse = False
+        functions.mark_dirty(actions=[self.id])
         if ActRec_pref.autosave:
             functions.save(ActRec_pref)
         bpy.context.area.tag_redraw()
@@ -848,6 +879,7 @@ class AR_OT_global_edit(Operator):
         action = ActRec_pref.global_actions[id]
         action.label = self.label
         action.description = self.description
+        functions.mark_dirty(actions=[id])
         if ActRec_pref.autosave:
             functions.save(ActRec_pref)
         context.area.tag_redraw()
@@ -868,6 +900,7 @@ classes = [
     AR_OT_global_move_up,
     AR_OT_global_move_down,
     AR_OT_global_execute_action,
+    AR_OT_global_stop,
     AR_OT_global_icon,
     AR_OT_add_ar_shortcut,
     AR_OT_remove_ar_shortcut,
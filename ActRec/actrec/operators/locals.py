@@ -8,11 +8,12 @@ from typing import TYPE_CHECKING
 # blender modules
 import bpy
 from bpy.types import Operator, Context, Event, AddonPreferences, OperatorProperties, PropertyGroup
-from bpy.props import StringProperty, IntProperty, EnumProperty, CollectionProperty
+from bpy.props import StringProperty, IntProperty, EnumProperty, CollectionProperty, BoolProperty
 
 # relative imports
 from .. import functions, properties, icon_manager, shared_data
 from ..log import logger
+from ..functions import profiling
 from . import shared
 from ..functions.shared import get_preferences
 if TYPE_CHECKING:
@@ -97,9 +98,12 @@ class AR_OT_local_to_global(Operator):
                                      [ActRec_pref.active_local_action_index])
                 break
         if ActRec_pref.local_to_global_mode == 'move':
-            functions.remove_local_action_from_text(ActRec_pref.local_actions[ActRec_pref.active_local_action_index])
+            action = ActRec_pref.local_actions[ActRec_pref.active_local_action_index]
+            functions.remove_local_action_from_text(action)
+            functions.remove_plan('local_actions', action.id)
             ActRec_pref.local_actions.remove(ActRec_pref.active_local_action_index)
         functions.save_local_to_scene(ActRec_pref, context.scene)
+        functions.mark_dirty(categories=None)
         if ActRec_pref.autosave:
             functions.save(ActRec_pref)
         context.area.tag_redraw()
@@ -165,6 +169,7 @@ class AR_OT_local_remove(shared.Id_based, Operator):
             return {"CANCELLED"}
         else:
             functions.remove_local_action_from_text(ActRec_pref.local_actions[index])
+            functions.remove_plan('local_actions', ActRec_pref.local_actions[index].id)
             ActRec_pref.local_actions.remove(index)
         functions.save_local_to_scene(ActRec_pref, context.scene)
         context.area.tag_redraw()
@@ -371,6 +376,13 @@ class AR_OT_local_play(shared.Id_based, Operator):
     bl_description = 'Play the selected Action.'
     bl_options = {'REGISTER', 'UNDO'}
 
+    atomic: BoolProperty(
+        name="Atomic",
+        description="Execute the whole action as one undo step and undo all its changes if a macro fails."
+        " Not available for actions that pause for Timer, Render Complete or a time budget",
+        default=False
+    )
+
     ignore_selection = False
 
     @classmethod
@@ -391,15 +403,38 @@ class AR_OT_local_play(shared.Id_based, Operator):
         if action.is_playing:
             self.report({'INFO'}, "The action is already playing!")
             return {'CANCELLED'}
-        err = functions.play(context, action.macros, action, 'local_actions')
+        err = functions.play(context, action.macros, action, 'local_actions', atomic=self.atomic)
         if err:
             self.report({'ERROR'}, str(err))
-        # Ensure is_playing is always reset, even if the play function didn't reset it
-        action.is_playing = False
+        # Ensure is_playing is reset, even if the play function didn't reset it,
+        # unless the playback continues with a timer
+        if functions.get_session('local_actions', action.id) is None:
+            action.is_playing = False
         self.clear()
         return {'FINISHED'}
 
 
+class AR_OT_local_stop(shared.Id_based, Operator):
+    bl_idname = "ar.local_stop"
+    bl_label = "Stop Playback"
+    bl_description = "Stops the running or waiting playback of the selected action"
+
+    @classmethod
+    def poll(cls, context: Context) -> bool:
+        ActRec_pref = get_preferences(context)
+        return len(ActRec_pref.local_actions)
+
+    def execute(self, context: Context) -> set[str]:
+        ActRec_pref = get_preferences(context)
+        index = functions.get_local_action_index(ActRec_pref, self.id, self.index)
+        action = ActRec_pref.local_actions[index]
+        self.clear()
+        if not action.is_playing:
+            return {'CANCELLED'}
+        functions.cancel_playback(context, action, 'local_actions')
+        return {'FINISHED'}
+
+
 class AR_OT_local_record(shared.Id_based, Operator):
     bl_idname = "ar.local_record"
     bl_label = "Start/Stop Recording"
@@ -433,20 +468,110 @@ class AR_OT_local_record(shared.Id_based, Operator):
         if ActRec_pref.local_record_macros:  # start recording
             self.id = action.id
             self.index = index
-            self.record_start_index = functions.get_report_text(context).count('\n')
+            self.record_start_index = functions.get_report_count(context)
+            shared_data.tracked_actions.clear()
+            shared_data.dropped_tracked_actions = 0
+            ActRec_pref.operators_list_length = len(context.window_manager.operators)
+            live_action_id = action.id if ActRec_pref.local_record_live else None
+            if ((live_action_id or ActRec_pref.local_record_journal)
+                    and functions.start_record_journal(context, live_action_id)):
+                return {"FINISHED"}
+            if live_action_id:
+                self.report({'INFO'}, "Live Recording needs an open Info editor, the macros are added at the end")
             context.scene.ar.record_undo_end = not context.scene.ar.record_undo_end
             return {"FINISHED"}
 
         # end recording and add reports as macros
-        reports = functions.get_report_text(context).splitlines()[self.record_start_index:]
-        reports = [report for report in reports if report.startswith('bpy.')]
+        with profiling.stage("record") as counters:
+            self.stop_recording(context, ActRec_pref, index, counters)
+        return {"FINISHED"}
+
+    def stop_recording(self, context: Context, ActRec_pref: AR_preferences, index: int, counters: dict) -> None:
+        """
+        adds the recorded reports as macros to the action
+
+        Args:
+            context (Context): active blender context
+            ActRec_pref (AR_preferences): preferences of this addon
+            index (int): index of the recorded action
+            counters (dict): counters of the profiled stage
+        """
+        journal = functions.stop_record_journal(context)
+        if isinstance(journal, functions.Live_record_journal):  # the macros are already added
+            shared_data.tracked_actions.clear()
+            self.finish_recording(context, ActRec_pref, ActRec_pref.local_actions[index], journal.error_reports)
+            return
+        with profiling.stage("record.reports") as stage_counters:
+            reports = functions.get_report_text(context, self.record_start_index).splitlines()
+            reports = [report for report in reports if report.startswith('bpy.')]
+            stage_counters["reports"] = counters["reports"] = len(reports)
         if not len(reports):
             self.clear()
-            return {"FINISHED"}
-        reports = numpy.array(functions.merge_report_tracked(reports, shared_data.tracked_actions), dtype=object)
+            return
+        with profiling.stage("record.merge", tracked=len(shared_data.tracked_actions)):
+            reports = numpy.array(functions.merge_report_tracked(reports, shared_data.tracked_actions), dtype=object)
         shared_data.tracked_actions.clear()
         logger.info("Record Reports: %s", reports)
 
+        if journal is None:
+            with profiling.stage("record.replay", reports=len(reports)):
+                data = self.replay_reports(context, reports)
+        else:
+            with profiling.stage("record.journal", reports=len(reports)):
+                data = [functions.improve_report(context, report, journal) for report in reports]
+        context = bpy.context
+
+        error_reports = []
+        action = ActRec_pref.local_actions[index]
+        with profiling.stage("record.macros") as stage_counters:
+            for report in data:
+                if report is not None:
+                    functions.add_report_as_macro(context, ActRec_pref, action, report, error_reports)
+            stage_counters["macros"] = counters["macros"] = len(data) - len(error_reports)
+        self.finish_recording(context, ActRec_pref, action, error_reports)
+
+    def finish_recording(
+            self,
+            context: Context,
+            ActRec_pref: AR_preferences,
+            action: PropertyGroup,
+            error_reports: list) -> None:
+        """
+        saves the recorded macros of the action
+
+        Args:
+            context (Context): active blender context
+            ActRec_pref (AR_preferences): preferences of this addon
+            action (PropertyGroup): recorded action
+            error_reports (list): reports that couldn't be added as macros
+        """
+        if error_reports:
+            self.report({'ERROR'}, "Not all reports could be added added:\n%s" % "\n".join(error_reports))
+        if shared_data.dropped_tracked_actions:
+            self.report(
+                {'WARNING'},
+                "%i tracked actions were dropped, the oldest macros may be inaccurate"
+                % shared_data.dropped_tracked_actions
+            )
+            shared_data.dropped_tracked_actions = 0
+        with profiling.stage("record.save", macros=len(action.macros)):
+            functions.save_local_to_scene(ActRec_pref, bpy.context.scene)
+            if not ActRec_pref.hide_local_text:
+                functions.local_action_to_text(action)
+        context.area.tag_redraw()
+        self.clear()
+
+    def replay_reports(self, context: Context, reports: list) -> list[str]:
+        """
+        undo the recording and redo it step by step to improve the reports with the state of each step
+
+        Args:
+            context (Context): active blender context
+            reports (list): merged reports of the recording
+
+        Returns:
+            list[str]: improved reports
+        """
         record_undo_end = context.scene.ar.record_undo_end
         redo_steps = 0
         while record_undo_end == bpy.context.scene.ar.record_undo_end and bpy.ops.ed.undo.poll():
@@ -499,20 +624,7 @@ class AR_OT_local_record(shared.Id_based, Operator):
 
         while redo_steps > 0 and bpy.ops.ed.redo.poll():
             bpy.ops.ed.redo()
-        context = bpy.context
-
-        error_reports = []
-        action = ActRec_pref.local_actions[index]
-        for report in data:
-            functions.add_report_as_macro(context, ActRec_pref, action, report, error_reports)
-        if error_reports:
-            self.report({'ERROR'}, "Not all reports could be added added:\n%s" % "\n".join(error_reports))
-        functions.save_local_to_scene(ActRec_pref, bpy.context.scene)
-        if not ActRec_pref.hide_local_text:
-            functions.local_action_to_text(action)
-        context.area.tag_redraw()
-        self.clear()
-        return {"FINISHED"}
+        return data
 
 
 class AR_OT_local_icon(icon_manager.Icontable, shared.Id_based, Operator):
@@ -596,6 +708,7 @@ classes = [
     AR_OT_local_selection_up,
     AR_OT_local_selection_down,
     AR_OT_local_play,
+    AR_OT_local_stop,
     AR_OT_local_record,
     AR_OT_local_icon,
     AR_OT_local_clear
@@ -3,7 +3,6 @@
 import importlib
 import json
 import time
-import numpy
 import threading
 from typing import Optional
 from logging import Logger
@@ -65,16 +64,21 @@ class AR_OT_macro_add(shared.Id_based, Operator):
         command = None
 
         if not self.command:  # get the command from the latest Blender report
-            reports = functions.get_report_text(context).splitlines()
-            length = len(reports)
+            length = functions.get_report_count(context)
             if self.report_length != length:
                 new_report = True
                 self.report_length = length
-                reports.reverse()
-                for report in reports:
-                    if report.startswith(("bpy.ops.", "bpy.context.")):
-                        command = report
-                        break
+                # only copy the latest reports until a command is found
+                stop = length
+                while command is None and stop > 0:
+                    start = max(stop - 16, 0)
+                    reports = functions.get_report_text(context, start, stop).splitlines()
+                    reports.reverse()
+                    for report in reports:
+                        if report.startswith(("bpy.ops.", "bpy.context.")):
+                            command = report
+                            break
+                    stop = start
         else:  # command was passed through with the operator parameter
             new_report = True
             command = self.command
@@ -87,10 +91,10 @@ class AR_OT_macro_add(shared.Id_based, Operator):
             if command.startswith("bpy.context."):
                 tracked_actions = []
                 if not self.command:
-                    tracked_actions = numpy.array(shared_data.tracked_actions)[::-1]
+                    tracked_actions = list(reversed(shared_data.tracked_actions))
                     i = 0
                     len_tracked = len(tracked_actions)
-                    while i < len_tracked and tracked_actions[i][2] != "CONTEXT":
+                    while i < len_tracked and tracked_actions[i].bl_idname != "CONTEXT":
                         i += 1
                     tracked_actions = tracked_actions[:i + 1]
                 reports = functions.merge_report_tracked([command], tracked_actions)
@@ -119,15 +123,15 @@ class AR_OT_macro_add(shared.Id_based, Operator):
             elif command.startswith("bpy.ops."):
                 ops_type, ops_name, ops_values = functions.split_operator_report(command)
                 if not self.command:
-                    tracked_actions = numpy.array(shared_data.tracked_actions)[::-1]
+                    tracked_actions = list(reversed(shared_data.tracked_actions))
                     i = 0
                     len_tracked = len(tracked_actions)
                     if len_tracked > i:
                         tracked = tracked_actions[i]
                         i += 1
                         # compare tracked operator data with the command operator data
-                        while (not (tracked[2] == "%s_OT_%s" % (ops_type.upper(), ops_name)
-                                    and functions.compare_op_dict(ops_values, tracked[3]))
+                        while (not (tracked.bl_idname == "%s_OT_%s" % (ops_type.upper(), ops_name)
+                                    and functions.compare_op_dict(ops_values, tracked.data))
                                and len_tracked > i):
                             tracked = tracked_actions[i]
                             i += 1
@@ -207,7 +211,11 @@ class AR_OT_macro_add_event(shared.Id_based, Operator):
         ]
     )
     repeat_count: IntProperty(name='Count', min=0, default=1, description="How many times the Loop gets repeated")
-    python_statement: StringProperty(name="Statement", description="Statement to be evaluated as python code")
+    python_statement: StringProperty(
+        name="Statement",
+        description="Statement to be evaluated as python code before each iteration,"
+        " bpy, context and the amount of finished iterations as iteration can be used"
+    )
     object: StringProperty(
         name="Active",
         description="Choose an Object which get select and set as active when this Event is played",
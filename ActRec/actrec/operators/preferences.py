@@ -2,16 +2,19 @@
 # external modules
 import os
 import sys
+import json
 import subprocess
 
 # blender modules
 import bpy
 from bpy.types import Context, Event, Operator
-from bpy.props import StringProperty
+from bpy.props import StringProperty, EnumProperty
 from bpy_extras.io_utils import ExportHelper
 
 # relative imports
 from ..log import logger
+from .. import functions
+from ..functions import profiling
 from ..functions.shared import get_preferences
 # endregion
 
@@ -117,13 +120,90 @@ class AR_OT_preferences_open_explorer(Operator):
                 self.open_directory_in_explorer(os.path.dirname(self.path))
                 logger.info("Fallback to show directory: %s" % err)
         return {'FINISHED'}
+
+
+class AR_OT_preferences_export_profile(Operator, ExportHelper):
+    bl_idname = "ar.preferences_export_profile"
+    bl_label = "Export Profile"
+    bl_description = "Export the timings of the profiled stages as a .json file"
+    bl_options = {'REGISTER', 'INTERNAL'}
+
+    filter_glob: StringProperty(default='*.json', options={'HIDDEN'})
+    filename_ext = ".json"
+
+    filepath: StringProperty(
+        name="File Path",
+        description="Filepath used for exporting the profile",
+        maxlen=1024,
+        subtype='FILE_PATH',
+        default="ActionRecorderProfile"
+    )
+
+    @classmethod
+    def poll(cls, context: Context) -> bool:
+        return bool(profiling.stages)
+
+    def execute(self, context: Context) -> set[str]:
+        if not os.path.exists(os.path.dirname(self.filepath)):
+            self.report({'ERROR'}, "Directory doesn't exist")
+            return {'CANCELLED'}
+        summary = profiling.get_summary()
+        logger.info("profile summary %s", json.dumps(summary))
+        with open(self.filepath, 'w', encoding='utf-8') as profile_file:
+            json.dump(summary, profile_file, indent=4)
+        return {'FINISHED'}
+
+
+class AR_OT_preferences_convert_storage(Operator):
+    bl_idname = "ar.preferences_convert_storage"
+    bl_label = "Convert Storage"
+    bl_description = "Save the Global Buttons to a Storage of the selected format next to the current Storage"
+    bl_options = {'REGISTER', 'INTERNAL'}
+
+    storage_format: EnumProperty(
+        items=[("JSON", "JSON", "Storage.json, readable json file"),
+               ("SQLITE", "SQLite", "Storage.db, SQLite database that saves and loads single actions")],
+        name="Format"
+    )
+
+    def get_path(self, context: Context) -> str:
+        ActRec_pref = get_preferences(context)
+        extension = ".db" if self.storage_format == 'SQLITE' else ".json"
+        return os.path.splitext(ActRec_pref.storage_path)[0] + extension
+
+    def invoke(self, context: Context, event: Event) -> set[str]:
+        path = self.get_path(context)
+        if os.path.exists(path) and path != get_preferences(context).storage_path:
+            return context.window_manager.invoke_confirm(
+                self,
+                event,
+                title="Overwrite Storage",
+                message="%s already exists and will be overwritten" % os.path.basename(path),
+                confirm_text="Overwrite",
+                icon='WARNING'
+            )
+        return self.execute(context)
+
+    def execute(self, context: Context) -> set[str]:
+        ActRec_pref = get_preferences(context)
+        path = self.get_path(context)
+        if functions.database.is_database(path) == functions.database.is_database(ActRec_pref.storage_path):
+            self.report({'INFO'}, "The Storage already has this format")
+            return {'CANCELLED'}
+        functions.flush_storage()
+        ActRec_pref.storage_path = path
+        functions.save(ActRec_pref, full=True, immediate=True)
+        logger.info("converted storage to %s" % path)
+        return {'FINISHED'}
 # endregion
 
 
 classes = [
     AR_OT_preferences_directory_selector,
     AR_OT_preferences_recover_directory,
-    AR_OT_preferences_open_explorer
+    AR_OT_preferences_open_explorer,
+    AR_OT_preferences_export_profile,
+    AR_OT_preferences_convert_storage
 ]
 
 # region Registration
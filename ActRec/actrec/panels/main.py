@@ -8,6 +8,7 @@ from .. import config
 from .. import update
 from ..log import log_sys
 from ..functions.shared import get_preferences
+from ..functions.playback import get_session
 # endregion
 
 classes = []
@@ -106,7 +107,13 @@ def panel_factory(space_type: str):
                 col = layout.column()
                 row = col.row()
                 row.scale_y = 2
-                row.operator("ar.local_play", text="Playing..." if selected_action.is_playing else "Play")
+                text = "Play"
+                if selected_action.is_playing:
+                    session = get_session('local_actions', selected_action.id)
+                    text = "Playing..." if session is None else "Playing... %i%%" % (session.progress * 100)
+                row.operator("ar.local_play", text=text)
+                if selected_action.is_playing:
+                    row.operator("ar.local_stop", text='', icon='CANCEL')
                 col.operator("ar.local_to_global", text='Local to Global')
                 row = col.row(align=True)
                 row.enabled = bpy.ops.ar.local_to_global.poll()
@@ -6,7 +6,7 @@ from typing import TYPE_CHECKING
 
 # blender modules
 import bpy
-from bpy.props import StringProperty, BoolProperty, EnumProperty, CollectionProperty, IntProperty
+from bpy.props import StringProperty, BoolProperty, EnumProperty, CollectionProperty, IntProperty, FloatProperty
 from bpy.types import AddonPreferences, Context
 import rna_keymap_ui
 
@@ -158,6 +158,19 @@ class AR_preferences(AddonPreferences):
             ("move", "Move", "Move the Action over to Global and Delete it from Local")]
     )
     local_record_macros: BoolProperty(name="Record Macros", default=False)
+    local_record_journal: BoolProperty(
+        name="Journal Recording",
+        description="Copy the changed properties while recording,"
+        " so stopping the recording doesn't undo and redo every recorded step."
+        " Needs an open Info editor, whose selection is changed while recording",
+        default=False
+    )
+    local_record_live: BoolProperty(
+        name="Live Recording",
+        description="Add the macros while recording, instead of adding all macros when the recording stops."
+        " Needs an open Info editor",
+        default=False
+    )
 
     def hide_show_local_in_texteditor(self, context: Context):
         if self.hide_local_text:
@@ -182,6 +195,41 @@ class AR_preferences(AddonPreferences):
 
     operators_list_length: IntProperty(name="INTERNAL", default=0)
 
+    def update_profiling(self, context: Context) -> None:
+        functions.profiling.enabled = self.profiling
+        if not self.profiling:
+            functions.profiling.clear()
+
+    profiling: BoolProperty(
+        name="Profiling",
+        description="Time the stages of recording and playback, the timings are written to the log",
+        default=False,
+        update=update_profiling
+    )
+
+    # playback
+    playback_deferred_redraw: BoolProperty(
+        name="Deferred Redraw",
+        description="Redraw the interface only once when an action finished or waits for an event,"
+        " instead of after every macro",
+        default=True
+    )
+    playback_time_budget: FloatProperty(
+        name="Time Budget",
+        description="Milliseconds an action is played before Blender can update the interface,"
+        " the playback continues afterwards. 0 plays the whole action at once",
+        default=0,
+        min=0,
+        soft_max=1000
+    )
+    playback_scheduling: EnumProperty(
+        items=[("INTERLEAVE", "Interleave", "Actions that are played at the same time run alternately"),
+               ("QUEUE", "Queue", "Actions wait until the playing actions ended")],
+        name="Scheduling",
+        description="How actions are played while other actions are still playing with a time budget",
+        default="INTERLEAVE"
+    )
+
     multiline_support_installing: BoolProperty(name="INTERNAL", default=False)
     multiline_support_dont_ask: BoolProperty(
         name="Don't Ask Again",
@@ -202,6 +250,21 @@ class AR_preferences(AddonPreferences):
         name="Autosave",
         description="automatically saves all Global Buttons to the Storage"
     )
+
+    def update_global_lazy_load(self, context: Context) -> None:
+        if self.global_lazy_load:
+            return
+        for action in self.global_actions:
+            functions.load_macros(action)
+
+    global_lazy_load: BoolProperty(
+        default=False,
+        name="Lazy Loading",
+        description="Load the macros of a Global Button when it is used the first time,"
+        " which starts Blender faster with many Global Buttons."
+        " The storage is saved with the macros last and an index file next to it",
+        update=update_global_lazy_load
+    )
     global_rename: StringProperty(name="Rename", description="Rename the selected Action")
     global_hide_menu: BoolProperty(name="Hide", description="Hide the global Menu")
 
@@ -227,12 +290,12 @@ class AR_preferences(AddonPreferences):
         if os.path.exists(origin_path) and os.path.isfile(origin_path):
             return
         os.makedirs(os.path.dirname(origin_path), exist_ok=True)
-        with open(origin_path, 'w') as storage_file:
-            storage_file.write('{}')
+        functions.create_storage(origin_path)
 
     storage_path: StringProperty(
         name="Storage Path",
-        description="The Path to the Storage for the saved Categories",
+        description="The Path to the Storage for the saved Categories,"
+        " a path ending with .db, .sqlite or .sqlite3 stores them in a SQLite database",
         default=os.path.join(os.path.dirname(os.path.dirname(__file__)), "Storage.json"),
         get=get_storage_path,
         set=set_storage_path
@@ -291,6 +354,11 @@ class AR_preferences(AddonPreferences):
             box_row.label(text=self.storage_path)
             op = box_row.operator('ar.copy_text', text="", icon="COPYDOWN")
             op.text = self.storage_path
+            row = col.row()
+            if functions.database.is_database(self.storage_path):
+                row.operator('ar.preferences_convert_storage', text="Convert to JSON").storage_format = 'JSON'
+            else:
+                row.operator('ar.preferences_convert_storage', text="Convert to SQLite").storage_format = 'SQLITE'
             
             col.separator(factor=1.5)
             row = col.row().split(factor=0.5)
@@ -319,6 +387,9 @@ class AR_preferences(AddonPreferences):
             row2 = col.row(align=True).split(factor=0.7, align=True)
             row2.operator('ar.preferences_open_explorer', text="Open Log").path = log_sys.path
             row2.prop(self, 'log_amount')
+            row = col.row(align=True)
+            row.prop(self, 'profiling')
+            row.operator('ar.preferences_export_profile', text="Export Profile", icon='EXPORT')
             
         elif ActRec_pref.preference_tab == 'keymap':
             col2 = col.column()
@@ -341,9 +412,18 @@ class AR_preferences(AddonPreferences):
             row = col.row()
             row.prop(self, 'auto_update')
             row.prop(self, 'autosave')
+            row.prop(self, 'global_lazy_load')
             row = col.row()
             row.prop(self, 'hide_local_text')
             row.prop(self, 'local_create_empty')
+            row = col.row()
+            row.prop(self, 'local_record_journal')
+            row.prop(self, 'local_record_live')
+            row = col.row()
+            row.prop(self, 'playback_deferred_redraw')
+            row = col.row()
+            row.prop(self, 'playback_time_budget')
+            row.prop(self, 'playback_scheduling', text="")
             if importlib.util.find_spec('fontTools') is None:
                 row = col.row()
                 if self.multiline_support_installing:
@@ -366,6 +446,10 @@ classes = [
 def register():
     for cls in classes:
         bpy.utils.register_class(cls)
+    try:
+        functions.profiling.enabled = get_preferences(bpy.context).profiling
+    except AttributeError:
+        pass
 
 def unregister():
     # Attempt to get pref safely; if this fails, we skip log config update
@@ -13,6 +13,37 @@ from ..functions.shared import get_preferences
 from ..icon_manager import get_icons_name_map, get_icons_value_map, get_custom_icon_name_map, get_custom_icons_value_map
 # endregion
 
+# region Functions
+
+
+def is_valid_id(value, data: dict) -> bool:
+    """
+    checks if the loaded id is a UUID in hex format, which set_id would store unchanged
+
+    Args:
+        value (any): loaded id
+        data (dict): loaded data of the property
+
+    Returns:
+        bool: id can be written directly
+    """
+    return isinstance(value, str) and functions.is_uuid_hex(value)
+
+
+def has_icon_name(value, data: dict) -> bool:
+    """
+    checks if the loaded data contains the icon name, which replaces the icon name set_icon derives from the icon
+
+    Args:
+        value (any): loaded icon
+        data (dict): loaded data of the property
+
+    Returns:
+        bool: icon can be written directly
+    """
+    return 'icon_name' in data
+# endregion
+
 # region PropertyGroups
 
 
@@ -49,8 +80,15 @@ class Id_based:
     # create id by calling get-function of id
     id: StringProperty(get=get_id, set=set_id)
 
+    # properties with setter, that are written directly while loading (see functions.load_collection)
+    # identifier -> (key of the ID property, check of the loaded value or None)
+    raw_load = {'id': ('name', is_valid_id)}
+
 
 class Alert_system:
+    # pointers of all properties that have a registered alert reset timer
+    alert_timers = set()
+
     def get_alert(self) -> bool:
         """
         default Blender property getter
@@ -69,10 +107,23 @@ class Alert_system:
             value (bool): change alert state
         """
         self['alert'] = value
-        if value:
-            def reset() -> None:
-                self['alert'] = False
-            bpy.app.timers.register(reset, first_interval=1, persistent=True)
+        if not value:
+            return
+        pointer = self.as_pointer()
+        if pointer in Alert_system.alert_timers:
+            return
+        Alert_system.alert_timers.add(pointer)
+
+        def reset() -> None:
+            Alert_system.alert_timers.discard(pointer)
+            self.reset_alert()
+        bpy.app.timers.register(reset, first_interval=1, persistent=True)
+
+    def reset_alert(self) -> None:
+        """
+        resets the alert without calling the update
+        """
+        self['alert'] = False
 
     def update_alert(self, context: Context) -> None:
         """
@@ -114,6 +165,8 @@ class Icon_system:
     icon: IntProperty(default=0, set=set_icon, get=get_icon)
     icon_name: StringProperty(default='NONE', set=set_icon_name, get=get_icon_name)
 
+    raw_load = {'icon': ('icon', has_icon_name), 'icon_name': ('icon_name', None)}
+
 
 class AR_macro(Id_based, Alert_system, Icon_system, PropertyGroup):
     def get_active(self) -> bool:
@@ -199,12 +252,23 @@ HINT: Sometimes it helps to change to Invoke to get the expected behavior"""
         description="Indicates whether the parent action executes its macros"
     )
 
+    # the stored state is kept while loading, the availability is still checked by get_active
+    raw_load = {'active': ('active', None)}
+
 
 class AR_action(Id_based, Alert_system, Icon_system):
 
     def get_is_playing(self):
         return self.get("is_playing", False)
 
+    def reset_alert(self) -> None:
+        """
+        resets the alert of the action and its macros without calling the update
+        """
+        self['alert'] = False
+        for macro in self.macros:
+            macro['alert'] = False
+
     def set_is_playing(self, value):
         self["is_playing"] = value
         for macro in self.macros:
@@ -220,7 +284,12 @@ Therefore, the action is executed as many times as there are selected objects.""
                 "STICKY_UVS_DISABLE", 0),
                ("GROUP", "Group",
                 "Performs the current action on all selected objects without separating them (Default Behavior)",
-                "STICKY_UVS_LOC", 1)],
+                "STICKY_UVS_LOC", 1),
+               ("BATCH", "Batch",
+                """Performs the current action on all selected objects individually like "Individual".
+Changes of object properties are applied to all objects at once and only operators are executed per object,
+which is much faster for many selected objects.""",
+                "STICKY_UVS_VERT", 2)],
         name="Execution Mode",
         description="Choses to perform the current actions on the selected objects individually or as a group",
         default="GROUP"
@@ -1,6 +1,16 @@
+from collections import deque
+
+from . import config
+
 # only mutable types define immutable with BlenderProperties
 render_complete_macros = []
 
-tracked_actions = []
+# ring buffer of functions.macros.Tracked_action, only filled while recording
+tracked_actions = deque(maxlen=config.tracked_actions_capacity)
+# amount of tracked actions dropped from the full ring buffer during the recording
+dropped_tracked_actions = 0
+
+# functions.macros.Record_journal while a recording is journaled, otherwise None
+record_journal = None
 
 data_loaded = False
@@ -44,6 +44,9 @@ def draw_global_action(layout: UILayout, ActRec_pref: AR_preferences, id: str) -
     op.id = id
     op = row.operator("ar.global_execute_action", text=action.label)
     op.id = id
+    if action.is_playing:
+        op = row.operator("ar.global_stop", text="", icon='CANCEL')
+        op.id = id
     row.prop(action, 'execution_mode', text="", icon_only=True)
 
 
@@ -0,0 +1,45 @@
+import json
+import time
+import bpy
+from ActRec.actrec.functions.shared import get_preferences
+
+
+def measure(function, *args, repeat: int = 3, **kwargs) -> float:
+    """
+    measures the fastest run of the function in seconds
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def report(name: str, **timings: float) -> None:
+    print("[Benchmark] %s: %s" % (name, ", ".join("%s=%.4fs" % item for item in timings.items())))
+
+
+def event(data: dict) -> str:
+    return "ar.event: %s" % json.dumps(data)
+
+
+def create_local_action(label: str, commands: list[str]):
+    """
+    creates a new local action with a macro for each command
+    """
+    pref = get_preferences(bpy.context)
+    action = pref.local_actions.add()
+    action.id
+    action.label = label
+    for command in commands:
+        macro = action.macros.add()
+        macro.id
+        macro.label = command
+        macro.command = command
+    return action
+
+
+def remove_local_action(action) -> None:
+    pref = get_preferences(bpy.context)
+    pref.local_actions.remove(pref.local_actions.find(action.id))
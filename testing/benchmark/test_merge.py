@@ -0,0 +1,208 @@
+import numpy
+import bpy
+from ActRec.actrec.functions import macros
+from ActRec.actrec.functions.macros import Tracked_action
+from . import helper
+
+STEP_COUNT = 2000
+
+
+def recording(step_count: int) -> tuple[list, list]:
+    """
+    reports and tracked actions of a recording that alternates operators and context changes
+    """
+    reports = []
+    tracked_actions = []
+    for i in range(step_count // 2):
+        size = i % 10 + 1
+        reports.append("bpy.ops.mesh.primitive_cube_add(size=%i, location=(%i, 0, 0))" % (size, i))
+        tracked_actions.append(Tracked_action(
+            True, True, "MESH_OT_primitive_cube_add", {"size": float(size), "location": (float(i), 0.0, 0.0)}
+        ))
+        reports.append("bpy.context.object.location[2] = %i" % i)
+        tracked_actions.append(Tracked_action(True, True, "CONTEXT", 1))
+    return reports, tracked_actions
+
+
+def legacy_compare_fstr_float(fstr: str, fnum: float) -> bool:
+    """
+    string based comparison before the typed report values existed
+    """
+    precision = len(fstr.split(".")[-1])
+    return float(fstr) == round(fnum, precision)
+
+
+def legacy_compare_value(str_value: str, value) -> bool:
+    return (isinstance(value, float) and legacy_compare_fstr_float(str_value, value)
+            or isinstance(value, set) and str_value == str(value)
+            or isinstance(value, bool) and str_value == str(value)
+            or isinstance(value, int) and str_value == str(value)
+            or isinstance(value, str) and str_value[1: -1] == value)
+
+
+def legacy_str_dict_to_dict(obj: str) -> dict:
+    items = obj.strip()[1:-1].split(", ")
+    data = {}
+    last_key = None
+    for item in items:
+        split = item.split(":")
+        if len(split) == 2:
+            key, value = split
+            last_key = key[1:-1]
+            data[last_key] = value
+        else:
+            data[last_key] += ", %s" % split[0]
+    return data
+
+
+def legacy_compare_op_dict(op1_props: dict, op2_props: dict) -> bool:
+    for key, str_value in op1_props.items():
+        value = op2_props.get(key, None)
+        if value is None:
+            return False
+        if "_OT_" in key:
+            if legacy_compare_op_dict(legacy_str_dict_to_dict(str_value), value):
+                continue
+            return False
+        elif isinstance(value, tuple):
+            str_value = str_value[1: -1]
+            if isinstance(value[0], tuple):
+                # switch column and row
+                value = [[value[i][j] for i in range(len(value[0]))] for j in range(len(value))]
+                str_vectors = str_value.replace("(", "").split(")")
+                for str_vec, vec in zip(str_vectors, value):
+                    str_vec = [x for x in str_vec.split(", ") if x]
+                    for str_v, v in zip(str_vec, vec):
+                        if not legacy_compare_value(str_v, v):
+                            return False
+            else:
+                str_vec = [x for x in str_value.split(", ") if x]
+                for str_v, v in zip(str_vec, value):
+                    if not legacy_compare_value(str_v, v):
+                        return False
+        elif not legacy_compare_value(str_value, value):
+            return False
+    return True
+
+
+def legacy_merge_report_tracked(reports: list, tracked_actions: list) -> list[tuple]:
+    """
+    merge before the report tokens and the tracked operator index existed
+    """
+    # create numpy.array for efficient access
+    reports = numpy.array(reports)
+    tracked_actions = numpy.array([list(tracked) for tracked in tracked_actions], dtype=object)
+    data = []
+    len_report = len(reports)
+    len_tracked = len(tracked_actions)
+    report_i = tracked_i = 0
+    last_i = -1
+    # calculate operator
+    continue_report = len_report > report_i
+    continue_tracked = len_tracked > tracked_i
+    tracked = [True, True, "CONTEXT", 1]
+    while continue_report or continue_tracked:
+        if continue_report:
+            report = reports[report_i]
+        if continue_tracked:
+            tracked = tracked_actions[tracked_i]
+        if report.startswith('bpy.ops.'):
+            if last_i != report_i:
+                # clean up reports first before merge with tracked actions!!!
+                op_type, op_name, op_values = macros.split_operator_report(report)
+            last_i = report_i
+            if tracked[2] == "%s_OT_%s" % (op_type.upper(), op_name):
+                if legacy_compare_op_dict(op_values, tracked[3]):
+                    if continue_report:
+                        data.append((1, True, tracked[1], op_type, op_name, op_values))
+                    tracked_i += 1
+                elif not continue_report:  # no reports left use latest report
+                    data.append((
+                        1,
+                        True,
+                        'UNDO' in getattr(getattr(bpy.ops, op_type), op_name).bl_options,
+                        op_type,
+                        op_name,
+                        op_values
+                    ))
+                    break
+                report_i += 1
+            else:
+                if len_tracked <= tracked_i:  # no tracked left but report operator exists
+                    data.append((
+                        1,
+                        True,
+                        'UNDO' in getattr(getattr(bpy.ops, op_type), op_name).bl_options,
+                        op_type,
+                        op_name,
+                        op_values
+                    ))
+                    report_i += 1
+                elif macros.check_tracked_needed(tracked):  # unreported tracked operators to add to reports
+                    tracked_type, tracked_name = tracked[2].split("_OT_")
+                    tracked_type = tracked_type.lower()
+                    data.append((
+                        1,
+                        True,
+                        tracked[1],
+                        tracked_type,
+                        tracked_name,
+                        macros.stringify_values(tracked[3])
+                    ))  # Fake Registered
+                tracked_i += 1
+        elif report.startswith('bpy.context.'):
+            if continue_report:
+                source_path, attribute, value = macros.split_context_report(
+                    report)
+                undo = not (any(x in source_path for x in ("screen", "area", "space_data"))
+                            or all(x in attribute for x in ("active", "index")))  # exclude index set of UIList
+                data.append((0, True, undo, source_path, attribute, value))
+                report_i += 1
+            if tracked[2] == 'CONTEXT':
+                tracked[3] -= 1
+            tracked_i += (tracked[2] == 'CONTEXT' and tracked[3] == 0) or (not continue_report or not tracked[0])
+        else:
+            report_i += 1
+            if not continue_report:
+                break
+
+        continue_report = len_report > report_i
+        continue_tracked = len_tracked > tracked_i
+    return data
+
+
+def test_merge_recording():
+    reports, tracked_actions = recording(STEP_COUNT)
+    assert macros.merge_report_tracked(reports, tracked_actions) == legacy_merge_report_tracked(
+        reports, tracked_actions)
+    legacy = helper.measure(legacy_merge_report_tracked, reports, tracked_actions)
+    merged = helper.measure(macros.merge_report_tracked, reports, tracked_actions)
+    helper.report("merge %i recorded steps" % STEP_COUNT, legacy=legacy, merge=merged)
+
+
+def test_compare_transform_values():
+    report = (
+        "bpy.ops.transform.translate(value=(0.5, 1.25, 0), orient_type='GLOBAL', "
+        "orient_matrix=((1, 0, 0), (0, 1, 0), (0, 0, 1)), orient_matrix_type='GLOBAL', "
+        "constraint_axis=(True, True, False), mirror=False, use_proportional_edit=False)"
+    )
+    values = {
+        "value": (0.5, 1.25, 0.0), "orient_type": "GLOBAL",
+        "orient_matrix": ((1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (0.0, 0.0, 1.0)), "orient_matrix_type": "GLOBAL",
+        "constraint_axis": (True, True, False), "mirror": False, "use_proportional_edit": False
+    }
+    report_values = macros.split_operator_report(report)[2]
+    parsed_values = macros.parse_report_values(report_values)
+    assert legacy_compare_op_dict(report_values, values)
+    assert macros.compare_report_values(parsed_values, values)
+
+    def legacy():
+        for _ in range(STEP_COUNT):
+            legacy_compare_op_dict(report_values, values)
+
+    def typed():
+        for _ in range(STEP_COUNT):
+            macros.compare_report_values(parsed_values, values)
+
+    helper.report(
+        "compare %i transform reports" % STEP_COUNT, legacy=helper.measure(legacy), typed=helper.measure(typed))
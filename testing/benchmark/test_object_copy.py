@@ -0,0 +1,45 @@
+import pytest
+import bpy
+from ActRec.actrec.functions import macros
+from . import helper
+
+
+def legacy_copy_of_object(data: dict, obj, attribute: str, depth=5) -> dict:
+    """
+    copy of an object before the attribute index existed, every pointer and collection is walked
+    """
+    if not (depth and obj):
+        return data
+    if hasattr(obj, attribute):
+        return {attribute: macros.convert_value_to_python(getattr(obj, attribute))}
+    if not hasattr(obj, 'bl_rna'):
+        return data
+    for prop in obj.bl_rna.properties[1:]:
+        if not (prop.type == 'COLLECTION' or prop.type == 'POINTER'):
+            continue
+        sub_obj = getattr(obj, prop.identifier)
+        if obj == sub_obj:
+            continue
+        res = legacy_copy_of_object({}, sub_obj, attribute, depth - 1)
+        if res == {}:
+            continue
+        data[prop.identifier] = res
+    return data
+
+
+@pytest.mark.parametrize("attribute", ["use_paint_mask", "bevel_depth"])
+def test_object_copy(attribute):
+    if bpy.context.object is None:
+        bpy.ops.mesh.primitive_cube_add()
+    obj = bpy.context.object
+
+    def legacy():
+        return legacy_copy_of_object({}, obj, attribute)
+
+    def indexed():
+        return macros.get_copy_of_object({}, obj, attribute)
+
+    assert legacy() == indexed()
+    legacy_time = helper.measure(legacy)
+    indexed_time = helper.measure(indexed)
+    helper.report("copy of object for %s" % attribute, legacy=legacy_time, indexed=indexed_time)
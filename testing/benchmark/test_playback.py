@@ -0,0 +1,70 @@
+import json
+import pytest
+import bpy
+from ActRec.actrec.functions import shared, playback
+from ActRec.actrec.functions.shared import get_preferences
+from . import helper
+
+LOOP_COUNT = 10000
+
+
+@pytest.fixture(scope="function")
+def looped_action():
+    action = helper.create_local_action("Benchmark Loop", [
+        helper.event({'Type': 'Loop', 'StatementType': 'repeat', 'RepeatCount': LOOP_COUNT}),
+        "bpy.context.scene.render.resolution_percentage = 100",
+        "bpy.context.scene.render.use_border = False",
+        helper.event({'Type': 'EndLoop'})
+    ])
+    yield action
+    helper.remove_local_action(action)
+
+
+def legacy_parse(macros) -> None:
+    """
+    parsing work that was done for every loop iteration before the playback plan existed
+    """
+    for _ in range(LOOP_COUNT):
+        for macro in macros:
+            split = macro.command.split(":")
+            if split[0] == 'ar.event':
+                json.loads(":".join(split[1:]))
+            else:
+                compile(macro.command.replace("bpy.context.", "context."), "<string>", "exec")
+
+
+def test_play_looped_action(looped_action):
+    context = bpy.context
+    macros = looped_action.macros
+
+    def play_cold():
+        playback.clear_plans()
+        assert shared.play(context, macros, looped_action, 'local_actions') is None
+
+    def play_warm():
+        assert shared.play(context, macros, looped_action, 'local_actions') is None
+
+    cold = helper.measure(play_cold)
+    warm = helper.measure(play_warm)
+    parse = helper.measure(legacy_parse, macros, repeat=1)
+    helper.report("play %i loop iterations" % LOOP_COUNT, cold=cold, warm=warm, legacy_parse_only=parse)
+    assert warm < cold + parse
+
+
+def test_play_deferred_redraw(looped_action):
+    context = bpy.context
+    macros = looped_action.macros
+    preferences = get_preferences(context)
+    default = preferences.playback_deferred_redraw
+
+    def play():
+        assert shared.play(context, macros, looped_action, 'local_actions') is None
+
+    try:
+        preferences.playback_deferred_redraw = False
+        immediate = helper.measure(play)
+        preferences.playback_deferred_redraw = True
+        deferred = helper.measure(play)
+    finally:
+        preferences.playback_deferred_redraw = default
+    helper.report("redraw %i loop iterations" % LOOP_COUNT, immediate=immediate, deferred=deferred)
@@ -0,0 +1,64 @@
+import pytest
+import bpy
+from ActRec.actrec.functions import macros
+from . import helper
+
+REPORT_COUNT = 10000
+NEW_REPORT_COUNT = 20
+
+
+class BENCHMARK_OT_report(bpy.types.Operator):
+    bl_idname = "benchmark.report"
+    bl_label = "Benchmark Report"
+
+    def execute(self, context):
+        self.report({'INFO'}, "bpy.context.scene.frame_current = 1")
+        return {'FINISHED'}
+
+
+@pytest.fixture(scope="module")
+def reports():
+    bpy.utils.register_class(BENCHMARK_OT_report)
+    for _ in range(REPORT_COUNT):
+        bpy.ops.benchmark.report()
+    yield
+    bpy.utils.unregister_class(BENCHMARK_OT_report)
+
+
+def legacy_report_text(context) -> str:
+    """
+    copy of all reports through the clipboard, done at record start and stop before the report cursor existed
+    """
+    with context.temp_override():
+        area_type = context.area.type
+        clipboard_data = context.window_manager.clipboard
+        context.area.type = 'INFO'
+        bpy.ops.info.select_all(action='SELECT')
+        bpy.ops.info.report_copy()
+        bpy.ops.info.select_all(action='DESELECT')
+        report_text = context.window_manager.clipboard
+        context.area.type = area_type
+        context.window_manager.clipboard = clipboard_data
+    return report_text
+
+
+@pytest.mark.skipif(not bpy.context.window_manager.windows, reason="the Info editor needs a window")
+def test_record_reports(reports):
+    context = bpy.context
+
+    def legacy():
+        start = legacy_report_text(context).count('\n')
+        for _ in range(NEW_REPORT_COUNT):
+            bpy.ops.benchmark.report()
+        return legacy_report_text(context).splitlines()[start:]
+
+    def cursor():
+        start = macros.get_report_count(context)
+        for _ in range(NEW_REPORT_COUNT):
+            bpy.ops.benchmark.report()
+        return macros.get_report_text(context, start).splitlines()
+
+    assert legacy() == cursor()
+    legacy_time = helper.measure(legacy)
+    cursor_time = helper.measure(cursor)
+    helper.report("record %i of %i reports" % (NEW_REPORT_COUNT, REPORT_COUNT), legacy=legacy_time, cursor=cursor_time)
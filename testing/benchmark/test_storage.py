@@ -0,0 +1,175 @@
+import pytest
+import bpy
+from ActRec.actrec.functions import shared, globals, database
+from ActRec.actrec.functions.shared import get_preferences
+from . import helper
+
+ACTION_COUNT = 500
+MACRO_COUNT = 100
+
+
+@pytest.fixture(scope="module")
+def global_actions():
+    pref = get_preferences(bpy.context)
+    actions = []
+    for i in range(ACTION_COUNT):
+        action = pref.global_actions.add()
+        action.id
+        action.label = "Benchmark %i" % i
+        for j in range(MACRO_COUNT):
+            macro = action.macros.add()
+            macro.id
+            macro.label = "Macro %i" % j
+            macro.command = "bpy.context.scene.frame_current = %i" % j
+        actions.append(action.id)
+    yield actions
+    for id in actions:
+        index = pref.global_actions.find(id)
+        if index != -1:
+            pref.global_actions.remove(index)
+
+
+def legacy_property_to_python(property, exclude: list = [], depth: int = 5):
+    """
+    copy of property_to_python before the serializers were compiled, every value is inspected
+    """
+    if hasattr(property, "bl_rna") and property.bl_rna.identifier == "AR_preferences":
+        return "Preferences Object (Skipped to prevent loop)"
+    if depth <= 0:
+        return "max depth"
+    if isinstance(property, set):
+        return list(property)
+    if not hasattr(property, 'id_data'):
+        return property
+    if property == property.id_data:
+        return property
+    class_name = property.__class__.__name__
+    if class_name == 'bpy_prop_collection_idprop':
+        return [legacy_property_to_python(item, exclude, depth) for item in property]
+    if class_name == 'bpy_prop_collection':
+        if hasattr(property, "bl_rna"):
+            data = legacy_pointer_property_as_dict(property, exclude, depth)
+            data["items"] = [legacy_property_to_python(item, exclude, depth) for item in property]
+            return data
+        return [legacy_property_to_python(item, exclude, depth) for item in property]
+    if class_name == 'bpy_prop_array':
+        return [legacy_property_to_python(item, exclude, depth) for item in property]
+    return legacy_pointer_property_as_dict(property, exclude, depth)
+
+
+def legacy_pointer_property_as_dict(property, exclude: list, depth: int) -> dict:
+    main_exclude, sub_exclude = shared.split_exclude(exclude)
+    data = {}
+    for attr in property.bl_rna.properties[1:]:
+        identifier = attr.identifier
+        if identifier in main_exclude:
+            continue
+        data[identifier] = legacy_property_to_python(
+            getattr(property, identifier),
+            sub_exclude.get(identifier, []),
+            depth - 1
+        )
+    return data
+
+
+def test_serialize_global_actions(global_actions):
+    pref = get_preferences(bpy.context)
+
+    def legacy():
+        return [legacy_property_to_python(action, globals.ACTION_EXCLUDE) for action in pref.global_actions]
+
+    def compiled():
+        return [shared.property_to_python(action, globals.ACTION_EXCLUDE) for action in pref.global_actions]
+
+    assert legacy() == compiled()
+    legacy_time = helper.measure(legacy)
+    compiled_time = helper.measure(compiled)
+    helper.report(
+        "serialize %i global actions with %i macros" % (ACTION_COUNT, ACTION_COUNT * MACRO_COUNT),
+        legacy=legacy_time,
+        compiled=compiled_time
+    )
+
+
+def test_load_global_actions(global_actions):
+    pref = get_preferences(bpy.context)
+    data = [shared.property_to_python(action, globals.ACTION_EXCLUDE) for action in pref.global_actions]
+
+    def legacy():
+        pref.global_actions.clear()
+        shared.apply_data_to_item(pref.global_actions, data)
+
+    def bulk():
+        pref.global_actions.clear()
+        shared.load_collection(pref.global_actions, data)
+
+    legacy()
+    legacy_data = [shared.property_to_python(action, globals.ACTION_EXCLUDE) for action in pref.global_actions]
+    bulk()
+    assert legacy_data == [shared.property_to_python(action, globals.ACTION_EXCLUDE) for action in pref.global_actions]
+    legacy_time = helper.measure(legacy)
+    bulk_time = helper.measure(bulk)
+    helper.report(
+        "load %i global actions with %i macros" % (ACTION_COUNT, ACTION_COUNT * MACRO_COUNT),
+        legacy=legacy_time,
+        bulk=bulk_time
+    )
+
+
+def test_lazy_load_global_actions(global_actions, tmp_path):
+    pref = get_preferences(bpy.context)
+    storage_path = pref.storage_path
+    lazy_load = pref.global_lazy_load
+    pref.storage_path = str(tmp_path / "Storage.json")
+    globals.save(pref, full=True, immediate=True)
+
+    def load(lazy: bool):
+        pref.global_lazy_load = lazy
+        globals.load(pref)
+
+    load(True)
+    for action in pref.global_actions:
+        globals.load_macros(action)
+    lazy_data = [shared.property_to_python(action, globals.ACTION_EXCLUDE) for action in pref.global_actions]
+    load(False)
+    assert lazy_data == [shared.property_to_python(action, globals.ACTION_EXCLUDE) for action in pref.global_actions]
+    eager_time = helper.measure(load, False)
+    lazy_time = helper.measure(load, True)
+    helper.report(
+        "load storage with %i global actions and %i macros" % (ACTION_COUNT, ACTION_COUNT * MACRO_COUNT),
+        eager=eager_time,
+        lazy=lazy_time
+    )
+    pref.global_lazy_load = lazy_load
+    pref.storage_path = storage_path
+    globals.load(pref)
+
+
+def test_database_storage(global_actions, tmp_path):
+    pref = get_preferences(bpy.context)
+    data = {'actions': [shared.property_to_python(action, globals.ACTION_EXCLUDE) for action in pref.global_actions]}
+    json_path = str(tmp_path / "Storage.json")
+    database_path = str(tmp_path / "Storage.db")
+    globals.write_storage(json_path, data)
+    globals.write_storage(database_path, data)
+    assert globals.read_storage(json_path) == globals.read_storage(database_path)
+    id = global_actions[ACTION_COUNT // 2]
+
+    def json_action():
+        return next(action for action in globals.read_storage(json_path)['actions'] if action['id'] == id)
+
+    def database_action():
+        return database.read_action(database_path, id)
+
+    assert json_action() == database_action()
+    helper.report(
+        "read storage with %i macros" % (ACTION_COUNT * MACRO_COUNT),
+        json=helper.measure(globals.read_storage, json_path),
+        database=helper.measure(globals.read_storage, database_path)
+    )
+    helper.report("read a single action", json=helper.measure(json_action), database=helper.measure(database_action))
+    helper.report(
+        "write storage with %i macros" % (ACTION_COUNT * MACRO_COUNT),
+        json=helper.measure(globals.write_storage, json_path, data),
+        database=helper.measure(globals.write_storage, database_path, data)
+    )
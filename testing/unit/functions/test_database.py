@@ -0,0 +1,38 @@
+from ActRec.actrec.functions import database
+
+
+def test_is_database():
+    assert database.is_database("Storage.db")
+    assert database.is_database("Storage.SQLite")
+    assert not database.is_database("Storage.json")
+
+
+def test_write_database(tmp_path):
+    path = str(tmp_path / "Storage.db")
+    macros = [{"id": "m", "command": "bpy.ops.mesh.subdivide()", "label": "ü"}]
+    categories = [{"id": "c", "label": "C", "actions": [{"id": "a"}, {"id": "b"}]}]
+    database.write_database(path, categories, [("a", {"id": "a", "label": "A"}, macros), ("b", {"id": "b"}, [])])
+    assert database.read_database(path) == {
+        "categories": categories,
+        "actions": [{"id": "a", "label": "A", "macros": macros}, {"id": "b", "macros": []}]
+    }
+    database.write_database(path, [], [("b", {"id": "b"}, []), ("a", {"id": "a", "label": "B"}, None)])
+    assert database.read_database(path, macros=False) == {"actions": [{"id": "b"}, {"id": "a", "label": "B"}]}
+    assert database.read_action(path, "a") == {"id": "a", "label": "B", "macros": macros}
+    database.write_database(path, [], [("a", {"id": "a"}, None)])
+    assert database.read_action(path, "b") is None
+
+
+def test_write_database_changed(tmp_path):
+    path = str(tmp_path / "Storage.db")
+    categories = [{"id": "c", "label": "C"}, {"id": "d", "label": "D"}]
+    actions = [("a", {"id": "a", "label": "A"}, []), ("b", {"id": "b", "label": "B"}, [])]
+    database.write_database(path, categories, actions)
+    # unchanged entries only get their new position, even if their data differs
+    categories = [{"id": "d", "label": "E"}, {"id": "c", "label": "F"}]
+    actions = [("b", {"id": "b", "label": "G"}, None), ("a", {"id": "a", "label": "H"}, None)]
+    database.write_database(path, categories, actions, {"c"}, {"a"})
+    assert database.read_database(path) == {
+        "categories": [{"id": "d", "label": "D"}, {"id": "c", "label": "F"}],
+        "actions": [{"id": "b", "label": "B", "macros": []}, {"id": "a", "label": "H", "macros": []}]
+    }
@@ -0,0 +1,121 @@
+import json
+from types import SimpleNamespace
+from ActRec.actrec.functions import globals
+
+
+def test_write_storage(tmp_path):
+    path = tmp_path / "Storage.json"
+    path.write_text("{}")
+    globals.write_storage(str(path), {"categories": [], "actions": [{"label": "ä"}]})
+    assert json.loads(path.read_text(encoding='utf-8')) == {"categories": [], "actions": [{"label": "ä"}]}
+    assert sorted(file.name for file in tmp_path.iterdir()) == ["Storage.index.json", "Storage.json"]
+    assert globals.read_storage_index(str(path))["actions"] == [{"label": "ä"}]
+
+
+def test_write_storage_without_index(tmp_path):
+    path = tmp_path / "Storage.json"
+    globals.write_storage(str(path), {"categories": [], "actions": [{"label": "A"}]})
+    macros = [{"id": "b", "command": "bpy.ops.mesh.subdivide()"}]
+    source = globals.Macro_source("a", str(path), data=macros)
+    data = {"actions": [{"id": "a", "macros": source, "label": "A"}]}
+    globals.write_storage(str(path), data, index=False)
+    assert path.read_text(encoding='utf-8') == json.dumps(
+        {"actions": [{"id": "a", "macros": macros, "label": "A"}]}, indent=2)
+    assert [file.name for file in tmp_path.iterdir()] == ["Storage.json"]
+
+
+def test_encode_storage():
+    macros = [{"id": "b", "command": "bpy.ops.mesh.subdivide()", "label": "ü\nx"}]
+    data = {
+        "categories": [{"id": "c", "actions": [{"id": "a"}]}],
+        "actions": [{"id": "a", "label": "A", "macros": macros}, {"id": "e", "macros": []}]
+    }
+    content, spans = globals.encode_storage(data)
+    assert content.decode('utf-8') == json.dumps(data, ensure_ascii=False, indent=2)
+    offset, length = spans["a"]
+    assert json.loads(content[offset: offset + length]) == macros
+
+
+def test_macro_source(tmp_path):
+    path = str(tmp_path / "Storage.json")
+    macros = [{"id": "b", "command": "bpy.ops.mesh.subdivide()"}]
+    source = globals.Macro_source("a", path, data=macros)
+    globals.write_storage(path, {"categories": [], "actions": [{"id": "a", "label": "A", "macros": source}]})
+    assert source.data is None
+    assert source.read() == macros
+    globals.write_storage(path, {"categories": [], "actions": [{"id": "a", "label": "B", "macros": source}]})
+    assert source.read() == macros
+    with open(path, 'w', encoding='utf-8') as storage_file:
+        json.dump({"actions": [{"macros": [], "id": "a"}]}, storage_file)
+    assert source.read() == []
+    assert globals.read_storage_index(path) is None
+
+
+def test_serialize_entries(monkeypatch):
+    serialized = []
+
+    def property_to_python(item, exclude):
+        serialized.append(item.id)
+        return {"id": item.id, "label": item.label}
+
+    monkeypatch.setattr(globals.shared, "property_to_python", property_to_python)
+    monkeypatch.setitem(globals.storage_cache, "actions", {})
+    monkeypatch.setitem(globals.dirty_ids, "actions", None)
+    actions = [SimpleNamespace(id="a", label="A"), SimpleNamespace(id="b", label="B")]
+    assert globals.serialize_entries(actions, "actions", []) == (
+        [{"id": "a", "label": "A"}, {"id": "b", "label": "B"}], None)
+    actions[1].label = "C"
+    globals.mark_dirty(actions=["b"])
+    actions.reverse()
+    assert globals.serialize_entries(actions, "actions", []) == (
+        [{"id": "b", "label": "C"}, {"id": "a", "label": "A"}], {"b"})
+    assert serialized == ["a", "b", "b"]
+
+
+def test_database_storage(tmp_path):
+    json_path = str(tmp_path / "Storage.json")
+    database_path = str(tmp_path / "Storage.db")
+    macros = [{"id": "b", "command": "bpy.ops.mesh.subdivide()"}]
+    data = {
+        "categories": [{"id": "c", "actions": [{"id": "a"}]}],
+        "actions": [{"id": "a", "label": "A", "macros": macros}]
+    }
+    globals.write_storage(json_path, data)
+    globals.create_storage(database_path)
+    assert globals.read_storage(database_path) == {}
+    source = globals.Macro_source("a", json_path, globals.read_storage_index(json_path)["macros"]["a"],
+                                  globals.get_stamp(json_path))
+    globals.write_storage(database_path, {"categories": data["categories"], "actions": [
+        {"id": "a", "label": "A", "macros": source}
+    ]})
+    assert source.path == database_path
+    assert globals.read_storage(database_path) == data
+    globals.write_storage(database_path, {"categories": [], "actions": [{"id": "a", "label": "B", "macros": source}]})
+    assert source.read() == macros
+    globals.write_storage(json_path, {"actions": [{"id": "a", "label": "B", "macros": source}]})
+    assert globals.read_storage(json_path) == {"actions": [{"id": "a", "label": "B", "macros": macros}]}
+
+
+def test_overwrite_import(monkeypatch):
+    class Item(SimpleNamespace):
+        def get(self, key, default=None):
+            return default
+
+    def property_to_python(item, exclude):
+        return {"id": item.id, "label": item.label}
+
+    def load_collection(collection, data):
+        collection.extend(Item(**entry) for entry in data)
+
+    monkeypatch.setattr(globals.shared, "property_to_python", property_to_python)
+    monkeypatch.setattr(globals.shared, "load_collection", load_collection)
+    monkeypatch.setattr(globals.ui_functions, "register_category", lambda pref, i: None)
+    monkeypatch.setattr(globals.ui_functions, "unregister_category", lambda pref, i: None)
+    monkeypatch.setitem(globals.storage_cache, "actions", {})
+    monkeypatch.setitem(globals.dirty_ids, "actions", None)
+    pref = SimpleNamespace(categories=[], global_actions=[])
+    globals.import_global_from_dict(pref, {"actions": [{"id": "a", "label": "A", "selected": False}]})
+    assert globals.serialize_entries(pref.global_actions, "actions", [])[0] == [{"id": "a", "label": "A"}]
+    globals.clear_global_actions(pref)
+    globals.import_global_from_dict(pref, {"actions": [{"id": "a", "label": "B", "selected": False}]})
+    assert globals.serialize_entries(pref.global_actions, "actions", [])[0] == [{"id": "a", "label": "B"}]
@@ -0,0 +1,215 @@
+import contextlib
+from collections import deque
+import pytest
+from ActRec.actrec.functions import macros
+from ActRec.actrec.functions.macros import Tracked_action
+
+
+def tracked(bl_idname: str, data=None) -> Tracked_action:
+    if bl_idname == "CONTEXT":
+        return Tracked_action(True, True, "CONTEXT", data)
+    return Tracked_action(True, True, bl_idname, {} if data is None else data)
+
+
+@pytest.mark.parametrize(
+    "reports, tracked_actions, output",
+    [
+        # reported operator
+        (["bpy.ops.object.shade_smooth()"],
+         [tracked("OBJECT_OT_shade_smooth")],
+         [(1, True, True, "object", "shade_smooth", {})]),
+        # operator changed in the redo panel, only the final report is kept
+        (["bpy.ops.mesh.primitive_cube_add(size=2)", "bpy.ops.mesh.primitive_cube_add(size=3)"],
+         [tracked("MESH_OT_primitive_cube_add", {"size": 3.0})],
+         [(1, True, True, "mesh", "primitive_cube_add", {"size": "3"})]),
+        # context changes
+        (["bpy.context.object.location[0] = 1", "bpy.context.space_data.show_gizmo = False"],
+         [tracked("CONTEXT", 2)],
+         [(0, True, True, ["object"], "location[0]", "1"),
+          (0, True, False, ["space_data"], "show_gizmo", "False")]),
+        # tracked operator that isn't reported by Blender
+        (["bpy.ops.object.shade_smooth()"],
+         [tracked("MESH_OT_separate", {"type": "SELECTED"}), tracked("OBJECT_OT_shade_smooth")],
+         [(1, True, True, "mesh", "separate", {"type": "'SELECTED'"}),
+          (1, True, True, "object", "shade_smooth", {})]),
+        # tracked operator that isn't reported after the last report
+        (["bpy.context.object.location[0] = 1"],
+         [tracked("CONTEXT", 1), tracked("MESH_OT_separate", {"type": "LOOSE"})],
+         [(0, True, True, ["object"], "location[0]", "1"),
+          (1, True, True, "mesh", "separate", {"type": "'LOOSE'"})]),
+        # untracked operator keeps the tracked actions for the following reports
+        (["bpy.ops.object.select_all(action='SELECT')", "bpy.ops.object.shade_smooth()",
+          "bpy.context.object.location[0] = 1"],
+         [tracked("OBJECT_OT_shade_smooth"), tracked("CONTEXT", 1)],
+         [(1, True, True, "object", "select_all", {"action": "'SELECT'"}),
+          (1, True, True, "object", "shade_smooth", {}),
+          (0, True, True, ["object"], "location[0]", "1")]),
+        # reports that aren't macros
+        (["Info: Deleted 1 object(s)"], [], []),
+        # the last report doesn't match its tracked operator, e.g. a pointer value, and is kept
+        (["bpy.ops.object.shade_smooth()", "bpy.ops.object.parent_set(type='OBJECT', keep_transform=True)"],
+         [tracked("OBJECT_OT_shade_smooth"), tracked("OBJECT_OT_parent_set", {"type": "OBJECT"})],
+         [(1, True, True, "object", "shade_smooth", {}),
+          (1, True, True, "object", "parent_set", {"type": "'OBJECT'", "keep_transform": "True"})])
+    ]
+)
+def test_merge_report_tracked(reports, tracked_actions, output):
+    assert macros.merge_report_tracked(reports, tracked_actions) == output
+
+
+@pytest.mark.parametrize(
+    "report_values, values, output",
+    [
+        ({"size": "2"}, {"size": 2.0}, True),
+        ({"size": "2.00001"}, {"size": 2.0000099}, True),
+        ({"size": "2.1"}, {"size": 2.0}, False),
+        ({"use_global": "False"}, {"use_global": False}, True),
+        ({"use_global": "0"}, {"use_global": False}, False),
+        ({"action": "'SELECT'"}, {"action": "SELECT"}, True),
+        ({"type": "{'X', 'Y'}"}, {"type": {"Y", "X"}}, True),
+        ({"value": "(0, 0, 1.5)"}, {"value": (0.0, 0.0, 1.5)}, True),
+        ({"value": "(0, 0)"}, {"value": (0.0, 0.0, 0.0)}, False),
+        ({"orient_matrix": "((1, 0, 0), (2, 1, 0), (0, 0, 1))"},
+         {"orient_matrix": ((1.0, 2.0, 0.0), (0.0, 1.0, 0.0), (0.0, 0.0, 1.0))}, True),
+        ({"TRANSFORM_OT_translate": "{\"value\":(0, 0, 1), \"orient_type\":'GLOBAL'}"},
+         {"TRANSFORM_OT_translate": {"value": (0.0, 0.0, 1.0), "orient_type": "GLOBAL"}}, True),
+        ({"weights": str(tuple(range(40)))}, {"weights": tuple(float(i) for i in range(40))}, True),
+        ({"weights": str(tuple(range(40)))}, {"weights": tuple(float(i) for i in range(1, 41))}, False),
+        ({"target": "bpy.data.objects['Cube']"}, {"target": None}, False),
+        ({"missing": "1"}, {}, False)
+    ]
+)
+def test_compare_op_dict(report_values, values, output):
+    assert macros.compare_op_dict(report_values, values) == output
+
+
+class Modifier:
+    def __init__(self, levels: int) -> None:
+        self.levels = levels
+
+
+class Modifiers:
+    def __init__(self, *modifiers: Modifier) -> None:
+        for i, modifier in enumerate(modifiers):
+            setattr(self, "modifier_%i" % i, modifier)
+
+
+@pytest.mark.parametrize(
+    "before, after, value, output",
+    [
+        # the copy before the change is compared with the copy after the change
+        ({"modifier_0": {"levels": 2}, "modifier_1": {"levels": 2}},
+         {"modifier_0": {"levels": 2}, "modifier_1": {"levels": 3}},
+         "3", "object.modifier_1"),
+        # without a copy before the change the reported value is searched
+        (None,
+         {"modifier_0": {"levels": 2}, "modifier_1": {"levels": 3}},
+         "3", "object.modifier_1"),
+        # nothing changed
+        ({"modifier_0": {"levels": 2}}, {"modifier_0": {"levels": 2}}, "2", None),
+    ]
+)
+def test_compare_copy_report(before, after, value, output):
+    obj = Modifiers(Modifier(2), Modifier(3))
+    res = macros.compare_copy_report(obj, before, after, ["object"], "levels", value)
+    assert (res and res[1]) == output
+
+
+class Context:
+    def __init__(self) -> None:
+        self.active_modifier = Modifier(1)
+        self.button_pointer = Modifiers()
+        self.modifiers = Modifiers(self.active_modifier)
+        self.object = None
+
+
+def test_map_context_classes():
+    class_map = macros.map_context_classes(Context())
+    assert class_map[Modifier] == "active_modifier"
+    assert class_map[Modifiers] == "modifiers"
+    assert class_map[type(None)] == "object"
+
+
+def test_context_attribute_new_member():
+    context = Context()
+    context.active_modifier = None
+    assert macros.get_context_attribute(context, Modifier) is None
+    # the first modifier is added while recording
+    context.active_modifier = Modifier(1)
+    assert macros.get_context_attribute(context, Modifier) == "active_modifier"
+
+
+def test_merge_in_parts():
+    reports = ["bpy.ops.object.shade_smooth()", "bpy.context.object.location[0] = 1", "bpy.ops.object.shade_flat()"]
+    tracked_actions = [
+        tracked("OBJECT_OT_shade_smooth"),
+        tracked("CONTEXT", 1),
+        tracked("MESH_OT_separate", {"type": "LOOSE"}),
+        tracked("OBJECT_OT_shade_flat")
+    ]
+    merger = macros.Report_merger()
+    parts = merger.merge(reports[:1], tracked_actions, final=False)
+    parts += merger.merge(reports[1:], tracked_actions)
+    assert parts == macros.merge_report_tracked(reports, tracked_actions)
+    assert merger.tracked_i == len(tracked_actions)
+
+
+class Property:
+    def __init__(self, default_array: tuple, array_dimensions: tuple, subtype: str = 'NONE') -> None:
+        self.type = 'FLOAT'
+        self.is_array = True
+        self.default_array = default_array
+        self.array_dimensions = array_dimensions
+        self.subtype = subtype
+
+
+@pytest.mark.parametrize(
+    "prop, output",
+    [
+        (Property((1, 2, 3), (3, 0, 0)), (True, (1, 2, 3))),
+        # stored by column, converted by row
+        (Property((1, 2, 3, 4), (2, 2, 0), 'MATRIX'), (True, ((1, 3), (2, 4)))),
+        (Property((1, 2, 3, 4, 5, 6), (2, 3, 0)), (True, ((1, 2, 3), (4, 5, 6)))),
+        (Property((0,) * 8, (2, 2, 2)), (False, None)),
+    ]
+)
+def test_get_property_default(prop, output):
+    assert macros.get_property_default(prop) == output
+
+
+def test_operator_snapshot():
+    snapshot = macros.Operator_snapshot({"size": 3.0}, {"size": 2.0, "align": 'WORLD'})
+    assert snapshot.get("size") == 3.0
+    assert snapshot.get("align") == 'WORLD'
+    assert snapshot["align"] == 'WORLD'
+    assert snapshot.get("location") is None
+    assert snapshot == {"size": 3.0}
+    assert macros.compare_op_dict({"size": "3", "align": "'WORLD'"}, snapshot)
+
+
+def test_record_journal_read_reports(monkeypatch):
+    reports = ["bpy.context.object.location[0] = 1", "bpy.context.object.location[0] = 2",
+               "bpy.context.scene.frame_end = 3"]
+    copies = iter([{"a": 1}, {"b": 2}])
+    monkeypatch.setattr(macros, "info_area_override", contextlib.nullcontext)
+    monkeypatch.setattr(macros, "report_exists", lambda index: True)
+    monkeypatch.setattr(macros, "count_reports", lambda start: start + len(reports))
+    monkeypatch.setattr(macros, "get_report_text", lambda context, start, stop: "\n".join(reports))
+    monkeypatch.setattr(macros, "get_id_object", lambda context, source_path, attribute: object())
+    monkeypatch.setattr(macros, "get_copy_of_object", lambda copy, obj, attribute: next(copies))
+    journal = macros.Record_journal(5)
+    assert journal.read_reports(None) == reports
+    assert journal.cursor == 8
+    # the first change of the location is read together with the second one, so it has no copies
+    assert journal.pop(["object"], "location[0]") is None
+    assert journal.pop(["object"], "location[0]") == macros.Journal_entry(None, {"a": 1})
+    assert journal.pop(["scene"], "frame_end") == macros.Journal_entry(None, {"b": 2})
+
+
+def test_append_tracked_action(monkeypatch):
+    monkeypatch.setattr(macros.shared_data, "tracked_actions", deque(maxlen=2))
+    monkeypatch.setattr(macros.shared_data, "dropped_tracked_actions", 0)
+    for i in range(3):
+        macros.append_tracked_action(tracked("CONTEXT", i))
+    assert list(macros.shared_data.tracked_actions) == [tracked("CONTEXT", 1), tracked("CONTEXT", 2)]
+    assert macros.shared_data.dropped_tracked_actions == 1
@@ -0,0 +1,253 @@
+import json
+import linecache
+import pytest
+import bpy
+from ActRec.actrec.functions import playback
+
+
+def event(data: dict) -> str:
+    return "ar.event: %s" % json.dumps(data)
+
+
+def signature(*commands, inactive=()) -> tuple:
+    return tuple(
+        ("%032x" % i, command, i not in inactive, "EXEC_DEFAULT", "")
+        for i, command in enumerate(commands)
+    )
+
+
+@pytest.mark.parametrize(
+    "commands, jumps",
+    [
+        ((event({'Type': 'Loop', 'StatementType': 'repeat', 'RepeatCount': 2}),
+          "bpy.ops.object.shade_smooth()",
+          event({'Type': 'EndLoop'})),
+         [2, None, 0]),
+        ((event({'Type': 'Loop', 'StatementType': 'repeat', 'RepeatCount': 2}),
+          event({'Type': 'Loop', 'StatementType': 'repeat', 'RepeatCount': 2}),
+          "bpy.ops.object.shade_smooth()",
+          event({'Type': 'EndLoop'}),
+          event({'Type': 'EndLoop'})),
+         [4, 3, None, 1, 0]),
+        ((event({'Type': 'Loop', 'StatementType': 'repeat', 'RepeatCount': 2}),
+          "bpy.ops.object.shade_smooth()"),
+         [None, None]),
+        ((event({'Type': 'EndLoop'}),
+          "bpy.ops.object.shade_smooth()"),
+         [None, None])
+    ]
+)
+def test_plan_loop_jumps(commands, jumps):
+    plan = playback.Playback_plan(signature(*commands))
+    assert [step.jump for step in plan.steps] == jumps
+
+
+def test_remove_plan(monkeypatch):
+    monkeypatch.setattr(playback, "plans", {})
+    plan = playback.Playback_plan(signature("bpy.ops.object.shade_smooth()"))
+    playback.plans[('local_actions', "%032x" % 0)] = plan
+    playback.plans[('global_actions', "%032x" % 0)] = plan
+    playback.remove_plan('local_actions', "%032x" % 0)
+    playback.remove_plan('local_actions', "%032x" % 1)
+    assert list(playback.plans) == [('global_actions', "%032x" % 0)]
+
+
+def test_plan_skips_inactive_macros():
+    plan = playback.Playback_plan(signature(
+        "bpy.ops.object.shade_smooth()",
+        "bpy.ops.object.delete(use_global=False)",
+        "bpy.context.object.data.use_auto_smooth = True",
+        inactive=(1,)
+    ))
+    assert [step.macro_id for step in plan.steps] == ["%032x" % 0, "%032x" % 2]
+    assert plan.steps[0].command == "bpy.ops.object.shade_smooth(\"EXEC_DEFAULT\", )"
+    assert plan.steps[1].command == "context.object.data.use_auto_smooth = True"
+    assert all(step.code is not None for step in plan.steps)
+
+
+@pytest.mark.parametrize(
+    "command",
+    [
+        "bpy.ops.ar.local_play(id=\"\", index=-1)",
+        "bpy.context.object.location = (1, 2",
+        "ar.event: {not json}"
+    ]
+)
+def test_plan_step_error(command):
+    plan = playback.Playback_plan(signature(command))
+    assert plan.steps[0].error is not None
+    assert plan.steps[0].code is None
+
+
+def test_plan_render_complete():
+    plan = playback.Playback_plan(signature(
+        "bpy.ops.render.render()",
+        event({'Type': 'Render Complete'}),
+        "bpy.ops.object.shade_smooth()"
+    ))
+    assert plan.render_complete == [1]
+    assert plan.pauses
+
+
+def test_plan_pauses():
+    assert not playback.Playback_plan(signature("bpy.ops.object.shade_smooth()")).pauses
+    assert playback.Playback_plan(signature(event({'Type': 'Timer', 'Time': 1}))).pauses
+
+
+def test_session_executing():
+    plan = playback.Playback_plan(signature("bpy.ops.object.shade_smooth()"))
+    session = playback.Playback_session(plan, 'local_actions', "%032x" % 0)
+    assert not playback.add_session(bpy.context, session, False)
+    assert not playback.has_executing_session()
+    session.begin(bpy.context)
+    assert playback.has_executing_session()
+    session.close(bpy.context)
+    assert not playback.has_executing_session()
+
+
+def test_session_loop_stack():
+    plan = playback.Playback_plan(signature(
+        event({'Type': 'Loop', 'StatementType': 'repeat', 'RepeatCount': 2}),
+        event({'Type': 'Loop', 'StatementType': 'count', 'Startnumber': 3, 'Endnumber': 5, 'Stepnumber': 1}),
+        event({'Type': 'EndLoop'}),
+        event({'Type': 'EndLoop'})
+    ))
+    session = playback.Playback_session(plan, 'local_actions', "%032x" % 0)
+    outer = session.enter_loop(0)
+    assert session.enter_loop(0) is outer
+    inner = session.enter_loop(1)
+    assert inner.counter == 3
+    assert session.enter_loop(1) is inner
+    session.exit_loop()
+    assert session.loops == [outer]
+    assert session.enter_loop(1) is not inner
+    session.close(bpy.context)
+    assert session.loops == []
+
+
+@pytest.mark.parametrize(
+    "command, is_object_command",
+    [
+        ("bpy.context.object.data.use_auto_smooth = True", True),
+        ("bpy.context.active_object.location = (0, 0, 1)", True),
+        ("bpy.context.object.modifiers[\"Subdivision\"].levels = 2", True),
+        ("bpy.context.object.modifiers.new(\"Subdivision\", 'SUBSURF')", True),
+        ("bpy.context.active_object.data.materials.append(None)", True),
+        ("bpy.context.object.location = bpy.context.object.scale", False),
+        ("bpy.context.scene.tool_settings.use_transform_pivot_point_align = True", False),
+        ("bpy.ops.object.shade_smooth()", False)
+    ]
+)
+def test_compile_object_command(command, is_object_command):
+    assert (playback.compile_object_command(command) is not None) == is_object_command
+
+
+@pytest.mark.parametrize(
+    "command, per_object",
+    [
+        ("bpy.ops.object.shade_smooth()", True),
+        ("bpy.context.object.location = bpy.context.object.scale", True),
+        ("bpy.context.scene.frame_current = 1", False)
+    ]
+)
+def test_plan_step_per_object(command, per_object):
+    assert playback.Plan_step("%032x" % 0, command, "EXEC_DEFAULT", "").per_object == per_object
+
+
+def test_session_queue():
+    plan = playback.Playback_plan(signature("bpy.ops.object.shade_smooth()", "bpy.ops.object.shade_flat()"))
+    running = playback.Playback_session(plan, 'local_actions', "%032x" % 0)
+    waiting = playback.Playback_session(plan, 'local_actions', "%032x" % 1)
+    assert not playback.add_session(bpy.context, running, True)
+    assert playback.add_session(bpy.context, waiting, True)
+    assert waiting.context_copy is not None
+    assert playback.get_session('local_actions', "%032x" % 1) is waiting
+    assert waiting.progress == 0
+    waiting.index = 1
+    assert waiting.progress == 0.5
+    waiting.close(bpy.context)
+    running.close(bpy.context)
+    assert playback.sessions == {}
+    assert playback.waiting_sessions == []
+
+
+def test_session_queue_start(monkeypatch):
+    started = []
+    monkeypatch.setattr(playback, "start_session", started.append)
+    plan = playback.Playback_plan(signature("bpy.ops.object.shade_smooth()"))
+    first = playback.Playback_session(plan, 'local_actions', "%032x" % 0)
+    second = playback.Playback_session(plan, 'local_actions', "%032x" % 1)
+    waiting = playback.Playback_session(plan, 'local_actions', "%032x" % 2)
+    assert not playback.add_session(bpy.context, first, False)
+    assert not playback.add_session(bpy.context, second, False)
+    assert playback.add_session(bpy.context, waiting, True)
+    first.close(bpy.context)
+    assert started == []
+    second.close(bpy.context)
+    assert started == [waiting]
+    assert playback.waiting_sessions == []
+    waiting.close(bpy.context)
+    assert playback.sessions == {}
+
+
+def test_compile_script_cache(monkeypatch):
+    monkeypatch.setattr(playback, "SCRIPT_CACHE_SIZE", 2)
+    playback.clear_plans()
+    script = "value = 1\n"
+    assert playback.compile_script(script) is playback.compile_script(script)
+    first = next(iter(playback.scripts))
+    playback.compile_script("value = 2\n")
+    playback.compile_script(script)
+    playback.compile_script("value = 3\n")
+    assert len(playback.scripts) == 2
+    assert first in playback.scripts
+    assert all(playback.SCRIPT_FILENAME_FORMAT % digest in linecache.cache for digest in playback.scripts)
+    assert sum(bool(playback.SCRIPT_FILENAME.fullmatch(filename)) for filename in linecache.cache) == 2
+    playback.clear_plans()
+    assert not any(playback.SCRIPT_FILENAME.fullmatch(filename) for filename in linecache.cache)
+
+
+@pytest.mark.parametrize(
+    "script, last_line",
+    [
+        ("def divide():\n    return 1 / 0\n\ndivide()\n", "ZeroDivisionError: division by zero"),
+        ("value = (1,\n", "SyntaxError: '(' was never closed")
+    ]
+)
+def test_format_script_error(script, last_line):
+    try:
+        exec(playback.compile_script(script), {})
+    except Exception as err:
+        error = playback.format_script_error(err, "Script")
+    assert error.strip().splitlines()[-1] == last_line
+    assert '"Script"' in error
+    assert "<ActRec Script" not in error
+    assert __file__ not in error
+
+
+def test_format_script_error_library_frames():
+    try:
+        exec(playback.compile_script("import json\njson.loads('{')\n"), {})
+    except Exception as err:
+        error = playback.format_script_error(err, "Script")
+    assert error.index('"Script"') < error.index("decoder.py")
+    assert __file__ not in error
+
+
+def test_python_loop_condition():
+    plan = playback.Playback_plan(signature(
+        event({'Type': 'Loop', 'StatementType': 'python', 'PyStatement': "iteration < 2"}),
+        event({'Type': 'Loop', 'StatementType': 'python', 'PyStatement': "iteration <"}),
+        event({'Type': 'EndLoop'}),
+        event({'Type': 'EndLoop'})
+    ))
+    assert plan.steps[0].code is not None
+    assert plan.steps[1].error is not None
+    session = playback.Playback_session(plan, 'local_actions', "%032x" % 0)
+    loop = session.enter_loop(0)
+    results = []
+    for _ in range(3):
+        results.append(eval(plan.steps[0].code, session.get_loop_globals(bpy.context, loop)))
+        loop.counter += 1
+    assert results == [True, True, False]
+    session.close(bpy.context)
@@ -0,0 +1,43 @@
+import pytest
+from ActRec.actrec.functions import profiling
+
+
+@pytest.fixture
+def enabled():
+    profiling.enabled = True
+    yield
+    profiling.enabled = False
+    profiling.clear()
+
+
+def test_stage(enabled):
+    with profiling.stage("record", reports=2) as counters:
+        counters["macros"] = 1
+    with profiling.stage("record", reports=3):
+        pass
+    summary = profiling.get_summary()["record"]
+    assert summary["calls"] == 2
+    assert summary["counters"] == {"reports": 5, "macros": 1}
+    assert summary["max_ms"] <= summary["total_ms"]
+
+
+def test_profiled(enabled, monkeypatch):
+    @profiling.profiled("add")
+    def add(a, b):
+        return a + b
+
+    logged = []
+    monkeypatch.setattr(profiling.logger, "debug", lambda *args: logged.append(args))
+    assert add(1, 2) == 3
+    assert profiling.get_summary()["add"]["calls"] == 1
+    assert len(logged) == 1 and '"stage": "add"' in logged[0][1]
+
+
+def test_disabled():
+    @profiling.profiled("add")
+    def add(a, b):
+        return a + b
+
+    with profiling.stage("record"):
+        add(1, 2)
+    assert profiling.get_summary() == {}
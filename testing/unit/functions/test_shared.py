@@ -20,6 +20,18 @@ def test_check_for_duplicates(check_list, name, output):
     assert shared.check_for_duplicates(check_list, name) == output
 
 
+@pytest.mark.parametrize(
+    "exclude, main_exclude, sub_exclude",
+    [
+        ([], set(), {}),
+        (["name", "selected"], {"name", "selected"}, {}),
+        (["name", "actions.name", "macros.id.x"], {"name"}, {"actions": ["name"], "macros": ["id.x"]})
+    ]
+)
+def test_split_exclude(exclude, main_exclude, sub_exclude):
+    assert shared.split_exclude(exclude) == (main_exclude, sub_exclude)
+
+
 @pytest.fixture(scope="function")
 def clear_load_global(request):
     pref = shared.get_preferences(bpy.context)
@@ -134,6 +146,16 @@ def test_apply_data_to_item(apply_data, data):
     assert helper.compare_with_dict(apply_data, data)
 
 
+def test_load_collection():
+    pref = shared.get_preferences(bpy.context)
+    pref.global_actions.clear()
+    helper.load_global_actions_test_data(pref)
+    data = shared.property_to_python(pref.global_actions, ["selected", "alert"])
+    pref.global_actions.clear()
+    shared.load_collection(pref.global_actions, data)
+    assert shared.property_to_python(pref.global_actions, ["selected", "alert"]) == data
+
+
 @ pytest.mark.parametrize("collection, data",
                           [(bpy.context.preferences.addons['cycles'].preferences.devices,
                            {'name': "test", 'id': "TT", 'use': False, 'type': "OPTIX"})]
@@ -370,3 +392,61 @@ def test_play_script_error_resets_is_playing():
     assert "Test error" in str(result)  # Contains our test error
     assert action.is_playing == False  # is_playing was reset
     assert action.alert == True  # Alert was set
+
+
+def play_commands(monkeypatch, *commands, time_budget=0, action_id="%032x" % 0):
+    from types import SimpleNamespace
+    from ActRec.actrec.functions import playback
+
+    pref = SimpleNamespace(playback_deferred_redraw=True, playback_time_budget=time_budget,
+                           playback_scheduling='INTERLEAVE')
+    monkeypatch.setattr(shared, "get_preferences", lambda context: pref)
+    monkeypatch.setattr(playback, "get_plan", lambda macros, action, action_type: playback.Playback_plan(macros))
+    monkeypatch.setattr(playback.Playback_session, "enter_override", lambda self, context, ui_type: None)
+    signature = tuple(("%032x" % i, command, True, "EXEC_DEFAULT", "") for i, command in enumerate(commands))
+    action = SimpleNamespace(id=action_id, label="Test", is_playing=False, execution_mode="GROUP", alert=False)
+    return shared.play(bpy.context, signature, action, 'local_actions')
+
+
+def test_play_events_keep_session_executing(monkeypatch):
+    import json
+    script = (
+        "from ActRec.actrec.functions import playback\n"
+        "assert playback.get_session('local_actions', '%032x' % 0).executing"
+    )
+    assert play_commands(
+        monkeypatch,
+        "ar.event:%s" % json.dumps({'Type': 'Select Object', 'KeepSelection': True}),
+        "ar.event:%s" % json.dumps({'Type': 'Run Script', 'ScriptText': script}),
+        "ar.event:%s" % json.dumps({'Type': 'Run Script', 'ScriptText': script})
+    ) is None
+
+
+def test_play_events_keep_deferred_redraw(monkeypatch):
+    import json
+    script = (
+        "from ActRec.actrec.functions import playback\n"
+        "session = playback.get_session('local_actions', '%032x' % 0)\n"
+        "assert session.redraw_pending and session.executing"
+    )
+    assert play_commands(
+        monkeypatch,
+        "ar_value = 1",
+        "ar.event:%s" % json.dumps({'Type': 'Select Object', 'KeepSelection': True}),
+        "ar.event:%s" % json.dumps({'Type': 'Run Script', 'ScriptText': script}),
+        "ar.event:%s" % json.dumps({'Type': 'Run Script', 'ScriptText': script})
+    ) is None
+
+
+def test_play_nested_under_time_budget(monkeypatch):
+    order = []
+
+    def play_nested():
+        play_commands(monkeypatch, "ar_order.append(1)", "ar_order.append(2)", time_budget=1e-6,
+                      action_id="%032x" % 1)
+
+    monkeypatch.setattr(shared, "ar_order", order, raising=False)
+    monkeypatch.setattr(shared, "ar_play_nested", play_nested, raising=False)
+    # the nested playback ignores the time budget, so it ends before the calling macro returns
+    assert play_commands(monkeypatch, "ar_play_nested()", time_budget=1e-6) is None
+    assert order == [1, 2]